@@ -18,20 +18,39 @@ sys.path.append("./utils")
 
 # Import OpenRouter client
 from utils.openrouter_client import OpenRouterClient
+from utils.cycle_metrics import CycleMetrics
+from utils.cycle_profiler import CycleProfiler, PROFILE_MODES
+from utils.memory_tracker import MemoryTracker
+from utils.metrics_server import start_metrics_server, register_queue_depths
+from utils.done_archive import migrate_flat_done
+from utils.plan_retention import apply_retention
+from utils.task_dispatcher import TaskDispatcher
+from utils.vault_writer import get_vault_writer
+from utils.document_cache import get_document_cache
 # Import Silver Tier components
 from silver_tier_coordinator import SilverTierCoordinator
 
 class AIEmployeeSystem:
-    def __init__(self, vault_path="./vault", incoming_path="./incoming"):
+    def __init__(self, vault_path="./vault", incoming_path="./incoming", profile=None, profile_keep=None,
+                 memory=False):
         self.vault_path = Path(vault_path)
         self.incoming_path = Path(incoming_path)
         self.running = False
 
+        # Per-stage timings of each cycle, appended to logs/cycle_metrics.jsonl
+        self.metrics = CycleMetrics()
+        # Per-cycle profiles in logs/profiles when --profile is given
+        self.profiler = CycleProfiler(profile, keep=profile_keep)
+        # Per-cycle memory growth in logs/memory_growth.jsonl when --memory is given
+        self.memory = MemoryTracker(memory)
+
         # Initialize OpenRouter client
         self.ai_client = OpenRouterClient()
 
         # Initialize Silver Tier Coordinator
         self.silver_coordinator = SilverTierCoordinator(vault_path, incoming_path)
+        # Silver Tier stages are recorded as part of this system's cycles
+        self.silver_coordinator.metrics = self.metrics
 
         # Import agents and skills
         from skills.inbox_processor import InboxProcessor
@@ -56,6 +75,8 @@ class AIEmployeeSystem:
         self.finance_agent = FinanceAgent(vault_path, ai_client=self.ai_client)
         self.operations_agent = OperationsAgent(vault_path, ai_client=self.ai_client)
         self.ceo_agent = CEOStrategicAgent(vault_path, ai_client=self.ai_client)
+        # Routes each new Needs_Action task to exactly one of the agents above
+        self.task_dispatcher = TaskDispatcher(vault_path)
 
         # Register signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -71,36 +92,49 @@ class AIEmployeeSystem:
         print(f"[{datetime.now()}] Processing Needs_Action items...")
 
         # Run inbox processor to classify and plan tasks
-        self.inbox_processor.run()
+        with self.metrics.span("needs_action.inbox_processor"):
+            self.inbox_processor.run()
 
         # Run approval manager to handle new plans
-        self.approval_manager.run()
+        with self.metrics.span("needs_action.approval_manager"):
+            self.approval_manager.run()
 
     def run_agents(self):
         """Run all specialized agents"""
         print(f"[{datetime.now()}] Running specialized agents...")
 
+        try:
+            # Scan Needs_Action once and queue each new task for a single agent
+            with self.metrics.span("agents.dispatch"):
+                self.task_dispatcher.dispatch()
+        except Exception as e:
+            print(f"Error dispatching Needs_Action tasks: {e}")
+
         try:
             # Run communications agent
-            self.communications_agent.run()
+            with self.metrics.span("agents.communications"):
+                self.communications_agent.run(self.task_dispatcher.take("communications"))
         except Exception as e:
             print(f"Error running Communications Agent: {e}")
 
         try:
             # Run finance agent
-            self.finance_agent.run()
+            with self.metrics.span("agents.finance"):
+                self.finance_agent.run(self.task_dispatcher.take("finance"))
         except Exception as e:
             print(f"Error running Finance Agent: {e}")
 
         try:
             # Run operations agent
-            self.operations_agent.run()
+            with self.metrics.span("agents.operations"):
+                self.operations_agent.run(self.task_dispatcher.take("operations"))
         except Exception as e:
             print(f"Error running Operations Agent: {e}")
 
         try:
             # Run CEO agent (strategic analysis)
-            self.ceo_agent.run()
+            with self.metrics.span("agents.ceo"):
+                self.ceo_agent.run()
         except Exception as e:
             print(f"Error running CEO Agent: {e}")
 
@@ -109,14 +143,38 @@ class AIEmployeeSystem:
         print(f"[{datetime.now()}] Running maintenance tasks...")
 
         # Check for completed tasks and move to Done
-        self.task_completion_checker.run()
+        with self.metrics.span("maintenance.task_completion"):
+            self.task_completion_checker.run()
+
+        # File anything left directly in Done (older layout or moved by hand) into date shards
+        with self.metrics.span("maintenance.done_shards"):
+            migrate_flat_done(self.vault_path)
+
+        # Archive regenerated reports the retention rules no longer keep
+        with self.metrics.span("maintenance.plan_retention"):
+            retention = apply_retention(self.vault_path)
+            if retention.files_reclaimed:
+                self.audit_logger.log_action(
+                    "PLAN_RETENTION",
+                    f"Reclaimed {retention.files_reclaimed} generated plans from Plans",
+                    {
+                        "archived": retention.archived,
+                        "deleted": retention.deleted,
+                        "bytes_reclaimed": retention.bytes_reclaimed
+                    }
+                )
 
         # Update dashboard with AI client status
         mode = "LIVE" if not self.ai_client.dry_run and self.ai_client.api_key else "DRY_RUN"
         connected_services = self.ai_client.get_client_info()
 
         # Update dashboard
-        self.dashboard_updater.run("System maintenance cycle", ai_mode=mode, connected_services=connected_services)
+        with self.metrics.span("maintenance.dashboard"):
+            self.dashboard_updater.run("System maintenance cycle", ai_mode=mode, connected_services=connected_services)
+
+        # Move old audit log days to compressed storage
+        with self.metrics.span("maintenance.log_archive"):
+            self.audit_logger.archive_old_logs()
 
         # Log system status
         self.audit_logger.log_action(
@@ -135,28 +193,48 @@ class AIEmployeeSystem:
         print(f"\n[{datetime.now()}] Starting AI Employee cycle...")
 
         try:
-            # Run Silver Tier workflow (file watching, planning, approval)
-            print(f"[{datetime.now()}] Running Silver Tier workflow...")
-            self.silver_coordinator.process_workflow_cycle()
+            with self.profiler.profile("cycle"), self.memory.track("cycle"), self.metrics.cycle():
+                # Task texts are normalized once per content; forget those the last cycle did not use
+                get_document_cache().new_cycle()
+
+                # Run Silver Tier workflow (file watching, planning, approval)
+                print(f"[{datetime.now()}] Running Silver Tier workflow...")
+                with self.metrics.span("silver_workflow"):
+                    self.silver_coordinator.process_workflow_cycle()
 
-            # Process any new items in Needs_Action (Bronze Tier)
-            self.process_needs_action()
+                # Process any new items in Needs_Action (Bronze Tier)
+                with self.metrics.span("needs_action"):
+                    self.process_needs_action()
 
-            # Run specialized agents (Bronze Tier)
-            self.run_agents()
+                # Run specialized agents (Bronze Tier)
+                with self.metrics.span("agents"):
+                    self.run_agents()
 
-            # Run maintenance tasks (Bronze Tier)
-            self.maintenance_tasks()
+                # Run maintenance tasks (Bronze Tier)
+                with self.metrics.span("maintenance"):
+                    self.maintenance_tasks()
 
-            print(f"[{datetime.now()}] AI Employee cycle completed successfully")
+                # Make this cycle's vault renames durable with one fsync per folder
+                with self.metrics.span("vault_sync"):
+                    get_vault_writer().sync()
+
+            record = self.metrics.last_record
+            slowest = max(record["stages"], key=lambda stage: stage["wall_ms"])
+            print(f"[{datetime.now()}] AI Employee cycle completed successfully in {record['wall_ms']:.0f} ms "
+                  f"(slowest stage: {slowest['name']}, {slowest['wall_ms']:.0f} ms)")
 
         except Exception as e:
             print(f"Error in cycle: {e}")
             self.audit_logger.log_error("CYCLE_ERROR", str(e), {"cycle_time": datetime.now().isoformat()})
 
-    def run_continuous(self, cycle_interval=300):  # Default 5 minutes
+    def run_continuous(self, cycle_interval=300, metrics_port=None):  # Default 5 minutes
         """Run the system continuously with specified interval between cycles"""
         print(f"Starting AI Employee system in continuous mode (cycle interval: {cycle_interval}s)")
+
+        # Opt-in scrape endpoint (METRICS_PORT or --metrics-port)
+        metrics_server = start_metrics_server(metrics_port)
+        if metrics_server:
+            register_queue_depths(self.vault_path)
         self.audit_logger.log_action("SYSTEM_START", "AI Employee system started in continuous mode", {
             "cycle_interval": cycle_interval,
             "start_time": datetime.now().isoformat()
@@ -174,6 +252,8 @@ class AIEmployeeSystem:
                 break
 
         print("AI Employee system shutting down...")
+        if metrics_server:
+            metrics_server.stop()
         self.audit_logger.log_action("SYSTEM_STOP", "AI Employee system stopped", {
             "stop_time": datetime.now().isoformat()
         })
@@ -203,13 +283,22 @@ def main():
                        help="Path to vault directory")
     parser.add_argument("--incoming", default="./incoming",
                        help="Path to incoming directory")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                       help="Serve Prometheus metrics on this local port in continuous mode (default: METRICS_PORT)")
+    parser.add_argument("--profile", nargs="?", const="cprofile", choices=PROFILE_MODES, default=None,
+                       help="Profile every cycle into logs/profiles (cprofile, or sample for a sampling profiler)")
+    parser.add_argument("--profile-keep", type=int, default=None,
+                       help="Number of cycle profiles to keep (default: PROFILE_KEEP or 20)")
+    parser.add_argument("--memory", action="store_true",
+                       help="Trace allocations and log per-cycle memory growth to logs/memory_growth.jsonl")
 
     args = parser.parse_args()
 
-    system = AIEmployeeSystem(vault_path=args.vault, incoming_path=args.incoming)
+    system = AIEmployeeSystem(vault_path=args.vault, incoming_path=args.incoming,
+                              profile=args.profile, profile_keep=args.profile_keep, memory=args.memory)
 
     if args.mode == "continuous":
-        system.run_continuous(cycle_interval=args.interval)
+        system.run_continuous(cycle_interval=args.interval, metrics_port=args.metrics_port)
     else:
         system.run_once()
 
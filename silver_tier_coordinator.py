@@ -16,6 +16,16 @@ from utils.planning_layer import PlanningLayer
 from utils.human_in_the_loop import HumanInTheLoop
 from utils.email_mcp_tool import EmailMCPTool
 from utils.gmail_watcher import GmailWatcher
+from utils.log_sink import get_log_sink
+from utils.vault_index import get_vault_index
+from utils.done_archive import shard_folder
+from utils.task_events import get_task_events
+from utils.vault_writer import get_vault_writer
+from utils.cycle_metrics import CycleMetrics
+from utils.cycle_profiler import CycleProfiler, PROFILE_MODES
+from utils.memory_tracker import MemoryTracker
+from utils.metrics_server import start_metrics_server, register_queue_depths
+from utils.document_cache import get_document_cache
 
 # Load environment variables
 load_dotenv()
@@ -23,10 +33,13 @@ load_dotenv()
 class SilverTierCoordinator:
     """Coordinates all Silver Tier components"""
 
-    def __init__(self, vault_path="./vault", incoming_path="./incoming"):
+    def __init__(self, vault_path="./vault", incoming_path="./incoming", profile=None, profile_keep=None,
+                 memory=False):
         self.vault_path = Path(vault_path)
         self.incoming_path = Path(incoming_path)
         self.logs_path = Path("logs")
+        self.vault_index = get_vault_index(self.vault_path)
+        self.task_events = get_task_events(self.vault_path)
 
         # Initialize all Silver Tier components
         self.file_watcher = FileWatcher(self.incoming_path, self.vault_path)
@@ -38,6 +51,11 @@ class SilverTierCoordinator:
         # Ensure logs directory exists
         self.logs_path.mkdir(exist_ok=True)
 
+        # Cycle timings, profiles and memory growth when running on its own
+        self.metrics = CycleMetrics()
+        self.profiler = CycleProfiler(profile, keep=profile_keep)
+        self.memory = MemoryTracker(memory)
+
         # Thread control
         self.running = False
         self.file_watcher_thread = None
@@ -73,34 +91,15 @@ class SilverTierCoordinator:
         except Exception as e:
             self.log_event(f"Error in Gmail watcher: {str(e)}")
 
-    def process_workflow_cycle(self):
-        """Run one complete cycle of Silver Tier workflow"""
-        self.log_event("Starting Silver Tier workflow cycle")
-
-        try:
-            # Process any new files that were detected by the watcher
-            # This creates tasks in Needs_Action
-            # (The file watcher handles the initial task creation)
-
-            # Process tasks in Needs_Action to generate plans
-            self.log_event("Processing needs action tasks for planning")
-            self.planning_layer.process_needs_action_tasks()
-
-            # Process plans to determine if approval is needed
-            self.log_event("Processing plans for approval workflow")
-            self.human_in_loop.process_approval_workflow()
-
-            self.log_event("Silver Tier workflow cycle completed successfully")
-
-        except Exception as e:
-            error_msg = f"Error in Silver Tier workflow cycle: {str(e)}"
-            print(error_msg)
-            self.log_event(error_msg)
-
-    def run_continuous(self, cycle_interval=300):  # Default 5 minutes
+    def run_continuous(self, cycle_interval=300, metrics_port=None):  # Default 5 minutes
         """Run the Silver Tier system continuously"""
         self.log_event("Starting Silver Tier system in continuous mode")
 
+        # Opt-in scrape endpoint (METRICS_PORT or metrics_port)
+        metrics_server = start_metrics_server(metrics_port)
+        if metrics_server:
+            register_queue_depths(self.vault_path)
+
         # Start both the file watcher and Gmail watcher
         self.running = True
         self.start_file_watcher()
@@ -108,7 +107,12 @@ class SilverTierCoordinator:
 
         try:
             while self.running:
-                self.process_workflow_cycle()
+                with self.profiler.profile("silver_cycle"), self.memory.track("silver_cycle"), \
+                        self.metrics.cycle("silver_cycle"):
+                    # Task texts are normalized once per content; forget those the last cycle did not use
+                    get_document_cache().new_cycle()
+                    self.process_workflow_cycle()
+                    get_vault_writer().sync()
                 print(f"Waiting {cycle_interval} seconds until next Silver Tier cycle...")
                 time.sleep(cycle_interval)
         except KeyboardInterrupt:
@@ -119,6 +123,8 @@ class SilverTierCoordinator:
                 self.file_watcher_thread.join(timeout=5)
             if self.gmail_watcher_thread:
                 self.gmail_watcher_thread.join(timeout=5)
+            if metrics_server:
+                metrics_server.stop()
 
         self.log_event("Silver Tier system shutting down")
 
@@ -140,7 +146,10 @@ class SilverTierCoordinator:
             self.log_event(f"Error checking Gmail: {str(e)}")
 
         # Process one full cycle
-        self.process_workflow_cycle()
+        with self.profiler.profile("silver_cycle"), self.memory.track("silver_cycle"):
+            get_document_cache().new_cycle()
+            self.process_workflow_cycle()
+            get_vault_writer().sync()
 
         # Stop the file watcher
         self.running = False
@@ -212,12 +221,10 @@ class SilverTierCoordinator:
     def move_approved_drafts(self):
         """Move approved drafts to vault/Approved when approval is simulated"""
         # Check for any manually approved files in Pending_Approval
-        pending_files = list(self.vault_path.joinpath("Pending_Approval").glob("*.md"))
-
-        for pending_file in pending_files:
+        for pending in self.vault_index.files("Pending_Approval", "*.md"):
             # Check if the file has been approved (this is a simplified check)
-            with open(pending_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            pending_file = pending.path
+            content = pending.body
 
             # Look for the approval section and check if it has been approved
             # Check for checked box "[x]" next to "Yes, proceed with execution"
@@ -225,8 +232,8 @@ class SilverTierCoordinator:
                 # Move to Approved folder
                 approved_path = self.vault_path / "Approved"
                 destination = approved_path / pending_file.name
-                import shutil
-                shutil.move(str(pending_file), str(destination))
+                self.vault_index.move(pending_file, destination)
+                self.task_events.record(pending_file, "approved", destination)
                 self.log_event(f"Approved draft moved to Approved folder: {pending_file.name}")
 
     def send_email_notifications(self, notification_type: str, data: Dict[str, Any]):
@@ -311,29 +318,19 @@ Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"""
         import json
 
         # Count items in each category
-        needs_action_count = len(list((self.vault_path / "Needs_Action").glob("*.json")))
-        in_progress_count = len(list((self.vault_path / "Plans").glob("*.md")))  # Plans being worked on
-        approval_count = len(list((self.vault_path / "Pending_Approval").glob("*.md")))
-
-        # For done_today, count files created today
-        from datetime import date, datetime as dt
-        today = date.today()
-        done_path = self.vault_path / "Done"
-        done_today_count = 0
-
-        if done_path.exists():
-            for file in done_path.glob("*.md"):
-                # Check if file was created today (using datetime conversion)
-                file_ctime = dt.fromtimestamp(file.stat().st_ctime).date()
-                if file_ctime == today:
-                    done_today_count += 1
+        needs_action_count = self.vault_index.count("Needs_Action", "*.json")
+        in_progress_count = self.vault_index.count("Plans", "*.md")  # Plans being worked on
+        approval_count = self.vault_index.count("Pending_Approval", "*.md")
+
+        # For done_today, count the files in today's Done shard
+        from datetime import date
+        done_today_count = self.vault_index.count(shard_folder(date.today()), "*.md")
 
         # Update dashboard file
         dashboard_file = self.vault_path / "Dashboard.md"
 
         if dashboard_file.exists():
-            with open(dashboard_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self.vault_index.get(dashboard_file).body
 
             # Update the stats section
             import re
@@ -365,8 +362,7 @@ Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"""
                 content
             )
 
-            with open(dashboard_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self.vault_index.write_text(dashboard_file, content)
 
             self.log_event("Dashboard updated with current counts")
         else:
@@ -420,8 +416,7 @@ from "Business_Goals.md"
 - [ ] Update dashboard
 """
 
-            with open(dashboard_file, 'w', encoding='utf-8') as f:
-                f.write(dashboard_content)
+            self.vault_index.write_text(dashboard_file, dashboard_content)
 
     def process_workflow_cycle(self):
         """Run one complete cycle of Silver Tier workflow"""
@@ -434,11 +429,13 @@ from "Business_Goals.md"
 
             # 2. Process tasks in Needs_Action to generate plans
             self.log_event("Processing needs action tasks for planning")
-            self.planning_layer.process_needs_action_tasks()
+            with self.metrics.span("silver_workflow.planning"):
+                self.planning_layer.process_needs_action_tasks()
 
             # 3. Process plans to determine if approval is needed
             self.log_event("Processing plans for approval workflow")
-            self.human_in_loop.process_plans_for_approval()
+            with self.metrics.span("silver_workflow.approval"):
+                self.human_in_loop.process_plans_for_approval()
 
             # 4. Check for approved drafts and move them
             self.log_event("Checking for approved drafts")
@@ -466,8 +463,7 @@ from "Business_Goals.md"
         log_file = self.logs_path / "system.log"
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        with open(log_file, 'a', encoding='utf-8') as f:
-            f.write(f"[{timestamp}] Silver Tier Coordinator: {message}\n")
+        get_log_sink().write(log_file, f"[{timestamp}] Silver Tier Coordinator: {message}\n")
 
     @property
     def needs_action_path(self):
@@ -499,13 +495,22 @@ def main():
                        help="Path to vault directory")
     parser.add_argument("--incoming", default="./incoming",
                        help="Path to incoming directory")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                       help="Serve Prometheus metrics on this local port in continuous mode (default: METRICS_PORT)")
+    parser.add_argument("--profile", nargs="?", const="cprofile", choices=PROFILE_MODES, default=None,
+                       help="Profile every cycle into logs/profiles (cprofile, or sample for a sampling profiler)")
+    parser.add_argument("--profile-keep", type=int, default=None,
+                       help="Number of cycle profiles to keep (default: PROFILE_KEEP or 20)")
+    parser.add_argument("--memory", action="store_true",
+                       help="Trace allocations and log per-cycle memory growth to logs/memory_growth.jsonl")
 
     args = parser.parse_args()
 
-    coordinator = SilverTierCoordinator(vault_path=args.vault, incoming_path=args.incoming)
+    coordinator = SilverTierCoordinator(vault_path=args.vault, incoming_path=args.incoming,
+                                        profile=args.profile, profile_keep=args.profile_keep, memory=args.memory)
 
     if args.mode == "continuous":
-        coordinator.run_continuous(cycle_interval=args.interval)
+        coordinator.run_continuous(cycle_interval=args.interval, metrics_port=args.metrics_port)
     else:
         coordinator.run_once()
 
@@ -5,10 +5,18 @@ Generates approval files and moves files based on approval status
 """
 
 import os
+import sys
 import json
 from datetime import datetime
 from pathlib import Path
 
+# Allow running as a script from the skills directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.vault_index import get_vault_index
+from utils.task_events import get_task_events
+from utils.approval_rules import get_approval_rules
+
 class ApprovalManager:
     def __init__(self, vault_path="./vault", ai_client=None):
         self.vault_path = Path(vault_path)
@@ -17,44 +25,37 @@ class ApprovalManager:
         self.pending_approval_dir = self.vault_path / "Pending_Approval"
         self.approved_dir = self.vault_path / "Approved"
         self.rejected_dir = self.vault_path / "Rejected"
+        self.vault_index = get_vault_index(vault_path)
+        self.task_events = get_task_events(vault_path)
+        self.approval_rules = get_approval_rules()
 
     def check_pending_approvals(self):
         """Process all plan files and determine if they need approvals"""
-        plan_files = list(self.plans_dir.glob("plan_*.md"))
+        for plan in self.vault_index.files("Plans", "plan_*.md"):
+            plan_path = plan.path
+            decision = self.approval_decision(plan.body)
 
-        for plan_path in plan_files:
-            content = plan_path.read_text()
-            approval_needed = self.determine_approval_needed(content)
-
-            if approval_needed:
-                self.create_approval_request(plan_path)
+            if decision.requires_approval:
+                self.create_approval_request(plan, decision.rule_id)
             else:
                 # Auto-approve if no approval needed
                 approved_path = self.approved_dir / plan_path.name
-                plan_path.rename(approved_path)
-                print(f"Auto-approved: {plan_path.name}")
+                self.vault_index.move(plan_path, approved_path)
+                self.task_events.record(plan_path, "approved", approved_path, auto=True, rule=decision.rule_id)
+                print(f"Auto-approved: {plan_path.name} ({decision.rule_id})")
+
+    def approval_decision(self, content):
+        """Decision of the plan_review approval rules for a plan's content"""
+        return self.approval_rules.decide("plan_review", {"content": content})
 
     def determine_approval_needed(self, content):
         """Determine if approval is needed based on content"""
-        content_lower = content.lower()
-
-        # Approval required for these actions
-        approval_keywords = [
-            'payment', 'finance', 'expense', 'purchase',
-            'email', 'communication', 'send', 'reply',
-            'new contact', 'new person', 'financial',
-            'transfer', 'bill', 'invoice', 'subscription'
-        ]
-
-        for keyword in approval_keywords:
-            if keyword in content_lower:
-                return True
-
-        return False
+        return self.approval_decision(content).requires_approval
 
-    def create_approval_request(self, plan_path):
-        """Create an approval request file"""
-        plan_content = plan_path.read_text()
+    def create_approval_request(self, plan_path, rule_id=None):
+        """Create an approval request file for a plan's path or VaultEntry (rule_id: the approval rule that required it)"""
+        plan_path = self.vault_index.entry(plan_path)
+        plan_content = plan_path.document
 
         approval_content = f"""---
 title: "Approval Request for {plan_path.stem}"
@@ -62,12 +63,13 @@ created: {datetime.now().isoformat()}
 plan_id: {plan_path.stem}
 status: pending_approval
 priority: normal
+approval_rule: {rule_id or 'manual'}
 ---
 
 # Approval Request: {plan_path.stem}
 
 ## Plan Summary
-{plan_content[:500]}...
+{plan_content.preview(500)}...
 
 ## Action Required
 ```
@@ -94,16 +96,17 @@ This request will auto-reject in 7 days if no action taken.
 """
 
         approval_path = self.pending_approval_dir / f"approval_{plan_path.stem}.md"
-        approval_path.write_text(approval_content)
+        self.vault_index.write_text(approval_path, approval_content)
+        self.task_events.record(plan_path, "pending_approval", approval_path, rule=rule_id)
         print(f"Created approval request: {approval_path.name}")
 
     def process_approval_actions(self):
         """Check for approvals/rejections and move files accordingly"""
         # Move approved files
-        for approval_file in self.pending_approval_dir.glob("approval_*.md"):
+        for approval_file in self.vault_index.paths("Pending_Approval", "approval_*.md"):
             # In a real system, this would check if the file was moved to Approved or Rejected
             # For now, we'll just note the potential for movement
-            approval_file.unlink()  # Remove after approval decision
+            self.vault_index.remove(approval_file)  # Remove after approval decision
             print(f"Processed approval request: {approval_file.name}")
 
     def run(self):
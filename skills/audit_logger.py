@@ -1,23 +1,108 @@
 #!/usr/bin/env python3
 """
 Audit Logger Skill
-Writes structured logs to /Logs/YYYY-MM-DD.json
+Writes structured logs to /Logs as append-only JSON-lines segments:
+/Logs/YYYY-MM-DD.pPID.NNN.jsonl (one JSON entry per line, rotated by size)
+Every process appends to its own segments, so several processes can log at
+once without locking; readers merge all segments of a day by timestamp.
+Legacy /Logs/YYYY-MM-DD.json arrays are still readable and can be converted.
 """
 
 import os
+import re
+import sys
 import json
-from datetime import datetime, date
+import heapq
+from datetime import datetime, date, timedelta
 from pathlib import Path
 
+# Allow running as a script from the skills directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.log_sink import get_log_sink
+from utils.audit_index import AuditIndex, index_path, format_index_line
+from utils.audit_rollups import get_audit_rollups, rescan
+from utils.metrics_server import get_metrics_registry
+from utils.log_archive import (ARCHIVE_DIR, ARCHIVE_PATTERN, COMPRESSIONS, archive_name,
+                               archive_index_path, write_archive, read_archive,
+                               read_archive_index, archive_may_match)
+
+# Rotate to a new segment once the active one reaches this size
+DEFAULT_SEGMENT_BYTES = 4 * 1024 * 1024
+
+# Days older than this are compressed into /Logs/archive
+DEFAULT_ARCHIVE_DAYS = 30
+
+# YYYY-MM-DD[.writer].NNN.jsonl - the writer tag is the owning process, or "legacy" for converted logs
+SEGMENT_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})(?:\.([A-Za-z0-9_-]+))?\.(\d{3,})\.jsonl$")
+LEGACY_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})\.json$")
+
 class AuditLogger:
-    def __init__(self, vault_path="./vault"):
+    def __init__(self, vault_path="./vault", max_segment_bytes=None, sink=None, writer=None):
         self.vault_path = Path(vault_path)
         self.logs_dir = self.vault_path / "Logs"
+        self.archive_dir = self.logs_dir / ARCHIVE_DIR
+        self.max_segment_bytes = max_segment_bytes or int(
+            os.getenv("AUDIT_LOG_SEGMENT_BYTES", DEFAULT_SEGMENT_BYTES)
+        )
+        # Entries are handed to the shared background writer instead of written inline
+        self.sink = sink or get_log_sink()
+        self.index = AuditIndex()
+        # Per-day counts shared by every logger in the process
+        self.rollups = get_audit_rollups(self.logs_dir)
+
+        # Writer tag for this logger's segments; defaults to one per process
+        self._writer = writer
+
+        # Active segment, discovered once per day; sizes are tracked by the shared sink
+        self._segment_day = None
+        self._segment_writer = None
+        self._segment_seq = 0
 
     def get_today_log_path(self):
-        """Get the path for today's log file"""
+        """Get the path of the segment today's entries are appended to"""
         today = date.today().strftime("%Y-%m-%d")
-        return self.logs_dir / f"{today}.json"
+        return self._active_segment(today, 0)
+
+    def segment_name(self, day, seq, writer=None):
+        """Build a segment file name for a day"""
+        if writer:
+            return f"{day}.{writer}.{seq:03d}.jsonl"
+        return f"{day}.{seq:03d}.jsonl"
+
+    @property
+    def writer(self):
+        """Writer tag of the segments this logger appends to"""
+        # Looked up on every call so a forked child never shares its parent's segments
+        return self._writer or f"p{os.getpid()}"
+
+    def _active_segment(self, day, incoming_bytes):
+        """Return the segment to append to, rotating when it would exceed the size limit"""
+        writer = self.writer
+        if day != self._segment_day or writer != self._segment_writer:
+            # First write of the day: resume the newest existing segment, if any
+            self._segment_day = day
+            self._segment_writer = writer
+            self.logs_dir.mkdir(parents=True, exist_ok=True)
+            own_segments = self._own_segments(day)
+            self._segment_seq = own_segments[-1][0] if own_segments else 0
+
+        # Other loggers in this process may have rotated already; sizes are shared through the sink
+        while True:
+            segment_path = self.logs_dir / self.segment_name(day, self._segment_seq, writer)
+            size = self.sink.tracked_size(segment_path)
+            if not size or size + incoming_bytes <= self.max_segment_bytes:
+                return segment_path
+            self._segment_seq += 1
+
+    def _own_segments(self, day):
+        """List (seq, path) of the segments this logger appends to for a day, oldest first"""
+        segments = []
+        for path in self.logs_dir.glob(f"{day}.{self._segment_writer}.*.jsonl"):
+            match = SEGMENT_PATTERN.match(path.name)
+            if match and match.group(2) == self._segment_writer:
+                segments.append((int(match.group(3)), path))
+        return sorted(segments)
 
     def log_action(self, action_type, description, details=None, status="completed"):
         """Log an action with timestamp and details"""
@@ -29,30 +114,20 @@ class AuditLogger:
             "details": details or {}
         }
 
-        # Ensure logs directory exists
-        self.logs_dir.mkdir(parents=True, exist_ok=True)
-
-        # Get today's log file
-        log_path = self.get_today_log_path()
+        # One line per entry: appending costs the same no matter how many entries the day holds
+        data = (json.dumps(log_entry, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        log_path = self._active_segment(log_entry["timestamp"][:10], len(data))
 
-        # Read existing log entries or create new list
-        if log_path.exists():
-            with open(log_path, 'r') as f:
-                log_data = json.load(f)
-        else:
-            log_data = []
-
-        # Add new entry
-        log_data.append(log_entry)
-
-        # Write back to file
-        with open(log_path, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        offset = self.sink.write(log_path, data)
+        # Sidecar index line so queries can seek straight to this entry
+        self.sink.write(index_path(log_path), format_index_line(log_entry, offset, len(data)))
+        self.rollups.observe(log_entry, log_path.name, log_entry["timestamp"][:10], offset, len(data))
 
         print(f"Logged action: {action_type} - {description}")
 
     def log_error(self, error_type, error_message, context=None):
         """Log an error with timestamp and context"""
+        get_metrics_registry().inc("ai_employee_logged_errors_total", {"error_type": error_type})
         self.log_action(
             action_type="ERROR",
             description=error_message,
@@ -73,6 +148,316 @@ class AuditLogger:
             status="security"
         )
 
+    def flush(self):
+        """Wait until every entry logged so far is on disk"""
+        self.sink.flush()
+
+    def list_segments(self, day):
+        """List every segment file holding entries for a day"""
+        self.flush()
+
+        segments = []
+        for path in self.logs_dir.glob(f"{day}.*.jsonl"):
+            match = SEGMENT_PATTERN.match(path.name)
+            if match:
+                segments.append((match.group(2) or "", int(match.group(3)), path))
+        return [path for _, _, path in sorted(segments)]
+
+    def list_days(self):
+        """List the days that have log entries (live or archived), oldest first"""
+        self.flush()
+
+        days = set()
+        if not self.logs_dir.exists():
+            return []
+        for path in self.logs_dir.iterdir():
+            match = SEGMENT_PATTERN.match(path.name) or LEGACY_PATTERN.match(path.name)
+            if match:
+                days.add(match.group(1))
+        if self.archive_dir.exists():
+            for path in self.archive_dir.iterdir():
+                match = ARCHIVE_PATTERN.match(path.name)
+                if match:
+                    days.add(match.group(1))
+        return sorted(days)
+
+    def find_archive(self, day):
+        """Get the compressed archive for a day, if it has been archived"""
+        for extension, _ in COMPRESSIONS.values():
+            archive_path = self.archive_dir / f"{day}.jsonl.{extension}"
+            if archive_path.exists():
+                return archive_path
+        return None
+
+    def day_files(self, day):
+        """Find the archive, legacy array and live segments holding a day's entries.
+
+        Files already folded into the archive (left behind by an interrupted
+        archive run) are skipped so no entry is read twice.
+        """
+        archive_path = self.find_archive(day)
+        archived = set()
+        if archive_path:
+            archive_index = read_archive_index(archive_path)
+            archived = set(archive_index["sources"]) if archive_index else set()
+
+        legacy_path = self.logs_dir / f"{day}.json"
+        if not legacy_path.exists() or legacy_path.name in archived:
+            legacy_path = None
+
+        segments = [path for path in self.list_segments(day) if path.name not in archived]
+        return archive_path, legacy_path, segments
+
+    def read_segment(self, segment_path):
+        """Yield the entries of one JSON-lines segment"""
+        with open(segment_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    # Entry still being written by another process
+                    break
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def read_legacy(self, legacy_path):
+        """Read a legacy pretty-printed JSON array log"""
+        with open(legacy_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def read_entries(self, day):
+        """Yield all entries logged on a day in timestamp order"""
+        archive_path, legacy_path, segments = self.day_files(day)
+
+        sources = []
+        if archive_path:
+            # Streamed straight out of the compressed file
+            sources.append(read_archive(archive_path))
+        if legacy_path:
+            sources.append(iter(self.read_legacy(legacy_path)))
+        for segment_path in segments:
+            sources.append(self.read_segment(segment_path))
+
+        # Every source is already in time order, so a streaming merge is enough
+        yield from heapq.merge(*sources, key=lambda entry: entry.get("timestamp", ""))
+
+    def iter_entries(self, start_day=None, end_day=None):
+        """Yield entries for every day in [start_day, end_day] (YYYY-MM-DD strings)"""
+        for day in self.list_days():
+            if start_day and day < start_day:
+                continue
+            if end_day and day > end_day:
+                continue
+            yield from self.read_entries(day)
+
+    def get_rollups(self):
+        """Get the per-day rollups, caught up with everything on disk"""
+        self.flush()
+
+        segments = []
+        legacy = []
+        archives = []
+        for day in self.list_days():
+            archive_path, legacy_path, day_segments = self.day_files(day)
+            if archive_path:
+                archive_index = read_archive_index(archive_path)
+                if archive_index:
+                    archives.append((archive_path.name, day, archive_path, archive_index["counts"]))
+            if legacy_path:
+                legacy.append((legacy_path.name, day, legacy_path))
+            segments.extend((path.name, day, path) for path in day_segments)
+
+        self.rollups.catch_up(segments, legacy, archives)
+        self.rollups.save()
+        return self.rollups
+
+    def rescan_rollups(self):
+        """Recount every day from the raw logs (slow; for verifying get_rollups)"""
+        return rescan((day, self.read_entries(day)) for day in self.list_days())
+
+    def query(self, action_type=None, status=None, start=None, end=None, limit=None):
+        """Find entries by action type(s), status(es) and time range, oldest first.
+
+        start/end are datetimes or ISO strings (inclusive). Segments are read
+        through their sidecar index, so only matching records are loaded.
+        """
+        action_types = self._as_filter(action_type)
+        statuses = self._as_filter(status)
+        start = self._as_timestamp(start)
+        end = self._as_timestamp(end, upper=True)
+
+        results = []
+        for day in self.list_days():
+            if start and day < start[:10]:
+                continue
+            if end and day > end[:10]:
+                continue
+
+            hours = self._hours_in_range(day, start, end)
+            archive_path, legacy_path, segments = self.day_files(day)
+            sources = []
+
+            if archive_path:
+                # The archive index rules out most archived days without decompressing them
+                if archive_may_match(read_archive_index(archive_path), action_types, statuses, hours, start, end):
+                    sources.append(
+                        entry for entry in read_archive(archive_path)
+                        if self._matches(entry, action_types, statuses)
+                    )
+
+            if legacy_path:
+                # Legacy arrays have no index; run convert_legacy_logs to make them seekable
+                sources.append(iter([
+                    entry for entry in self.read_legacy(legacy_path)
+                    if self._matches(entry, action_types, statuses)
+                ]))
+
+            for segment_path in segments:
+                sources.append(iter(self.index.read_matching(segment_path, action_types, statuses, hours)))
+
+            for entry in heapq.merge(*sources, key=lambda entry: entry.get("timestamp", "")):
+                timestamp = entry.get("timestamp", "")
+                if start and timestamp < start:
+                    continue
+                if end and timestamp > end:
+                    continue
+                results.append(entry)
+                if limit and len(results) >= limit:
+                    return results
+
+        return results
+
+    def _as_filter(self, value):
+        """Normalize a filter value to a set (None means no filter)"""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return {value}
+        return set(value)
+
+    def _as_timestamp(self, value, upper=False):
+        """Normalize a datetime/date/ISO string bound to an ISO string.
+
+        A bare date as upper bound covers that whole day.
+        """
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, date):
+            value = value.isoformat()
+        if upper and len(value) == 10:
+            return value + "T23:59:59.999999"
+        return value
+
+    def _hours_in_range(self, day, start, end):
+        """Hours of a day covered by [start, end], or None when the whole day is"""
+        first = int(start[11:13]) if start and start[:10] == day and len(start) > 10 else 0
+        last = int(end[11:13]) if end and end[:10] == day and len(end) > 10 else 23
+        if first == 0 and last == 23:
+            return None
+        return set(range(first, last + 1))
+
+    def _matches(self, entry, action_types, statuses):
+        """Check an entry against the action type and status filters"""
+        if action_types is not None and entry.get("action_type") not in action_types:
+            return False
+        if statuses is not None and entry.get("status") not in statuses:
+            return False
+        return True
+
+    def convert_legacy_logs(self):
+        """Convert legacy YYYY-MM-DD.json arrays into JSON-lines segments"""
+        self.flush()
+
+        converted = 0
+        for legacy_path in sorted(self.logs_dir.glob("*.json")):
+            match = LEGACY_PATTERN.match(legacy_path.name)
+            if not match:
+                continue
+            day = match.group(1)
+
+            # A previous run may have stopped after writing segments but before removing the array
+            if not (self.logs_dir / self.segment_name(day, 0, writer="legacy")).exists():
+                self._write_legacy_segments(day, self.read_legacy(legacy_path))
+
+            legacy_path.unlink()
+            converted += 1
+            print(f"Converted legacy log: {legacy_path.name}")
+
+        return converted
+
+    def _write_legacy_segments(self, day, entries):
+        """Write converted entries as size-limited segments, publishing each atomically"""
+        chunks = [[]]
+        chunk_size = 0
+        for entry in entries:
+            data = (json.dumps(entry, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+            if chunks[-1] and chunk_size + len(data) > self.max_segment_bytes:
+                chunks.append([])
+                chunk_size = 0
+            chunks[-1].append(data)
+            chunk_size += len(data)
+
+        # Publish the first segment last so its presence marks a finished conversion
+        for seq in reversed(range(len(chunks))):
+            segment_path = self.logs_dir / self.segment_name(day, seq, writer="legacy")
+            offset = 0
+            index_lines = []
+            for data in chunks[seq]:
+                index_lines.append(format_index_line(json.loads(data), offset, len(data)).encode("utf-8"))
+                offset += len(data)
+
+            for path, lines in ((index_path(segment_path), index_lines), (segment_path, chunks[seq])):
+                tmp_path = path.with_name(path.name + ".tmp")
+                with open(tmp_path, 'wb') as f:
+                    f.writelines(lines)
+                os.replace(tmp_path, path)
+
+    def archive_old_logs(self, older_than_days=None, compression=None):
+        """Compress every day older than older_than_days into /Logs/archive.
+
+        A day's archive holds all of its entries in time order; the live
+        segments, their indexes and any legacy array are removed afterwards.
+        """
+        if older_than_days is None:
+            older_than_days = int(os.getenv("AUDIT_LOG_ARCHIVE_DAYS", DEFAULT_ARCHIVE_DAYS))
+        compression = compression or os.getenv("AUDIT_LOG_ARCHIVE_COMPRESSION", "gzip")
+        cutoff = (date.today() - timedelta(days=older_than_days)).isoformat()
+
+        archived = 0
+        for day in self.list_days():
+            if day >= cutoff:
+                break
+
+            archive_path, legacy_path, segments = self.day_files(day)
+            if not legacy_path and not segments:
+                continue
+
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            target = self.archive_dir / archive_name(day, compression)
+            sources = [path.name for path in segments]
+            if legacy_path:
+                sources.append(legacy_path.name)
+            if archive_path:
+                sources.extend((read_archive_index(archive_path) or {}).get("sources", []))
+
+            index = write_archive(target, self.read_entries(day), sources)
+
+            if archive_path and archive_path != target:
+                archive_path.unlink()
+                archive_index_path(archive_path).unlink(missing_ok=True)
+            if legacy_path:
+                legacy_path.unlink()
+            for segment_path in segments:
+                segment_path.unlink()
+                index_path(segment_path).unlink(missing_ok=True)
+                self.index.forget(segment_path)
+
+            archived += 1
+            print(f"Archived {index['entries']} log entries for {day}: {target.name}")
+
+        return archived
+
     def run_test_log(self):
         """Create a test log entry to verify functionality"""
         self.log_action(
@@ -91,6 +476,33 @@ class AuditLogger:
         self.run_test_log()
         print("Audit Logger initialized and ready")
 
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Audit Logger")
+    parser.add_argument("--vault", default="./vault",
+                       help="Path to vault directory")
+    parser.add_argument("--convert-legacy", action="store_true",
+                       help="Convert legacy YYYY-MM-DD.json logs to JSON-lines segments")
+    parser.add_argument("--archive", action="store_true",
+                       help="Compress old log days into Logs/archive")
+    parser.add_argument("--older-than", type=int, default=None,
+                       help=f"Archive days older than this many days (default {DEFAULT_ARCHIVE_DAYS})")
+    parser.add_argument("--compression", choices=sorted(COMPRESSIONS), default=None,
+                       help="Archive compression (default gzip)")
+
+    args = parser.parse_args()
+
+    logger = AuditLogger(args.vault)
+
+    if args.convert_legacy:
+        converted = logger.convert_legacy_logs()
+        print(f"Converted {converted} legacy log files")
+    elif args.archive:
+        archived = logger.archive_old_logs(args.older_than, args.compression)
+        print(f"Archived {archived} log days")
+    else:
+        logger.run()
+
 if __name__ == "__main__":
-    logger = AuditLogger()
-    logger.run()
\ No newline at end of file
+    main()
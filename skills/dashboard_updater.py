@@ -5,10 +5,18 @@ Updates Dashboard.md with recent activity
 """
 
 import os
+import re
+import sys
 import json
 from datetime import datetime, date
 from pathlib import Path
 
+# Allow running as a script from the skills directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.vault_index import get_vault_index
+from utils.done_archive import shard_folder
+
 class DashboardUpdater:
     def __init__(self, vault_path="./vault"):
         self.vault_path = Path(vault_path)
@@ -19,23 +27,42 @@ class DashboardUpdater:
         self.done_dir = self.vault_path / "Done"
         self.logs_dir = self.vault_path / "Logs"
 
+        # Import skills
+        sys.path.append(str(Path(__file__).resolve().parent))
+
+        from audit_logger import AuditLogger
+
+        self.audit_logger = AuditLogger(vault_path)
+        self.vault_index = get_vault_index(vault_path)
+
     def get_counts(self):
         """Get current counts for dashboard"""
-        needs_action_count = len(list(self.needs_action_dir.glob("*.md")))
-        plans_count = len(list(self.plans_dir.glob("*.md")))
-        approval_count = len(list(self.pending_approval_dir.glob("*.md")))
+        needs_action_count = self.vault_index.count("Needs_Action", "*.md")
+        plans_count = self.vault_index.count("Plans", "*.md")
+        approval_count = self.vault_index.count("Pending_Approval", "*.md")
+
+        # Count items in today's Done shard
+        done_today_count = self.vault_index.count(shard_folder(date.today()), "*.md")
 
-        # Count items in Done directory for today
-        today = date.today().strftime("%Y-%m-%d")
-        done_today_count = len(list(self.done_dir.glob(f"*{today}*.md")))
+        # Errors logged today, read through the audit log index
+        errors_today_count = len(self.audit_logger.query(action_type="ERROR", start=date.today()))
 
         return {
             'needs_action_count': needs_action_count,
             'in_progress_count': plans_count,  # Plans represent in-progress tasks
             'approval_count': approval_count,
             'done_today_count': done_today_count,
+            'errors_today_count': errors_today_count,
         }
 
+    def update_error_count(self, dashboard, counts):
+        """Set the Errors Today stat, whatever value it currently shows"""
+        return re.sub(
+            r"- \*\*Errors Today\*\*: `[^`]*`",
+            f"- **Errors Today**: `{counts['errors_today_count']}`",
+            dashboard
+        )
+
     def update_dashboard(self):
         """Update the dashboard with current statistics"""
         counts = self.get_counts()
@@ -64,9 +91,10 @@ class DashboardUpdater:
             "- **Completed Today**: `{{done_today_count}}`",
             f"- **Completed Today**: `{counts['done_today_count']}`"
         )
+        updated_dashboard = self.update_error_count(updated_dashboard, counts)
 
         # Write updated dashboard
-        self.dashboard_path.write_text(updated_dashboard)
+        self.vault_index.write_text(self.dashboard_path, updated_dashboard)
         print(f"Dashboard updated with current counts: {counts}")
 
     def add_recent_activity(self, activity_description):
@@ -134,9 +162,10 @@ class DashboardUpdater:
             "- **Completed Today**: `{{done_today_count}}`",
             f"- **Completed Today**: `{counts['done_today_count']}`"
         )
+        updated_dashboard = self.update_error_count(updated_dashboard, counts)
 
         # Write updated dashboard
-        self.dashboard_path.write_text(updated_dashboard)
+        self.vault_index.write_text(self.dashboard_path, updated_dashboard)
         print(f"Dashboard updated with current counts: {counts} and AI status: Mode={ai_mode}, Services={connected_services}")
 
 if __name__ == "__main__":
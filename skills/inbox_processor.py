@@ -5,45 +5,47 @@ Reads /Needs_Action and classifies items, creating Plan files
 """
 
 import os
+import sys
 import json
 from datetime import datetime
 from pathlib import Path
 
+# Allow running as a script from the skills directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.vault_index import get_vault_index
+from utils.task_classifier import classify_texts, get_task_classifier
+from utils.task_events import get_task_events
+
 class InboxProcessor:
     def __init__(self, vault_path="./vault", ai_client=None):
         self.vault_path = Path(vault_path)
         self.ai_client = ai_client  # OpenRouter AI client
         self.needs_action_dir = self.vault_path / "Needs_Action"
         self.plans_dir = self.vault_path / "Plans"
+        self.vault_index = get_vault_index(vault_path)
+        self.task_events = get_task_events(vault_path)
 
     def process_inbox(self):
         """Process all items in Needs_Action directory"""
-        items = list(self.needs_action_dir.glob("*.md"))
+        # Entries load each item's text once, shared by classify_items and create_plan
+        items = self.vault_index.files("Needs_Action", "*.md")
+        for item, classification in zip(items, self.classify_items(items)):
+            print(f"Processing: {item.name}")
+            self.create_plan(item, classification)
 
-        for item_path in items:
-            print(f"Processing: {item_path.name}")
-            classification = self.classify_item(item_path)
-            self.create_plan(item_path, classification)
+    def classify_items(self, items):
+        """Classify a batch of items in one call (trained model if available, else keyword rules)"""
+        return classify_texts([item.read_text() for item in items], get_task_classifier(self.vault_path))
 
     def classify_item(self, item_path):
         """Classify the item based on content"""
-        content = item_path.read_text()
-
-        # Basic classification logic
-        if any(keyword in content.lower() for keyword in ['email', 'gmail', 'communication']):
-            return 'COMMUNICATION'
-        elif any(keyword in content.lower() for keyword in ['finance', 'payment', 'expense', 'bill']):
-            return 'FINANCE'
-        elif any(keyword in content.lower() for keyword in ['file', 'document', 'organize']):
-            return 'FILE_MANAGEMENT'
-        elif any(keyword in content.lower() for keyword in ['project', 'task', 'deadline']):
-            return 'PROJECT_MANAGEMENT'
-        else:
-            return 'GENERAL'
+        return self.classify_items([item_path])[0]
 
     def create_plan(self, item_path, classification):
-        """Create a plan file based on classification"""
-        item_content = item_path.read_text()
+        """Create a plan file based on classification (item_path: the item's path or VaultEntry)"""
+        item_path = self.vault_index.entry(item_path)
+        item_content = item_path.document
 
         plan_content = f"""---
 title: "Plan for {item_path.stem}"
@@ -56,7 +58,7 @@ status: pending
 # Plan for {item_path.stem}
 
 ## Item Summary
-{item_content[:200]}...
+{item_content.preview(200)}...
 
 ## Classification
 {classification}
@@ -84,7 +86,11 @@ status: pending
 """
 
         plan_path = self.plans_dir / f"plan_{item_path.stem}.md"
-        plan_path.write_text(plan_content)
+        self.vault_index.write_text(plan_path, plan_content)
+        # The item stays in Needs_Action and is planned again every cycle; only its first plan is a transition
+        current = self.task_events.state(item_path)
+        if current is None or current.state == "created":
+            self.task_events.record(item_path, "planned", plan_path)
         print(f"Created plan: {plan_path.name}")
 
     def run(self):
@@ -5,10 +5,19 @@ Verifies task is complete and moves related files to /Done
 """
 
 import os
+import sys
 import json
 from datetime import datetime
 from pathlib import Path
 
+# Allow running as a script from the skills directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.vault_index import get_vault_index
+from utils.done_archive import done_destination
+from utils.frontmatter import read_frontmatter
+from utils.task_events import get_task_events
+
 class TaskCompletionChecker:
     def __init__(self, vault_path="./vault"):
         self.vault_path = Path(vault_path)
@@ -16,22 +25,24 @@ class TaskCompletionChecker:
         self.approved_dir = self.vault_path / "Approved"
         self.done_dir = self.vault_path / "Done"
         self.logs_dir = self.vault_path / "Logs"
+        self.vault_index = get_vault_index(vault_path)
+        self.task_events = get_task_events(vault_path)
 
     def find_complete_tasks(self):
         """Find tasks that are marked as complete or have been processed"""
         complete_tasks = []
 
         # Check approved directory for tasks that might be processed
-        for approved_file in self.approved_dir.glob("*.md"):
+        for approved_file in self.vault_index.paths("Approved", "*.md"):
             # In a real system, this would check for completion indicators
             # For now, we'll consider any approved task as potentially complete
             # if it has a corresponding plan file that indicates completion
             complete_tasks.append(approved_file)
 
-        # Also check plan files for completion status
-        for plan_file in self.plans_dir.glob("plan_*.md"):
-            content = plan_file.read_text()
-            if "status: completed" in content.lower() or "completed: true" in content.lower():
+        # Also check plan files for completion status, read from their frontmatter only
+        for plan_file in self.vault_index.paths("Plans", "plan_*.md"):
+            header = read_frontmatter(plan_file)
+            if header.get("status", "").lower() == "completed" or header.get("completed", "").lower() == "true":
                 complete_tasks.append(plan_file)
 
         return complete_tasks
@@ -41,10 +52,11 @@ class TaskCompletionChecker:
         # Create new filename with completion timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         new_name = f"completed_{timestamp}_{task_path.name}"
-        done_path = self.done_dir / new_name
+        done_path = done_destination(self.vault_path, new_name)
 
         # Move the file
-        task_path.rename(done_path)
+        self.vault_index.move(task_path, done_path)
+        self.task_events.record(task_path, "done", done_path)
         print(f"Moved completed task to Done: {done_path.name}")
 
         # Also move related files if they exist
@@ -53,19 +65,19 @@ class TaskCompletionChecker:
     def move_related_files(self, original_stem, timestamp):
         """Move related files that correspond to the original task"""
         # Look for related plan files
-        related_plans = list(self.plans_dir.glob(f"*{original_stem}*.md"))
+        related_plans = self.vault_index.paths("Plans", f"*{original_stem}*.md")
         for plan in related_plans:
             new_name = f"completed_{timestamp}_{plan.name}"
-            done_path = self.done_dir / new_name
-            plan.rename(done_path)
+            done_path = done_destination(self.vault_path, new_name)
+            self.vault_index.move(plan, done_path)
             print(f"Moved related plan to Done: {done_path.name}")
 
         # Look for related approval files
-        related_approvals = list(self.approved_dir.glob(f"*{original_stem}*.md"))
+        related_approvals = self.vault_index.paths("Approved", f"*{original_stem}*.md")
         for approval in related_approvals:
             new_name = f"completed_{timestamp}_{approval.name}"
-            done_path = self.done_dir / new_name
-            approval.rename(done_path)
+            done_path = done_destination(self.vault_path, new_name)
+            self.vault_index.move(approval, done_path)
             print(f"Moved related approval to Done: {done_path.name}")
 
     def check_and_move_tasks(self):
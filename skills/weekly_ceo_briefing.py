@@ -5,10 +5,18 @@ Reads Business_Goals.md, Accounting, Done tasks, and generates Monday Briefing
 """
 
 import os
+import sys
 import json
 from datetime import datetime, date, timedelta
 from pathlib import Path
 
+# Allow running as a script from the skills directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.vault_index import get_vault_index
+from utils.done_archive import recent_shard_folders
+from utils.task_events import get_task_events
+
 class WeeklyCEOBriefing:
     def __init__(self, vault_path="./vault"):
         self.vault_path = Path(vault_path)
@@ -17,6 +25,15 @@ class WeeklyCEOBriefing:
         self.done_dir = self.vault_path / "Done"
         self.briefings_dir = self.vault_path / "Briefings"
 
+        # Import skills
+        sys.path.append(str(Path(__file__).resolve().parent))
+
+        from audit_logger import AuditLogger
+
+        self.audit_logger = AuditLogger(vault_path)
+        self.vault_index = get_vault_index(vault_path)
+        self.task_events = get_task_events(vault_path)
+
     def read_business_goals(self):
         """Read the business goals for strategic context"""
         if self.business_goals_path.exists():
@@ -33,16 +50,18 @@ class WeeklyCEOBriefing:
         one_week_ago = date.today() - timedelta(days=7)
         done_tasks = []
 
-        for task_file in self.done_dir.glob("*.md"):
-            # Check if file was modified in the last week
-            mod_date = date.fromtimestamp(task_file.stat().st_mtime)
-            if mod_date >= one_week_ago:
-                content = task_file.read_text()
-                done_tasks.append({
-                    "file": task_file.name,
-                    "content": content[:500],  # First 500 chars
-                    "completed_date": mod_date.isoformat()
-                })
+        # Only the Done shards for the last week are listed
+        for shard in recent_shard_folders(7):
+            for task_file in self.vault_index.files(shard, "*.md"):
+                # Check if file was modified in the last week
+                mod_date = date.fromtimestamp(task_file.mtime)
+                if mod_date >= one_week_ago:
+                    content = task_file.body
+                    done_tasks.append({
+                        "file": task_file.name,
+                        "content": content[:500],  # First 500 chars
+                        "completed_date": mod_date.isoformat()
+                    })
 
         return done_tasks
 
@@ -56,18 +75,36 @@ class WeeklyCEOBriefing:
         }
 
         # Look for accounting files
-        for acc_file in self.accounting_dir.glob("*.md"):
-            content = acc_file.read_text()
+        for acc_file in self.vault_index.files("Accounting", "*.md"):
+            content = acc_file.body
             # This is a simplified analysis - real implementation would parse financial data
             financial_summary["total_transactions"] += content.count("$")  # Very basic
 
         return financial_summary
 
+    def get_weekly_activity(self):
+        """Get this week's activity counts from the audit rollups and errors from the log index"""
+        week_start = date.today() - timedelta(days=7)
+        rollups = self.audit_logger.get_rollups()
+        return {
+            "counts": rollups.summary(start_day=week_start.isoformat()),
+            "errors": self.audit_logger.query(action_type="ERROR", start=week_start)
+        }
+
+    def get_task_pipeline(self):
+        """Tasks in each lifecycle state and those waiting on approval for over 2 days, from the task event log"""
+        return {
+            "counts": self.task_events.counts(),
+            "stuck_in_approval": self.task_events.stuck("pending_approval", timedelta(days=2))
+        }
+
     def generate_briefing(self):
         """Generate the weekly CEO briefing"""
         business_goals = self.read_business_goals()
         done_tasks = self.get_weekly_done_tasks()
         financial_summary = self.get_financial_summary()
+        weekly_activity = self.get_weekly_activity()
+        task_pipeline = self.get_task_pipeline()
 
         briefing_content = f"""---
 title: "Weekly CEO Briefing - {date.today().strftime('%Y-%W')}"
@@ -102,6 +139,31 @@ This week's performance against business objectives. Key highlights and upcoming
 - Summary: {task['content'][:200]}...
 """
 
+        action_counts = weekly_activity['counts']['action_types']
+        briefing_content += f"""
+## Logged Activity This Week
+- Total Actions Logged: {weekly_activity['counts']['total']}
+- Finance Plans Created: {action_counts.get('FINANCE_PLAN_CREATED', 0)}
+- Communication Drafts Created: {action_counts.get('COMMUNICATION_DRAFT_CREATED', 0)}
+- Project Plans Created: {action_counts.get('PROJECT_PLAN_CREATED', 0)}
+- Errors Logged: {len(weekly_activity['errors'])}
+"""
+
+        for error in weekly_activity['errors'][-5:]:
+            briefing_content += f"  - {error['timestamp'][:16]}: {error['description'][:120]}\n"
+
+        briefing_content += "\n### Actions by Agent\n"
+        for agent, count in sorted(weekly_activity['counts']['agents'].items()):
+            briefing_content += f"- {agent}: {count}\n"
+
+        briefing_content += "\n## Task Pipeline\n"
+        for state, count in task_pipeline['counts'].items():
+            briefing_content += f"- {state.replace('_', ' ').title()}: {count}\n"
+
+        briefing_content += f"\n### Waiting on Approval for Over 2 Days ({len(task_pipeline['stuck_in_approval'])})\n"
+        for task in task_pipeline['stuck_in_approval']:
+            briefing_content += f"- {task.task_id} (since {task.since:%Y-%m-%d})\n"
+
         briefing_content += f"""
 ## Financial Summary
 - Total Transactions Processed: {financial_summary['total_transactions']}
@@ -131,7 +193,7 @@ This week's performance against business objectives. Key highlights and upcoming
         # Write briefing to file
         briefing_filename = f"CEO_Briefing_{date.today().strftime('%Y-%m-%d')}.md"
         briefing_path = self.briefings_dir / briefing_filename
-        briefing_path.write_text(briefing_content)
+        self.vault_index.write_text(briefing_path, briefing_content)
 
         print(f"Weekly CEO Briefing generated: {briefing_path.name}")
         return briefing_path
@@ -23,13 +23,16 @@ class CEOStrategicAgent:
         # Import skills
         import sys
         sys.path.append(str(self.skills_dir))
+        sys.path.append(str(Path(__file__).resolve().parent.parent))
 
         from weekly_ceo_briefing import WeeklyCEOBriefing
         from audit_logger import AuditLogger
         from dashboard_updater import DashboardUpdater
+        from utils.vault_index import get_vault_index
 
         self.briefing_generator = WeeklyCEOBriefing(vault_path)
         self.audit_logger = AuditLogger(vault_path)
+        self.vault_index = get_vault_index(vault_path)
         self.dashboard_updater = DashboardUpdater(vault_path)
 
     def analyze_business_performance(self):
@@ -40,19 +43,23 @@ class CEOStrategicAgent:
         else:
             goals_content = "No business goals defined"
 
-        # Count completed tasks
-        import glob
-        done_files = list(self.done_dir.glob("*.md"))
-        completed_count = len(done_files)
+        # Count tasks completed this week, from the last week's Done shards only
+        from utils.done_archive import recent_shard_folders
+        completed_count = sum(self.vault_index.count(shard, "*.md") for shard in recent_shard_folders(7))
 
         # Analyze accounting data
-        accounting_files = list(self.accounting_dir.glob("*.md"))
-        cost_savings_identified = len(accounting_files)  # Placeholder for real analysis
+        cost_savings_identified = self.vault_index.count("Accounting", "*.md")  # Placeholder for real analysis
+
+        # Last week's activity comes from the precomputed audit rollups, not the raw logs
+        weekly_activity = self.audit_logger.get_rollups().last_days(7)
 
         performance_data = {
             'goals_status': goals_content[:500],  # First 500 chars as summary
             'completed_tasks_count': completed_count,
             'cost_savings_identified': cost_savings_identified,
+            'weekly_actions_logged': weekly_activity['total'],
+            'weekly_actions_by_agent': weekly_activity['agents'],
+            'weekly_errors': weekly_activity['statuses'].get('error', 0),
             'last_analysis': datetime.now().isoformat()
         }
 
@@ -63,8 +70,8 @@ class CEOStrategicAgent:
         opportunities = []
 
         # Look through accounting records for potential savings
-        for acc_file in self.accounting_dir.glob("*.md"):
-            content = acc_file.read_text().lower()
+        for acc_file in self.vault_index.files("Accounting", "*.md"):
+            content = acc_file.document.lower
 
             # Look for subscription-like expenses
             if any(word in content for word in ['subscription', 'monthly', 'recurring', 'annual']):
@@ -96,6 +103,9 @@ class CEOStrategicAgent:
         """Create a strategic plan based on analysis"""
         performance_data = self.analyze_business_performance()
         cost_opportunities = self.identify_cost_optimization_opportunities()
+        agent_activity = ", ".join(
+            f"{agent}: {count}" for agent, count in sorted(performance_data['weekly_actions_by_agent'].items())
+        )
 
         strategic_content = f"""---
 title: "Strategic Analysis and Plan"
@@ -116,6 +126,9 @@ status: generated
 
 ### Productivity Metrics
 - Auto-processing: {performance_data['completed_tasks_count']} tasks completed
+- Actions logged (7 days): {performance_data['weekly_actions_logged']}
+- Errors logged (7 days): {performance_data['weekly_errors']}
+- Actions by agent (7 days): {agent_activity or 'None'}
 - Goal alignment: [Based on business goals content]
 - Efficiency gains: [Estimated based on time saved]
 
@@ -166,7 +179,7 @@ status: generated
 
         # Save strategic plan
         strategic_path = self.plans_dir / f"strategic_plan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-        strategic_path.write_text(strategic_content)
+        self.vault_index.write_text(strategic_path, strategic_content)
 
         self.audit_logger.log_action(
             "STRATEGIC_PLAN_CREATED",
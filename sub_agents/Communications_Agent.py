@@ -21,35 +21,39 @@ class CommunicationsAgent:
         # Import skills
         import sys
         sys.path.append(str(self.skills_dir))
+        sys.path.append(str(Path(__file__).resolve().parent.parent))
 
         from inbox_processor import InboxProcessor
         from approval_manager import ApprovalManager
         from audit_logger import AuditLogger
+        from utils.vault_index import get_vault_index
+        from utils.task_events import get_task_events
+        from utils.keyword_matcher import KeywordMatcher
 
         self.inbox_processor = InboxProcessor(vault_path)
         self.approval_manager = ApprovalManager(vault_path)
         self.audit_logger = AuditLogger(vault_path)
+        self.vault_index = get_vault_index(vault_path)
+        self.task_events = get_task_events(vault_path)
+        self.communication_types = KeywordMatcher({'EMAIL': ['email', 'gmail'], 'WHATSAPP': ['whatsapp']})
 
-    def monitor_communications(self):
-        """Monitor for new communication tasks in Needs_Action"""
-        communication_keywords = ['email', 'gmail', 'whatsapp', 'message', 'communication', 'reply', 'response']
+    def monitor_communications(self, candidates=None):
+        """Monitor for new communication tasks in Needs_Action (only among candidates if given)"""
+        from utils.task_dispatcher import ROUTE_KEYWORDS
 
-        communication_tasks = []
-        for item in self.needs_action_dir.glob("*.md"):
-            content = item.read_text().lower()
-            if any(keyword in content for keyword in communication_keywords):
-                communication_tasks.append(item)
+        communication_keywords = ROUTE_KEYWORDS["communications"]
 
-        return communication_tasks
+        return self.vault_index.matching("Needs_Action", communication_keywords, "*.md", among=candidates)
 
     def draft_reply(self, task_file):
         """Draft a reply based on the communication task"""
-        content = task_file.read_text()
+        document = task_file.document
 
-        # Simple pattern matching for reply drafting
-        if 'email' in content.lower() or 'gmail' in content.lower():
+        # Simple pattern matching for reply drafting, in one pass over the content
+        found_types = document.scan(self.communication_types)
+        if 'EMAIL' in found_types:
             communication_type = 'EMAIL'
-        elif 'whatsapp' in content.lower():
+        elif 'WHATSAPP' in found_types:
             communication_type = 'WHATSAPP'
         else:
             communication_type = 'GENERAL_COMMUNICATION'
@@ -67,7 +71,7 @@ requires_approval: true
 # Draft Reply
 
 ## Original Request
-{content[:300]}...
+{document.preview(300)}...
 
 ## Suggested Response
 Based on the request, here is a suggested response:
@@ -93,7 +97,7 @@ Based on the request, here is a suggested response:
 
         # Save draft to Plans directory
         draft_path = self.plans_dir / f"draft_reply_{task_file.stem}.md"
-        draft_path.write_text(draft_content)
+        self.vault_index.write_text(draft_path, draft_content)
 
         self.audit_logger.log_action(
             "COMMUNICATION_DRAFT_CREATED",
@@ -103,39 +107,52 @@ Based on the request, here is a suggested response:
 
         return draft_path
 
-    def process_communication_tasks(self):
-        """Process all communication-related tasks"""
-        communication_tasks = self.monitor_communications()
+    def process_communication_tasks(self, tasks=None):
+        """Process all communication-related tasks (the dispatcher's queue if given)"""
+        if tasks is not None:
+            return sum(self.process_communication_task(task) for task in tasks)
 
+        # Run on its own: only tasks added or changed since this agent's last pass,
+        # processed inside the pass so the ones that fail are seen again next time
         processed_count = 0
-        for task in communication_tasks:
-            print(f"Processing communication task: {task.name}")
-
-            try:
-                draft_path = self.draft_reply(task)
-                print(f"Created draft: {draft_path.name}")
-
-                # Move original task to avoid re-processing
-                done_dir = self.vault_path / "Done"
-                done_dir.mkdir(parents=True, exist_ok=True)
-                completed_path = done_dir / f"processed_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{task.name}"
-                task.rename(completed_path)
-
-                processed_count += 1
-            except Exception as e:
-                self.audit_logger.log_error(
-                    "COMMUNICATION_PROCESSING_ERROR",
-                    f"Error processing {task.name}: {str(e)}",
-                    {"task_file": task.name}
-                )
-
+        with self.vault_index.changes("Needs_Action", "communications_agent", "*.md") as changes:
+            for task in self.monitor_communications(changes.pending):
+                if self.process_communication_task(task):
+                    processed_count += 1
+                else:
+                    changes.retry(task.path)
         return processed_count
 
-    def run(self):
-        """Main execution method"""
+    def process_communication_task(self, task):
+        """Process one communication task and move it out of Needs_Action; returns False if it failed"""
+        from utils.done_archive import done_destination
+
+        print(f"Processing communication task: {task.name}")
+
+        try:
+            draft_path = self.draft_reply(task)
+            print(f"Created draft: {draft_path.name}")
+
+            # Move original task to avoid re-processing
+            completed_path = done_destination(self.vault_path, f"processed_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{task.name}")
+            self.vault_index.move(task, completed_path)
+            # The draft carries the task on through approval
+            self.task_events.record(draft_path, "planned", draft_path, source=task.name)
+
+            return True
+        except Exception as e:
+            self.audit_logger.log_error(
+                "COMMUNICATION_PROCESSING_ERROR",
+                f"Error processing {task.name}: {str(e)}",
+                {"task_file": task.name}
+            )
+            return False
+
+    def run(self, tasks=None):
+        """Main execution method (tasks: this agent's queue from the task dispatcher)"""
         print(f"Communications Agent starting at {datetime.now()}")
 
-        processed_count = self.process_communication_tasks()
+        processed_count = self.process_communication_tasks(tasks)
 
         print(f"Communications Agent completed - processed {processed_count} tasks")
 
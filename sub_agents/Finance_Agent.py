@@ -10,6 +10,17 @@ from datetime import datetime
 from pathlib import Path
 
 class FinanceAgent:
+    # Expense categories, checked in order
+    EXPENSE_CATEGORIES = {
+        'utilities': ['electricity', 'gas', 'water', 'internet', 'phone', 'utilities'],
+        'subscriptions': ['subscription', 'netflix', 'spotify', 'amazon', 'prime', 'membership', 'recurring'],
+        'food': ['grocery', 'restaurant', 'food', 'delivery', 'meal'],
+        'transportation': ['gas', 'fuel', 'transport', 'car', 'uber', 'taxi'],
+        'entertainment': ['movie', 'game', 'entertainment', 'theater', 'event'],
+        'health': ['pharmacy', 'doctor', 'health', 'medical', 'insurance'],
+        'business': ['office', 'software', 'business', 'work', 'professional'],
+    }
+
     def __init__(self, vault_path="./vault", skills_dir="./skills", ai_client=None):
         self.vault_path = Path(vault_path)
         self.skills_dir = Path(skills_dir)
@@ -21,50 +32,42 @@ class FinanceAgent:
         # Import skills
         import sys
         sys.path.append(str(self.skills_dir))
+        sys.path.append(str(Path(__file__).resolve().parent.parent))
 
         from approval_manager import ApprovalManager
         from audit_logger import AuditLogger
+        from utils.vault_index import get_vault_index
+        from utils.task_events import get_task_events
+        from utils.keyword_matcher import KeywordMatcher
 
         self.approval_manager = ApprovalManager(vault_path)
         self.audit_logger = AuditLogger(vault_path)
+        self.vault_index = get_vault_index(vault_path)
+        self.task_events = get_task_events(vault_path)
+        self.expense_matcher = KeywordMatcher(self.EXPENSE_CATEGORIES)
 
-    def monitor_finance_tasks(self):
-        """Monitor for new finance-related tasks in Needs_Action"""
-        finance_keywords = ['finance', 'payment', 'expense', 'bill', 'transaction', 'bank', 'subscription', 'money', 'cost', 'budget']
+    def monitor_finance_tasks(self, candidates=None):
+        """Monitor for new finance-related tasks in Needs_Action (only among candidates if given)"""
+        from utils.task_dispatcher import ROUTE_KEYWORDS
 
-        finance_tasks = []
-        for item in self.needs_action_dir.glob("*.md"):
-            content = item.read_text().lower()
-            if any(keyword in content for keyword in finance_keywords):
-                finance_tasks.append(item)
+        finance_keywords = ROUTE_KEYWORDS["finance"]
 
-        return finance_tasks
+        return self.vault_index.matching("Needs_Action", finance_keywords, "*.md", among=candidates)
 
     def categorize_expense(self, description):
         """Categorize an expense based on description"""
-        categories = {
-            'utilities': ['electricity', 'gas', 'water', 'internet', 'phone', 'utilities'],
-            'subscriptions': ['subscription', 'netflix', 'spotify', 'amazon', 'prime', 'membership', 'recurring'],
-            'food': ['grocery', 'restaurant', 'food', 'delivery', 'meal'],
-            'transportation': ['gas', 'fuel', 'transport', 'car', 'uber', 'taxi'],
-            'entertainment': ['movie', 'game', 'entertainment', 'theater', 'event'],
-            'health': ['pharmacy', 'doctor', 'health', 'medical', 'insurance'],
-            'business': ['office', 'software', 'business', 'work', 'professional'],
-        }
-
-        description_lower = description.lower()
-        for category, keywords in categories.items():
-            if any(keyword in description_lower for keyword in keywords):
+        found = self.expense_matcher.scan(description)
+        for category in self.EXPENSE_CATEGORIES:
+            if category in found:
                 return category
 
         return 'other'
 
     def analyze_transaction(self, task_file):
         """Analyze a financial transaction task"""
-        content = task_file.read_text()
+        document = task_file.document
 
         # Extract transaction details (simplified parsing)
-        lines = content.split('\n')
         transaction_info = {
             'amount': 'Unknown',
             'description': 'Unknown',
@@ -73,8 +76,7 @@ class FinanceAgent:
         }
 
         # Look for common patterns in the content
-        for line in lines:
-            line_lower = line.lower()
+        for line, line_lower in document.lines():
             if '$' in line:
                 # Extract amount (simplified)
                 import re
@@ -144,11 +146,11 @@ Category: {transaction_info['category']}
 
         # Save plan to Plans directory
         plan_path = self.plans_dir / f"finance_plan_{task_file.stem}.md"
-        plan_path.write_text(plan_content)
+        self.vault_index.write_text(plan_path, plan_content)
 
         # Save to accounting for record keeping
         accounting_path = self.accounting_dir / f"transaction_{task_file.stem}.md"
-        accounting_path.write_text(f"""---
+        self.vault_index.write_text(accounting_path, f"""---
 title: "Accounting Record: {task_file.stem}"
 date: {datetime.now().isoformat()}
 category: {transaction_info['category']}
@@ -183,20 +185,21 @@ status: pending_approval
 
     def flag_subscription_issues(self):
         """Identify potential subscription issues"""
-        # Look for recurring payments that might be problematic
-        accounting_files = list(self.accounting_dir.glob("transaction_*.md"))
+        from utils.frontmatter import read_frontmatter
 
+        # Look for recurring payments that might be problematic; the record's
+        # category and status are in its frontmatter, so the body is never read
         subscriptions = []
-        for acc_file in accounting_files:
-            content = acc_file.read_text()
-            if any(word in content.lower() for word in ['subscription', 'recurring', 'monthly']):
-                subscriptions.append(acc_file)
+        for acc_file in self.vault_index.paths("Accounting", "transaction_*.md"):
+            header = read_frontmatter(acc_file)
+            summary = f"{header.get('category', '')} {header.get('title', '')}".lower()
+            if any(word in summary for word in ['subscription', 'recurring', 'monthly']):
+                subscriptions.append((acc_file, header))
 
         # Flag potential issues
         flagged_issues = []
-        for sub_file in subscriptions:
-            content = sub_file.read_text()
-            if 'cancelled' not in content.lower() and 'stopped' not in content.lower():
+        for sub_file, header in subscriptions:
+            if header.get('status', '').lower() not in ('cancelled', 'stopped'):
                 flagged_issues.append({
                     'file': sub_file.name,
                     'description': 'Active subscription requiring monitoring'
@@ -232,42 +235,55 @@ This monitoring plan will be reviewed weekly for new subscription issues.
 """
 
         plan_path = self.plans_dir / f"subscription_monitor_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-        plan_path.write_text(plan_content)
+        self.vault_index.write_text(plan_path, plan_content)
 
-    def process_finance_tasks(self):
-        """Process all finance-related tasks"""
-        finance_tasks = self.monitor_finance_tasks()
+    def process_finance_tasks(self, tasks=None):
+        """Process all finance-related tasks (the dispatcher's queue if given)"""
+        if tasks is not None:
+            return sum(self.process_finance_task(task) for task in tasks)
 
+        # Run on its own: only tasks added or changed since this agent's last pass,
+        # processed inside the pass so the ones that fail are seen again next time
         processed_count = 0
-        for task in finance_tasks:
-            print(f"Processing finance task: {task.name}")
-
-            try:
-                transaction_info = self.analyze_transaction(task)
-                plan_path = self.create_finance_plan(task, transaction_info)
-                print(f"Created finance plan: {plan_path.name}")
-
-                # Move original task to avoid re-processing
-                done_dir = self.vault_path / "Done"
-                done_dir.mkdir(parents=True, exist_ok=True)
-                completed_path = done_dir / f"processed_finance_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{task.name}"
-                task.rename(completed_path)
-
-                processed_count += 1
-            except Exception as e:
-                self.audit_logger.log_error(
-                    "FINANCE_PROCESSING_ERROR",
-                    f"Error processing {task.name}: {str(e)}",
-                    {"task_file": task.name}
-                )
-
+        with self.vault_index.changes("Needs_Action", "finance_agent", "*.md") as changes:
+            for task in self.monitor_finance_tasks(changes.pending):
+                if self.process_finance_task(task):
+                    processed_count += 1
+                else:
+                    changes.retry(task.path)
         return processed_count
 
-    def run(self):
-        """Main execution method"""
+    def process_finance_task(self, task):
+        """Process one finance task and move it out of Needs_Action; returns False if it failed"""
+        from utils.done_archive import done_destination
+
+        print(f"Processing finance task: {task.name}")
+
+        try:
+            transaction_info = self.analyze_transaction(task)
+            plan_path = self.create_finance_plan(task, transaction_info)
+            print(f"Created finance plan: {plan_path.name}")
+
+            # Move original task to avoid re-processing
+            completed_path = done_destination(self.vault_path, f"processed_finance_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{task.name}")
+            self.vault_index.move(task, completed_path)
+            # The plan carries the task on through approval
+            self.task_events.record(plan_path, "planned", plan_path, source=task.name)
+
+            return True
+        except Exception as e:
+            self.audit_logger.log_error(
+                "FINANCE_PROCESSING_ERROR",
+                f"Error processing {task.name}: {str(e)}",
+                {"task_file": task.name}
+            )
+            return False
+
+    def run(self, tasks=None):
+        """Main execution method (tasks: this agent's queue from the task dispatcher)"""
         print(f"Finance Agent starting at {datetime.now()}")
 
-        processed_count = self.process_finance_tasks()
+        processed_count = self.process_finance_tasks(tasks)
         self.flag_subscription_issues()
 
         print(f"Finance Agent completed - processed {processed_count} tasks")
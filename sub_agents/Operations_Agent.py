@@ -22,34 +22,35 @@ class OperationsAgent:
         # Import skills
         import sys
         sys.path.append(str(self.skills_dir))
+        sys.path.append(str(Path(__file__).resolve().parent.parent))
 
         from approval_manager import ApprovalManager
         from audit_logger import AuditLogger
         from dashboard_updater import DashboardUpdater
+        from utils.vault_index import get_vault_index
+        from utils.task_events import get_task_events
 
         self.approval_manager = ApprovalManager(vault_path)
         self.audit_logger = AuditLogger(vault_path)
+        self.vault_index = get_vault_index(vault_path)
+        self.task_events = get_task_events(vault_path)
         self.dashboard_updater = DashboardUpdater(vault_path)
 
-    def monitor_operations_tasks(self):
-        """Monitor for new operations-related tasks in Needs_Action"""
-        operations_keywords = ['project', 'task', 'deadline', 'schedule', 'bottleneck', 'workflow', 'process', 'operation', 'timeline', 'milestone', 'deliverable']
+    def monitor_operations_tasks(self, candidates=None):
+        """Monitor for new operations-related tasks in Needs_Action (only among candidates if given)"""
+        from utils.task_dispatcher import ROUTE_KEYWORDS
 
-        operations_tasks = []
-        for item in self.needs_action_dir.glob("*.md"):
-            content = item.read_text().lower()
-            if any(keyword in content for keyword in operations_keywords):
-                operations_tasks.append(item)
+        operations_keywords = ROUTE_KEYWORDS["operations"]
 
-        return operations_tasks
+        return self.vault_index.matching("Needs_Action", operations_keywords, "*.md", among=candidates)
 
     def extract_project_info(self, task_file):
         """Extract project information from task content"""
-        content = task_file.read_text()
+        document = task_file.document
 
         project_info = {
             'name': task_file.stem,
-            'description': content[:200] if len(content) > 200 else content,
+            'description': document.preview(200),
             'priority': 'medium',  # Default priority
             'deadline': None,
             'milestones': [],
@@ -59,10 +60,7 @@ class OperationsAgent:
         }
 
         # Extract information using simple pattern matching
-        lines = content.split('\n')
-        for line in lines:
-            line_lower = line.lower()
-
+        for line, line_lower in document.lines():
             if 'priority:' in line_lower or 'urgent' in line_lower or 'high priority' in line_lower:
                 project_info['priority'] = 'high'
             elif 'low priority' in line_lower:
@@ -126,11 +124,11 @@ This project plan requires approval before proceeding to implementation phase.
 
         # Save plan to Plans directory
         plan_path = self.plans_dir / f"project_plan_{project_info['name']}.md"
-        plan_path.write_text(plan_content)
+        self.vault_index.write_text(plan_path, plan_content)
 
         # Also save to Active Projects if it's approved later
         project_path = self.active_projects_dir / f"{project_info['name']}.md"
-        project_path.write_text(f"""---
+        self.vault_index.write_text(project_path, f"""---
 title: "Active Project: {project_info['name']}"
 created: {datetime.now().isoformat()}
 status: planned
@@ -176,12 +174,14 @@ Planned - Awaiting approval
             'inactive_projects': []
         }
 
-        # Check all active projects
-        for project_file in self.active_projects_dir.glob("*.md"):
-            content = project_file.read_text()
+        from utils.frontmatter import read_frontmatter
+
+        # Check all active projects; priority and deadline come from the frontmatter only
+        for project_file in self.vault_index.paths("Active_Projects", "*.md"):
+            header = read_frontmatter(project_file)
 
             # Look for projects with high priority that haven't changed recently
-            if 'priority: high' in content.lower():
+            if header.get('priority', '').lower() == 'high':
                 mod_time = datetime.fromtimestamp(project_file.stat().st_mtime)
                 if mod_time < datetime.now() - timedelta(days=3):  # No changes in 3 days
                     bottleneck_report['high_priority_unchanged'].append({
@@ -190,21 +190,26 @@ Planned - Awaiting approval
                     })
 
             # Look for projects with past deadlines
-            if project_file.stat().st_mtime < datetime.now().timestamp():
-                if 'deadline:' in content:
-                    import re
-                    dates = re.findall(r'deadline: (.+)', content)
-                    for d in dates:
-                        if 'past' in d.lower() or ('202' in d and datetime.strptime(d.split()[0], '%Y-%m-%d') < datetime.now() if len(d.split()) > 0 and '/' not in d else False):
-                            bottleneck_report['overdue_projects'].append({
-                                'project': project_file.name,
-                                'deadline': d.strip()
-                            })
+            deadline = header.get('deadline', '')
+            if deadline and self.is_past_deadline(deadline):
+                bottleneck_report['overdue_projects'].append({
+                    'project': project_file.name,
+                    'deadline': deadline
+                })
 
         # Create bottleneck report if issues found
         if any(bottleneck_report.values()):
             self.create_bottleneck_report(bottleneck_report)
 
+    def is_past_deadline(self, deadline):
+        """Whether a project deadline (YYYY-MM-DD, or text mentioning "past") has passed"""
+        if 'past' in deadline.lower():
+            return True
+        try:
+            return datetime.strptime(deadline.split()[0][:10], '%Y-%m-%d') < datetime.now()
+        except ValueError:
+            return False
+
     def create_bottleneck_report(self, bottleneck_report):
         """Create a report on identified bottlenecks"""
         report_content = f"""---
@@ -247,7 +252,7 @@ Projects with no recent activity requiring attention:
 """
 
         report_path = self.plans_dir / f"bottleneck_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-        report_path.write_text(report_content)
+        self.vault_index.write_text(report_path, report_content)
 
         self.audit_logger.log_action(
             "BOTTLENECK_REPORT_CREATED",
@@ -255,38 +260,53 @@ Projects with no recent activity requiring attention:
             {"bottlenecks_found": sum(len(v) for v in bottleneck_report.values())}
         )
 
-    def process_operations_tasks(self):
-        """Process all operations-related tasks"""
-        operations_tasks = self.monitor_operations_tasks()
+    def process_operations_tasks(self, tasks=None):
+        """Process all operations-related tasks (the dispatcher's queue if given)"""
+        if tasks is not None:
+            return sum(self.process_operations_task(task) for task in tasks)
 
+        # Run on its own: only tasks added or changed since this agent's last pass,
+        # processed inside the pass so the ones that fail are seen again next time
         processed_count = 0
-        for task in operations_tasks:
-            print(f"Processing operations task: {task.name}")
-
-            try:
-                project_info = self.extract_project_info(task)
-                plan_path = self.create_project_plan(task, project_info)
-                print(f"Created project plan: {plan_path.name}")
-
-                # Move original task to avoid re-processing
-                completed_path = self.done_dir / f"processed_ops_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{task.name}"
-                task.rename(completed_path)
-
-                processed_count += 1
-            except Exception as e:
-                self.audit_logger.log_error(
-                    "OPERATIONS_PROCESSING_ERROR",
-                    f"Error processing {task.name}: {str(e)}",
-                    {"task_file": task.name}
-                )
-
+        with self.vault_index.changes("Needs_Action", "operations_agent", "*.md") as changes:
+            for task in self.monitor_operations_tasks(changes.pending):
+                if self.process_operations_task(task):
+                    processed_count += 1
+                else:
+                    changes.retry(task.path)
         return processed_count
 
-    def run(self):
-        """Main execution method"""
+    def process_operations_task(self, task):
+        """Process one operations task and move it out of Needs_Action; returns False if it failed"""
+        from utils.done_archive import done_destination
+
+        print(f"Processing operations task: {task.name}")
+
+        try:
+            project_info = self.extract_project_info(task)
+            plan_path = self.create_project_plan(task, project_info)
+            print(f"Created project plan: {plan_path.name}")
+
+            # Move original task to avoid re-processing
+            completed_path = done_destination(self.vault_path, f"processed_ops_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{task.name}")
+            self.vault_index.move(task, completed_path)
+            # The plan carries the task on through approval
+            self.task_events.record(plan_path, "planned", plan_path, source=task.name)
+
+            return True
+        except Exception as e:
+            self.audit_logger.log_error(
+                "OPERATIONS_PROCESSING_ERROR",
+                f"Error processing {task.name}: {str(e)}",
+                {"task_file": task.name}
+            )
+            return False
+
+    def run(self, tasks=None):
+        """Main execution method (tasks: this agent's queue from the task dispatcher)"""
         print(f"Operations Agent starting at {datetime.now()}")
 
-        processed_count = self.process_operations_tasks()
+        processed_count = self.process_operations_tasks(tasks)
         self.identify_bottlenecks()
 
         print(f"Operations Agent completed - processed {processed_count} tasks")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled approval rules
+"""
+
+import os
+import json
+import tempfile
+from pathlib import Path
+
+from utils.approval_rules import ApprovalRules, DEFAULT_RULES_FILE, compile_policies, section_values
+
+def test_approval_rules():
+    """Approval policies: first matching rule decides, decisions are cached, file edits reload"""
+    shipped = ApprovalRules(DEFAULT_RULES_FILE)
+    task = {"title": "Review notes", "description": "", "content_preview": "", "priority": "medium"}
+    assert shipped.decide("task_planning", task) == (False, "task.informational")
+    # Financial keywords win over informational ones; high priority wins over both
+    assert shipped.decide("task_planning", dict(task, description="bank payment")).rule_id == "task.financial_or_sensitive"
+    assert shipped.decide("task_planning", dict(task, priority="High")).rule_id == "task.high_priority"
+    assert shipped.decide("task_planning", dict(task, title="Call Bob")) == (True, "task.default_requires_approval")
+    assert shipped.decide("plan_review", {"content": "Send a Reply"}).rule_id == "plan.outbound_communication"
+    assert shipped.decide("plan_review", {"content": "Tidy the folder"}) == (False, "plan.no_sensitive_action")
+
+    plan = "# Plan\n\n## Requires Approval\nTrue\n\n## Steps\n- one"
+    assert section_values(plan) == {"Requires Approval": "True", "Steps": "- one"}
+    assert shipped.decide("plan_execution", {"content": plan}) == (True, "draft.plan_requires_approval")
+    assert shipped.decide("plan_execution", {"content": plan.replace("True", "false")}).rule_id == "draft.not_flagged"
+    print("  [PASS] approval rule order")
+
+    config = json.loads(DEFAULT_RULES_FILE.read_text(encoding="utf-8"))
+    duplicate = json.loads(json.dumps(config))
+    duplicate["policies"]["plan_review"]["rules"][1]["id"] = "plan.financial_action"
+    try:
+        compile_policies(duplicate)
+        assert False, "duplicate rule ids should be rejected"
+    except ValueError:
+        pass
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rules_file = Path(tmp) / "approval_rules.json"
+        rules_file.write_text(json.dumps(config), encoding="utf-8")
+        rules = ApprovalRules(rules_file, reload_interval=0)
+        assert rules.decide("plan_review", {"content": "pay the invoice"}).rule_id == "plan.financial_action"
+        assert len(rules._decisions) == 1
+        rules.decide("plan_review", {"content": "pay the invoice", "unused": "x"})
+        assert len(rules._decisions) == 1
+
+        # Invoices no longer need approval once the rule is edited out
+        config["policies"]["plan_review"]["rules"] = config["policies"]["plan_review"]["rules"][1:]
+        rules_file.write_text(json.dumps(config), encoding="utf-8")
+        os.utime(rules_file, (1, 1))
+        assert rules.decide("plan_review", {"content": "pay the invoice"}) == (False, "plan.no_sensitive_action")
+
+        # A broken edit keeps the rules already loaded
+        rules_file.write_text("{not json", encoding="utf-8")
+        assert rules.decide("plan_review", {"content": "send it"}).rule_id == "plan.outbound_communication"
+        assert rules.rule_ids("plan_execution") == ["draft.plan_requires_approval", "draft.not_flagged"]
+        print("  [PASS] approval rules reload")
+
+def main():
+    print("Approval Rules - Tests")
+    print("="*50)
+
+    test_approval_rules()
+
+    print("\nAll approval rules tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Test script for the append-only Audit Logger
+"""
+
+import sys
+import json
+import tempfile
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, './skills')
+
+from audit_logger import AuditLogger
+from utils.log_sink import LogSink
+from utils.log_archive import archive_index_path
+
+def test_append_and_read():
+    """Entries are appended as JSON lines and read back in order"""
+    with tempfile.TemporaryDirectory() as vault:
+        logger = AuditLogger(vault, sink=LogSink())
+        for i in range(5):
+            logger.log_action("TEST_ACTION", f"Entry {i}", {"n": i})
+
+        logger.flush()
+        segment = logger.get_today_log_path()
+        lines = segment.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 5
+        assert json.loads(lines[0])["description"] == "Entry 0"
+
+        day = logger.list_days()[0]
+        entries = list(logger.read_entries(day))
+        assert [e["details"]["n"] for e in entries] == list(range(5))
+        logger.sink.close()
+        print("  [PASS] entries appended and read back")
+
+def test_rotation():
+    """Segments rotate once they reach the size limit"""
+    with tempfile.TemporaryDirectory() as vault:
+        logger = AuditLogger(vault, max_segment_bytes=512, sink=LogSink())
+        for i in range(20):
+            logger.log_action("TEST_ACTION", f"Entry {i}", {"n": i})
+
+        day = logger.list_days()[0]
+        segments = logger.list_segments(day)
+        assert len(segments) > 1
+        assert all(s.stat().st_size <= 512 for s in segments)
+
+        # A fresh logger resumes the newest segment instead of starting over
+        AuditLogger(vault, max_segment_bytes=512, sink=logger.sink).log_action("TEST_ACTION", "Resumed")
+        entries = list(logger.read_entries(day))
+        assert len(entries) == 21
+        assert entries[-1]["description"] == "Resumed"
+        logger.sink.close()
+        print(f"  [PASS] rotated across {len(segments)} segments")
+
+def test_legacy_conversion():
+    """Legacy JSON arrays are readable and convert losslessly"""
+    with tempfile.TemporaryDirectory() as vault:
+        logs_dir = Path(vault) / "Logs"
+        logs_dir.mkdir()
+        legacy = [
+            {"timestamp": f"2026-03-05T10:00:0{i}", "action_type": "LEGACY",
+             "description": f"Old {i}", "status": "completed", "details": {}}
+            for i in range(6)
+        ]
+        (logs_dir / "2026-03-05.json").write_text(json.dumps(legacy, indent=2))
+
+        logger = AuditLogger(vault, max_segment_bytes=300, sink=LogSink())
+        assert list(logger.read_entries("2026-03-05")) == legacy
+
+        assert logger.convert_legacy_logs() == 1
+        assert not (logs_dir / "2026-03-05.json").exists()
+        assert len(logger.list_segments("2026-03-05")) > 1
+        assert list(logger.read_entries("2026-03-05")) == legacy
+        logger.sink.close()
+        print("  [PASS] legacy log converted")
+
+def test_indexed_query():
+    """Queries filter by action type, status and time range through the sidecar index"""
+    with tempfile.TemporaryDirectory() as vault:
+        logs_dir = Path(vault) / "Logs"
+        logs_dir.mkdir()
+        legacy = []
+        for hour in range(24):
+            for action_type in ("FINANCE_PLAN_CREATED", "SYSTEM_MAINTENANCE"):
+                legacy.append({"timestamp": f"2026-03-05T{hour:02d}:30:00", "action_type": action_type,
+                               "description": f"{action_type} at {hour}",
+                               "status": "error" if hour % 5 == 0 else "completed", "details": {}})
+        (logs_dir / "2026-03-05.json").write_text(json.dumps(legacy, indent=2))
+
+        logger = AuditLogger(vault, max_segment_bytes=2048, sink=LogSink())
+        logger.convert_legacy_logs()
+        logger.log_action("FINANCE_PLAN_CREATED", "Live entry")
+        logger.log_action("SYSTEM_MAINTENANCE", "Live entry")
+
+        finance = logger.query(action_type="FINANCE_PLAN_CREATED")
+        assert len(finance) == 25
+        assert finance[-1]["description"] == "Live entry"
+
+        window = logger.query(action_type="FINANCE_PLAN_CREATED",
+                              start="2026-03-05T10:00:00", end="2026-03-05T12:59:59")
+        assert [e["description"] for e in window] == [f"FINANCE_PLAN_CREATED at {h}" for h in (10, 11, 12)]
+
+        errors = logger.query(status="error", end="2026-03-05")
+        assert len(errors) == 10
+        assert len(logger.query(action_type=["FINANCE_PLAN_CREATED", "SYSTEM_MAINTENANCE"], limit=7)) == 7
+
+        # A stale index is detected and rebuilt from the segment
+        segment = logger.list_segments("2026-03-05")[0]
+        idx_file = segment.with_name(segment.name + ".idx")
+        idx_file.write_text(idx_file.read_text().replace("FINANCE_PLAN_CREATED", "SYSTEM_MAINTENANCE"))
+        fresh = AuditLogger(vault, max_segment_bytes=2048, sink=logger.sink)
+        assert len(fresh.query(action_type="SYSTEM_MAINTENANCE", end="2026-03-05")) == 24
+
+        logger.sink.close()
+        print("  [PASS] indexed queries match the log contents")
+
+def test_rollups_match_rescan():
+    """Incremental rollups equal a full rescan, including entries from other writers"""
+    with tempfile.TemporaryDirectory() as vault:
+        logs_dir = Path(vault) / "Logs"
+        logs_dir.mkdir()
+        legacy = [
+            {"timestamp": f"2026-03-04T09:00:0{i}", "action_type": "COMMUNICATION_DRAFT_CREATED",
+             "description": "Old draft", "status": "completed", "details": {}}
+            for i in range(3)
+        ]
+        (logs_dir / "2026-03-04.json").write_text(json.dumps(legacy, indent=2))
+
+        logger = AuditLogger(vault, max_segment_bytes=1024, sink=LogSink())
+        for i in range(30):
+            logger.log_action("FINANCE_PLAN_CREATED", f"Plan {i}", {"n": i})
+            logger.log_error("OPERATIONS_PROCESSING_ERROR", f"Failure {i}")
+
+        # An entry appended outside this logger is picked up by catch-up
+        day = logger.list_days()[-1]
+        with open(logger.list_segments(day)[-1], 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"timestamp": f"{day}T23:59:59", "action_type": "STRATEGIC_PLAN_CREATED",
+                                "description": "External", "status": "completed", "details": {}}) + "\n")
+
+        rollups = logger.get_rollups()
+        assert rollups.daily() == logger.rescan_rollups()
+        assert rollups.daily()["2026-03-04"]["agents"] == {"Communications": 3}
+        today = rollups.daily()[day]
+        assert today["agents"] == {"Finance": 30, "Operations": 30, "CEO": 1}
+        assert today["statuses"]["error"] == 30
+
+        # Reloaded from rollups.json, and still exact after conversion
+        logger.convert_legacy_logs()
+        from utils.audit_rollups import AuditRollups
+        assert AuditRollups(logs_dir).daily()[day] == today
+        assert logger.get_rollups().daily() == logger.rescan_rollups()
+        assert sum(w["total"] for w in rollups.weekly().values()) == 64
+
+        logger.sink.close()
+        print("  [PASS] rollups match a full rescan")
+
+def test_archive():
+    """Archived days stay readable, queryable and counted, for both compressions"""
+    for compression in ("gzip", "xz"):
+        with tempfile.TemporaryDirectory() as vault:
+            logs_dir = Path(vault) / "Logs"
+            logs_dir.mkdir()
+            legacy = [
+                {"timestamp": f"2020-01-0{day}T{hour:02d}:00:00", "action_type": action_type,
+                 "description": f"{action_type} {day} {hour}", "status": "completed", "details": {}}
+                for day in (1, 2) for hour in range(12)
+                for action_type in ("FINANCE_PLAN_CREATED", "SYSTEM_MAINTENANCE")
+            ]
+            for day in (1, 2):
+                day_entries = [e for e in legacy if e["timestamp"].startswith(f"2020-01-0{day}")]
+                (logs_dir / f"2020-01-0{day}.json").write_text(json.dumps(day_entries))
+
+            logger = AuditLogger(vault, max_segment_bytes=1024, sink=LogSink())
+            logger.convert_legacy_logs()
+            logger.log_action("FINANCE_PLAN_CREATED", "Live entry")
+            before = logger.query(action_type="FINANCE_PLAN_CREATED")
+            rollups_before = logger.get_rollups().daily()
+
+            assert logger.archive_old_logs(older_than_days=1, compression=compression) == 2
+            assert logger.list_segments("2020-01-01") == []
+            archive = logger.find_archive("2020-01-01")
+            assert archive.name.endswith(".xz" if compression == "xz" else ".gz")
+
+            assert logger.query(action_type="FINANCE_PLAN_CREATED") == before
+            window = logger.query(action_type="SYSTEM_MAINTENANCE",
+                                  start="2020-01-02T03:00:00", end="2020-01-02T04:00:00")
+            assert [e["description"] for e in window] == ["SYSTEM_MAINTENANCE 2 3", "SYSTEM_MAINTENANCE 2 4"]
+            assert list(logger.read_entries("2020-01-01")) == legacy[:24]
+            assert logger.get_rollups().daily() == rollups_before == logger.rescan_rollups()
+
+            # Leftovers from an interrupted run are ignored instead of read twice
+            (logs_dir / "2020-01-01.legacy.000.jsonl").write_text(json.dumps(legacy[0]) + "\n")
+            assert len(list(logger.read_entries("2020-01-01"))) == 24
+            assert logger.archive_old_logs(older_than_days=1, compression=compression) == 0
+
+            # A re-archive interrupted after its new index was written: that index lists a segment the
+            # old archive still in place does not hold, so it is ignored and the segment is still read
+            (logs_dir / "2020-01-01.legacy.000.jsonl").unlink()
+            late = dict(legacy[0], timestamp="2020-01-01T23:30:00", description="late entry")
+            late_segment = logs_dir / "2020-01-01.late.000.jsonl"
+            late_segment.write_text(json.dumps(late) + "\n")
+            index_file = archive_index_path(archive)
+            index = json.loads(index_file.read_text())
+            index["sources"].append(late_segment.name)
+            index["archive_size"] += 1
+            index_file.write_text(json.dumps(index))
+            assert list(logger.read_entries("2020-01-01"))[-1]["description"] == "late entry"
+
+            assert logger.archive_old_logs(older_than_days=1, compression=compression) == 1
+            assert not late_segment.exists() and len(list(logger.read_entries("2020-01-01"))) == 25
+
+            logger.sink.close()
+    print("  [PASS] archived days read back through gzip and xz")
+
+WRITER_SCRIPT = """
+import sys
+sys.path.insert(0, './skills')
+from audit_logger import AuditLogger
+logger = AuditLogger(sys.argv[1], max_segment_bytes=4096)
+for i in range(int(sys.argv[3])):
+    logger.log_action("FINANCE_PLAN_CREATED" if i % 2 else "SYSTEM_MAINTENANCE", f"{sys.argv[2]}-{i}")
+"""
+
+def test_concurrent_writers():
+    """Many writer processes logging at once lose no entries"""
+    processes, per_process = 8, 300
+    with tempfile.TemporaryDirectory() as vault:
+        writers = [
+            subprocess.Popen([sys.executable, "-c", WRITER_SCRIPT, vault, f"w{n}", str(per_process)],
+                             stdout=subprocess.DEVNULL)
+            for n in range(processes)
+        ]
+        assert all(w.wait(timeout=120) == 0 for w in writers)
+
+        logger = AuditLogger(vault, sink=LogSink())
+        day = logger.list_days()[0]
+        entries = list(logger.read_entries(day))
+        assert len(entries) == processes * per_process
+        assert len({e["description"] for e in entries}) == processes * per_process
+        assert [e["timestamp"] for e in entries] == sorted(e["timestamp"] for e in entries)
+
+        # Every process wrote its own segments
+        writer_tags = {segment.name.split(".")[1] for segment in logger.list_segments(day)}
+        assert len(writer_tags) == processes
+
+        assert len(logger.query(action_type="FINANCE_PLAN_CREATED")) == processes * per_process // 2
+        assert logger.get_rollups().daily() == logger.rescan_rollups()
+        logger.sink.close()
+        print(f"  [PASS] {processes} concurrent writers, {len(entries)} entries")
+
+def main():
+    print("Audit Logger - Tests")
+    print("="*50)
+
+    test_append_and_read()
+    test_rotation()
+    test_legacy_conversion()
+    test_indexed_query()
+    test_rollups_match_rescan()
+    test_archive()
+    test_concurrent_writers()
+
+    print("\nAll audit logger tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test script for the cycle timing spans, metrics endpoint, cycle profiler and memory tracker
+"""
+
+import pstats
+import tempfile
+import tracemalloc
+import urllib.request
+import urllib.error
+from pathlib import Path
+
+from utils.cycle_metrics import CycleMetrics, read_cycle_metrics
+from utils.cycle_profiler import CycleProfiler
+from utils.memory_tracker import MemoryTracker
+from utils.log_sink import LogSink
+from utils.metrics_server import MetricsRegistry, MetricsServer, register_queue_depths
+
+def test_cycle_record():
+    """Each cycle writes one record with per-stage time and file I/O"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        metrics_file = tmp / "metrics" / "cycles.jsonl"
+        metrics = CycleMetrics(metrics_file, sink=LogSink())
+
+        with metrics.cycle():
+            with metrics.span("writer"):
+                for i in range(3):
+                    (tmp / f"task_{i}.md").write_text("x" * 100)
+            with metrics.span("reader"):
+                with metrics.span("reader.scan"):
+                    for path in sorted(tmp.glob("task_*.md")):
+                        path.read_text()
+
+        metrics.sink.flush()
+        records = read_cycle_metrics(metrics_file)
+        assert len(records) == 1
+        stages = {stage["name"]: stage for stage in records[0]["stages"]}
+        assert list(stages) == ["writer", "reader.scan", "reader"]
+        assert stages["writer"]["files_written"] == 3
+        assert stages["writer"]["files_scanned"] == 0
+
+        # Nested spans count towards their parents too
+        for name in ("reader.scan", "reader"):
+            assert stages[name]["files_scanned"] == 3
+            assert stages[name]["bytes_read"] == 300
+            assert stages[name]["dir_scans"] >= 1
+        assert records[0]["wall_ms"] >= stages["reader"]["wall_ms"]
+
+        metrics.sink.close()
+        print("  [PASS] cycle record has per-stage timings and I/O")
+
+def test_failed_stage():
+    """A failing stage is marked and the cycle record is still written"""
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics_file = Path(tmp) / "cycles.jsonl"
+        metrics = CycleMetrics(metrics_file, sink=LogSink())
+
+        try:
+            with metrics.cycle():
+                with metrics.span("agents.finance"):
+                    raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+
+        metrics.sink.flush()
+        record = read_cycle_metrics(metrics_file)[-1]
+        assert record["status"] == "error"
+        assert record["stages"][0]["status"] == "error"
+
+        # Spans outside a cycle are timed but not recorded
+        with metrics.span("standalone"):
+            pass
+        assert "standalone" not in [span.name for span in metrics.stages]
+
+        metrics.sink.close()
+        print("  [PASS] failed stage recorded")
+
+def test_metrics_endpoint():
+    """The local endpoint serves queue depths, histograms and error counters"""
+    with tempfile.TemporaryDirectory() as vault:
+        for directory, count in (("Needs_Action", 3), ("Plans", 1), ("Pending_Approval", 0)):
+            (Path(vault) / directory).mkdir()
+            for i in range(count):
+                (Path(vault) / directory / f"task_{i}.md").write_text("task")
+
+        registry = MetricsRegistry()
+        register_queue_depths(vault, registry)
+        registry.observe("ai_employee_cycle_duration_seconds", 0.3, {"cycle": "cycle"})
+        registry.observe("ai_employee_cycle_duration_seconds", 7.0, {"cycle": "cycle"})
+        try:
+            with registry.timed("ai_employee_smtp_send_duration_seconds", error_component="smtp"):
+                raise ConnectionError("refused")
+        except ConnectionError:
+            pass
+
+        server = MetricsServer(registry, 0).start()
+        try:
+            url = f"http://{server.host}:{server.port}"
+            with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+                assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+                lines = response.read().decode("utf-8").splitlines()
+            try:
+                urllib.request.urlopen(f"{url}/other", timeout=5)
+                assert False, "expected 404"
+            except urllib.error.HTTPError as e:
+                assert e.code == 404
+        finally:
+            server.stop()
+
+        assert 'ai_employee_queue_depth{queue="needs_action"} 3' in lines
+        assert 'ai_employee_queue_depth{queue="plans"} 1' in lines
+        assert 'ai_employee_queue_depth{queue="approved"} 0' in lines
+        assert "# TYPE ai_employee_cycle_duration_seconds histogram" in lines
+        assert 'ai_employee_cycle_duration_seconds_bucket{cycle="cycle",le="0.5"} 1' in lines
+        assert 'ai_employee_cycle_duration_seconds_bucket{cycle="cycle",le="+Inf"} 2' in lines
+        assert 'ai_employee_cycle_duration_seconds_count{cycle="cycle"} 2' in lines
+        assert 'ai_employee_errors_total{component="smtp"} 1' in lines
+        assert "ai_employee_smtp_send_duration_seconds_count 1" in lines
+        print("  [PASS] metrics endpoint serves the text format")
+
+def busy_stage(n):
+    """Deliberately slow stage for the profiler to find"""
+    return sum(i * i for i in range(n))
+
+def test_cycle_profiles():
+    """Profiled cycles leave pstats and collapsed stacks, pruned to the newest few"""
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = CycleProfiler("cprofile", output_dir=tmp, keep=2)
+        for _ in range(3):
+            with profiler.profile("cycle"):
+                busy_stage(200000)
+
+        profiles = sorted(Path(tmp).iterdir())
+        assert len([p for p in profiles if p.suffix == ".collapsed"]) == 2
+        assert len([p for p in profiles if p.suffix == ".pstats"]) == 2
+
+        stats = pstats.Stats(str(profiler.last_profile.with_suffix(".pstats")))
+        assert any(func[2] == "busy_stage" for func in stats.stats)
+        lines = profiler.last_profile.read_text(encoding="utf-8").splitlines()
+        assert any("busy_stage (test_cycle_metrics.py" in line for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+        sampler = CycleProfiler("sample", output_dir=tmp, keep=5, sample_interval=0.001)
+        with sampler.profile("silver_cycle"):
+            busy_stage(2000000)
+        assert "busy_stage" in sampler.last_profile.read_text(encoding="utf-8")
+
+        # Without a mode the profiler does nothing
+        with CycleProfiler(output_dir=Path(tmp) / "off").profile():
+            busy_stage(10)
+        assert not (Path(tmp) / "off").exists()
+        print("  [PASS] cycle profiles written and pruned")
+
+def test_memory_growth():
+    """Memory growth between cycles is attributed to the allocating line"""
+    leak = []
+    with tempfile.TemporaryDirectory() as tmp:
+        memory_file = Path(tmp) / "memory.jsonl"
+        tracker = MemoryTracker(True, memory_file, sink=LogSink())
+        try:
+            for _ in range(3):
+                with tracker.track("cycle"):
+                    leak.append([str(i) * 50 for i in range(2000)])
+        finally:
+            tracemalloc.stop()
+
+        tracker.sink.flush()
+        records = read_cycle_metrics(memory_file)
+        assert len(records) == 3
+        assert records[0]["growth_bytes"] is None
+        assert records[2]["growth_bytes"] > 100000
+        assert records[2]["peak_bytes"] >= records[2]["current_bytes"]
+        assert records[2]["top"][0]["location"].startswith("test_cycle_metrics.py:")
+
+        # Disabled tracker does not start tracing
+        with MemoryTracker().track():
+            pass
+        assert not tracemalloc.is_tracing()
+
+        tracker.sink.close()
+        print("  [PASS] memory growth recorded per cycle")
+
+def main():
+    print("Cycle Metrics - Tests")
+    print("="*50)
+
+    test_cycle_record()
+    test_failed_stage()
+    test_metrics_endpoint()
+    test_cycle_profiles()
+    test_memory_growth()
+
+    print("\nAll cycle metrics tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test script for the normalized document cache
+"""
+
+import tempfile
+
+from utils.vault_index import VaultIndex
+from utils.keyword_matcher import KeywordMatcher
+from utils.document_cache import DocumentCache, normalize
+from vault_fixtures import make_vault
+
+def test_document_cache():
+    """Each distinct text is normalized once, shared by every reader, and dropped once unused for a cycle"""
+    text = "Pay the BILL\n\nDue: 3/5/2026\nİstanbul office\n"
+    document = DocumentCache().get(text)
+    assert document.lower == text.lower()
+    assert list(document.lines()) == [(line, line.lower()) for line in text.split("\n")]
+    assert document.preview(200) == text and document.preview(4) == "Pay "
+    assert {"pay", "bill", "2026"} <= document.tokens
+
+    matcher = KeywordMatcher({"finance": ["bill"], "email": ["email"]})
+    assert document.scan(matcher) == {"finance"}
+    assert document.scan(matcher) is document.scan(matcher)
+
+    cache = DocumentCache(maxsize=10)
+    first = cache.get("alpha")
+    assert cache.get("alpha") is first and (cache.hits, cache.misses) == (1, 1)
+    cache.new_cycle()
+    cache.get("beta")
+    # alpha went unused for a whole cycle; beta was just used
+    assert cache.new_cycle() == 1 and len(cache) == 1
+    assert cache.get("beta") is not None and cache.misses == 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        (vault / "Plans" / "copy.md").write_text("Pay the bill")
+        (vault / "Needs_Action" / "copy.md").write_text("Pay the bill")
+        index = VaultIndex(vault)
+        # Entries with the same content share one document, keyed by the index's content hash
+        plan, task = index.get(vault / "Plans" / "copy.md"), index.get(vault / "Needs_Action" / "copy.md")
+        assert plan.document is task.document is normalize("Pay the bill")
+        index.close()
+        print("  [PASS] document cache")
+
+def main():
+    print("Document Cache - Tests")
+    print("="*50)
+
+    test_document_cache()
+
+    print("\nAll document cache tests passed")
+
+if __name__ == "__main__":
+    main()
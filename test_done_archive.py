@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script for the date-sharded Done archive
+"""
+
+import os
+import tempfile
+from datetime import date, datetime
+
+from utils.vault_index import VaultIndex
+from utils.done_archive import done_destination, migrate_flat_done, recent_shard_folders, shard_folder
+from vault_fixtures import make_vault
+
+def test_done_shards():
+    """Completed files go to Done/YYYY/MM/DD and readers list only the shards they need"""
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        done = vault / "Done"
+        (done / "completed_20260305_101500_plan_a.md").write_text("a")
+        (done / "processed_finance_20260306_090000_bill.md").write_text("b")
+        old = done / "notes.md"
+        old.write_text("c")
+        os.utime(old, (datetime(2026, 1, 2, 12).timestamp(),) * 2)
+
+        assert migrate_flat_done(vault, dry_run=True) == 3
+        assert migrate_flat_done(vault) == 3
+        assert sorted(p.relative_to(done).as_posix() for p in done.rglob("*.md")) == [
+            "2026/01/02/notes.md",
+            "2026/03/05/completed_20260305_101500_plan_a.md",
+            "2026/03/06/processed_finance_20260306_090000_bill.md",
+        ]
+        assert migrate_flat_done(vault) == 0
+
+        index = VaultIndex(vault)
+        assert index.count(shard_folder(date(2026, 3, 5))) == 1
+        assert index.count("Done/2026/03") == 2
+        assert index.count("Done") == 3
+
+        # A name already in its shard is dropped if identical, otherwise filed under a new name, once
+        (done / "completed_20260305_101500_plan_a.md").write_text("a")
+        (done / "processed_finance_20260306_090000_bill.md").write_text("b, amended")
+        assert migrate_flat_done(vault) == 2
+        assert sorted(p.name for p in done.rglob("*.md") if p.parent.name == "06") == [
+            "processed_finance_20260306_090000_bill.md", "processed_finance_20260306_090000_bill_1.md"]
+        assert not any(p.is_file() for p in done.iterdir())
+        assert migrate_flat_done(vault) == 0
+        assert index.count("Done") == 4
+
+        today = done_destination(vault, "completed_now.md")
+        assert today.parent == vault / shard_folder(date.today())
+        index.write_text(today, "done")
+        assert sum(index.count(shard) for shard in recent_shard_folders(7)) == 1
+        assert len(recent_shard_folders(7)) == 8
+        index.close()
+        print("  [PASS] Done shards and migration")
+
+def main():
+    print("Done Archive - Tests")
+    print("="*50)
+
+    test_done_shards()
+
+    print("\nAll done archive tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared frontmatter parser and cache
+"""
+
+import tempfile
+from pathlib import Path
+
+from utils import frontmatter
+from utils.frontmatter import FrontmatterCache, parse_frontmatter, read_header
+
+def test_frontmatter_cache():
+    """Headers are parsed without reading the body and re-parsed only after the file changes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        plan = Path(tmp) / "plan_a.md"
+        body = "status: not-a-field\n" * 10000
+        plan.write_text(f"---\ntitle: \"Plan A\"\nstatus: pending\n  nested: skipped\n---\n{body}")
+        assert read_header(plan) == {"title": "Plan A", "status": "pending"}
+        assert read_header(plan) == parse_frontmatter(plan.read_text())
+
+        cache = FrontmatterCache(maxsize=2)
+        assert cache.get(plan)["status"] == "pending"
+        cache.get(plan)["status"] = "mutated by caller"
+        assert cache.get(plan)["status"] == "pending"
+        assert (cache.hits, cache.misses) == (2, 1)
+
+        plan.write_text("---\nstatus: completed\n---\n")
+        assert cache.get(plan)["status"] == "completed"
+        assert cache.misses == 2
+
+        # Least recently used entries are evicted
+        others = [Path(tmp) / f"other_{i}.md" for i in range(2)]
+        for other in others:
+            other.write_text("no frontmatter")
+            assert cache.get(other) == {}
+        assert len(cache._entries) == 2 and str(plan) not in cache._entries
+        assert cache.get(Path(tmp) / "missing.md") == {}
+
+        # A file moved away between the stat and the read has no fields, like a missing one
+        moved = Path(tmp) / "moved.md"
+        moved.write_text("---\nstatus: pending\n---\n")
+        def read_after_move(path):
+            moved.unlink()
+            return read_header(path)
+        frontmatter.read_header = read_after_move
+        try:
+            assert cache.get(moved) == {}
+        finally:
+            frontmatter.read_header = read_header
+        print("  [PASS] frontmatter parsed from the header and cached")
+
+def test_header_markers():
+    """The header opens and closes on an exact "---" line, whether parsed from text or from the file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        samples = {
+            "plain": "---\ntitle: Plan\n---\nbody",
+            "crlf": "---\r\ntitle: Plan\r\n---\r\nbody",
+            "dashes_in_header": "---\ntitle: Plan\n----\n--- note\nstatus: done\n---\nbody",
+            "bad_opening": "---foo\ntitle: Plan\n---\nbody",
+            "unclosed": "---\ntitle: Plan\n",
+        }
+        for name, content in samples.items():
+            path = Path(tmp) / f"{name}.md"
+            path.write_bytes(content.encode("utf-8"))
+            assert parse_frontmatter(content) == read_header(path), name
+        assert parse_frontmatter(samples["dashes_in_header"]) == {"title": "Plan", "status": "done"}
+        assert parse_frontmatter(samples["bad_opening"]) == {} and parse_frontmatter(samples["unclosed"]) == {}
+        print("  [PASS] header markers match between text and file parsing")
+
+def main():
+    print("Frontmatter - Tests")
+    print("="*50)
+
+    test_frontmatter_cache()
+    test_header_markers()
+
+    print("\nAll frontmatter tests passed")
+
+if __name__ == "__main__":
+    main()
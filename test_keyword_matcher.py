@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Test script for the multi-group keyword matcher
+"""
+
+
+
+from utils.keyword_matcher import KeywordMatcher
+
+def test_keyword_matcher():
+    """One pass finds the same groups as checking every keyword with `in`, overlaps included"""
+    import random
+
+    groups = {"info": ["read", "review", "note"], "ready": ["ready", "already"], "money": ["bank", "banking"],
+              "mail": ["e-mail", "mail", "email"]}
+    matcher = KeywordMatcher(groups)
+    assert matcher.scan("ALREADY banking via E-Mail") == {"info", "ready", "money", "mail"}
+    assert matcher.scan("") == frozenset() and not matcher.matches("nothing here")
+    assert KeywordMatcher({}).scan("anything") == frozenset()
+
+    words = ["read", "ready", "al", "bank", "ing", "e-", "mail", "note", "x", " "]
+    rng = random.Random(7)
+    for _ in range(500):
+        text = "".join(rng.choice(words) for _ in range(rng.randint(0, 12)))
+        if rng.random() < 0.5:
+            text = text.upper()
+        expected = {name for name, keywords in groups.items() if any(k in text.lower() for k in keywords)}
+        assert matcher.scan(text) == expected, text
+        assert matcher.matches(text) == bool(expected)
+    print("  [PASS] single-pass keyword matcher")
+
+def main():
+    print("Keyword Matcher - Tests")
+    print("="*50)
+
+    test_keyword_matcher()
+
+    print("\nAll keyword matcher tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for the background Log Sink
+"""
+
+import time
+import tempfile
+from pathlib import Path
+
+from utils.log_sink import LogSink
+
+def test_flush_writes_batches():
+    """Queued records reach disk in order on flush"""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "system.log"
+        sink = LogSink(flush_interval=60, flush_bytes=1024 * 1024)
+
+        for i in range(100):
+            sink.write(log_file, f"line {i}\n")
+        assert not log_file.exists()
+
+        sink.flush()
+        assert log_file.read_text().splitlines() == [f"line {i}" for i in range(100)]
+        sink.close()
+        print("  [PASS] flush wrote all queued records")
+
+def test_size_and_time_thresholds():
+    """Batches are committed once either threshold is reached"""
+    with tempfile.TemporaryDirectory() as tmp:
+        by_size = Path(tmp) / "size.log"
+        by_time = Path(tmp) / "time.log"
+
+        sink = LogSink(flush_interval=60, flush_bytes=10)
+        sink.write(by_size, "0123456789\n")
+        for _ in range(50):
+            if by_size.exists():
+                break
+            time.sleep(0.02)
+        assert by_size.read_text() == "0123456789\n"
+        sink.close()
+
+        sink = LogSink(flush_interval=0.05, flush_bytes=1024 * 1024, fsync="batch")
+        sink.write(by_time, "tick\n")
+        for _ in range(50):
+            if by_time.exists():
+                break
+            time.sleep(0.02)
+        assert by_time.read_text() == "tick\n"
+        sink.close()
+        print("  [PASS] size and time thresholds commit batches")
+
+def test_close_drains_and_tracks_size():
+    """Closing flushes pending records; tracked sizes include queued bytes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "segment.jsonl"
+        log_file.write_text("existing\n")
+
+        sink = LogSink(flush_interval=60, flush_bytes=1024 * 1024)
+        assert sink.tracked_size(log_file) == 9
+        sink.write(log_file, "queued\n")
+        assert sink.tracked_size(log_file) == 16
+
+        sink.close()
+        assert log_file.read_text() == "existing\nqueued\n"
+
+        # Writes after close still land on disk
+        sink.write(log_file, "late\n")
+        assert log_file.read_text().endswith("late\n")
+        print("  [PASS] close drained the queue")
+
+def main():
+    print("Log Sink - Tests")
+    print("="*50)
+
+    test_flush_writes_batches()
+    test_size_and_time_thresholds()
+    test_close_drains_and_tracks_size()
+
+    print("\nAll log sink tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test script for plan retention rules
+"""
+
+import tempfile
+from datetime import date
+
+from utils.plan_retention import RetentionRule, apply_retention
+from vault_fixtures import make_vault
+
+def test_plan_retention():
+    """Only the latest generated plans and one per recent day stay in Plans"""
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        plans = vault / "Plans"
+        names = ["strategic_plan_20260301_090000.md", "strategic_plan_20260309_080000.md",
+                 "strategic_plan_20260309_120000.md", "strategic_plan_20260310_080000.md",
+                 "strategic_plan_20260310_090000.md", "plan_task_1.md"]
+        for name in names:
+            (plans / name).write_text("x" * 10)
+
+        rules = [RetentionRule("strategic_plan_*.md", keep_latest=1, keep_days=2)]
+        today = date(2026, 3, 10)
+        assert apply_retention(vault, rules, dry_run=True, today=today) == (3, 0, 30)
+        assert len(list(plans.iterdir())) == 6
+
+        report = apply_retention(vault, rules, today=today)
+        assert (report.files_reclaimed, report.bytes_reclaimed) == (3, 30)
+        assert sorted(p.name for p in plans.iterdir()) == [
+            "plan_task_1.md", "strategic_plan_20260309_120000.md", "strategic_plan_20260310_090000.md"]
+        assert (vault / "Archive" / "Plans" / "2026" / "03" / "strategic_plan_20260301_090000.md").exists()
+        assert apply_retention(vault, rules, today=today) == (0, 0, 0)
+
+        rules = [RetentionRule("strategic_plan_*.md", keep_latest=1, keep_days=0, action="delete")]
+        assert apply_retention(vault, rules, today=today) == (0, 1, 10)
+        assert not (plans / "strategic_plan_20260309_120000.md").exists()
+        print("  [PASS] generated plan retention")
+
+def main():
+    print("Plan Retention - Tests")
+    print("="*50)
+
+    test_plan_retention()
+
+    print("\nAll plan retention tests passed")
+
+if __name__ == "__main__":
+    main()
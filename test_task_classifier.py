@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script for the trained task classifier
+"""
+
+import tempfile
+
+from utils import task_classifier
+from vault_fixtures import make_vault
+
+def test_task_classifier():
+    """The classifier trains on labelled Done/Plans history and classifies a batch in one call"""
+    if task_classifier.np is None:
+        print("  [SKIP] task classifier (NumPy not installed)")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        topics = {
+            "FINANCE": "settle the vendor invoice from the quarterly budget",
+            "COMMUNICATION": "answer the client about the meeting time",
+            "PROJECT_MANAGEMENT": "move the release milestone and tell the owner",
+        }
+        for n in range(6):
+            for label, text in topics.items():
+                folder = "Done" if n % 2 else "Plans"
+                (vault / folder / f"{label.lower()}_{n}.md").write_text(
+                    f"---\nclassification: {label}\n---\n{text} ({n})\n\n## Classification\n{label}")
+        (vault / "Done" / "typed.md").write_text("---\ntype: communication\n---\nreply to the client")
+        (vault / "Done" / "unlabelled.md").write_text("no frontmatter here")
+
+        examples = task_classifier.training_examples(vault)
+        assert len(examples) == 19
+        assert all("## Classification\n " in e.text for e in examples if e.path.parent.name == "Plans")
+
+        model, count = task_classifier.train_from_vault(vault, dim=1 << 10)
+        assert count == 19
+        loaded = task_classifier.get_task_classifier(vault)
+        assert loaded.classes == model.classes and loaded.dim == 1 << 10
+
+        batch = ["Pay the vendor invoice", "Reply to the client meeting", "Release milestone slipped"]
+        assert loaded.predict(batch) == ["FINANCE", "COMMUNICATION", "PROJECT_MANAGEMENT"]
+        assert loaded.predict_proba(batch).shape == (3, 3)
+        # Unconfident predictions (an empty text) fall back to the keyword rules
+        assert task_classifier.classify_texts(["", "Pay the vendor invoice"], loaded) == ["GENERAL", "FINANCE"]
+        assert task_classifier.classify_texts(["an email"]) == ["COMMUNICATION"]
+
+        report = task_classifier.benchmark(vault, folds=3, dim=1 << 10)
+        assert report.examples == 19 and report.model_accuracy >= report.keyword_accuracy
+        try:
+            task_classifier.TaskClassifier.fit(["only one class"], ["FINANCE"])
+            assert False, "a single class should be rejected"
+        except ValueError:
+            pass
+        print("  [PASS] task classifier")
+
+def main():
+    print("Task Classifier - Tests")
+    print("="*50)
+
+    test_task_classifier()
+
+    print("\nAll task classifier tests passed")
+
+if __name__ == "__main__":
+    main()
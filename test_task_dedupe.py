@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test script for incoming task dedupe
+"""
+
+import tempfile
+from pathlib import Path
+
+from utils.task_dedupe import TaskDedupeStore, dedupe_keys
+from vault_fixtures import make_vault
+
+def test_duplicate_tasks():
+    """The same content or email only becomes one task, however often it is ingested"""
+    from utils.file_watcher import FileWatcherHandler
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        incoming = Path(tmp) / "incoming"
+        incoming.mkdir()
+        email = "# New Task from Email\n- **Subject**: Security alert\n- **Message-ID**: <ABC@mail>\n\nBody"
+        (incoming / "email_1_Security alert.txt").write_text(email)
+        (incoming / "email_2_Security alert.txt").write_text("  " + email.upper() + "\n")
+        (incoming / "email_3_Security alert.txt").write_text(email.replace("Body", "Resent body"))
+        (incoming / "notes.txt").write_text("Different content")
+
+        assert dedupe_keys(email)[1] == "message-id:<abc@mail>"
+        assert dedupe_keys("Body") == dedupe_keys(" body\n")
+
+        handler = FileWatcherHandler(incoming, vault, Path(tmp) / "logs")
+        handler.dedupe_store = TaskDedupeStore(Path(tmp) / "dedupe.sqlite3")
+        created = [handler.create_structured_task(path) for path in sorted(incoming.iterdir())]
+        # Re-ingesting the whole folder on the next cycle creates nothing
+        created += [handler.create_structured_task(path) for path in sorted(incoming.iterdir())]
+
+        assert [path is not None for path in created] == [True, False, False, True] + [False] * 4
+        assert len(list((vault / "Needs_Action").glob("task_*_email_*.json"))) == 1
+        handler.dedupe_store.close()
+        handler.task_events.sink.flush()
+        print("  [PASS] duplicate incoming items rejected")
+
+def main():
+    print("Task Dedupe - Tests")
+    print("="*50)
+
+    test_duplicate_tasks()
+
+    print("\nAll task dedupe tests passed")
+
+if __name__ == "__main__":
+    main()
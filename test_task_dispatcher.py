@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script for the Needs_Action task dispatcher
+"""
+
+import tempfile
+
+from utils.vault_index import VaultIndex
+from utils.task_dispatcher import TaskDispatcher
+from vault_fixtures import make_vault
+
+def test_task_dispatcher():
+    """Each new task is read once and queued for exactly one agent, in route priority order"""
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        (vault / "Needs_Action" / "invoice_email.md").write_text("Reply to the email about the unpaid bill")
+        (vault / "Needs_Action" / "unrouted.md").write_text("Nothing to see")
+        dispatcher = TaskDispatcher(vault)
+        dispatcher.vault_index = VaultIndex(vault)
+
+        assert dispatcher.dispatch() == {"communications": 2, "finance": 1, "operations": 0}
+        assert [e.name for e in dispatcher.take("communications")] == ["invoice_email.md", "reply.md"]
+        assert [e.name for e in dispatcher.take("finance")] == ["invoice.md"]
+        assert dispatcher.take("finance") == []
+
+        # The agents move the tasks they finish out of Needs_Action; one they failed on is queued again
+        (vault / "Needs_Action" / "invoice_email.md").unlink()
+        (vault / "Needs_Action" / "invoice.md").unlink()
+        assert dispatcher.dispatch() == {"communications": 1, "finance": 0, "operations": 0}
+        assert dispatcher.dispatch() == {"communications": 1, "finance": 0, "operations": 0}
+        assert [e.name for e in dispatcher.take("communications")] == ["reply.md"]
+        (vault / "Needs_Action" / "reply.md").unlink()
+        assert dispatcher.dispatch() == {"communications": 0, "finance": 0, "operations": 0}
+
+        # A queued task moved away before its agent runs is dropped
+        (vault / "Needs_Action" / "milestone.md").write_text("Project milestone review")
+        assert dispatcher.dispatch()["operations"] == 1
+        (vault / "Needs_Action" / "milestone.md").unlink()
+        assert dispatcher.take("operations") == []
+        dispatcher.vault_index.close()
+        print("  [PASS] task dispatcher queues")
+
+def main():
+    print("Task Dispatcher - Tests")
+    print("="*50)
+
+    test_task_dispatcher()
+
+    print("\nAll task dispatcher tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for the task lifecycle event log
+"""
+
+import tempfile
+from datetime import datetime, timedelta
+
+from utils.task_events import TaskEventLog, seed_from_vault, task_id_for
+from vault_fixtures import make_vault
+
+def test_task_events():
+    """Lifecycle events drive the state table, which other processes catch up on from the log"""
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        log = TaskEventLog(vault)
+
+        assert task_id_for(vault / "Pending_Approval" / "draft_plan_task_1.md") == "task_1"
+        assert task_id_for("completed_20260305_101500_approval_plan_task_1.md") == "task_1"
+        assert task_id_for("task_1") == "task_1"
+
+        log.record("task_1", "created", vault / "Needs_Action" / "task_1.json")
+        log.record("task_2", "created")
+        log.record(vault / "Plans" / "plan_task_1.md", "planned")
+        log.record("draft_plan_task_1.md", "pending_approval", vault / "Pending_Approval" / "draft_plan_task_1.md")
+        assert log.state("plan_task_1.md").path == "Pending_Approval/draft_plan_task_1.md"
+        assert log.counts() == {"created": 1, "planned": 0, "pending_approval": 1,
+                                "approved": 0, "executed": 0, "done": 0}
+        try:
+            log.record("task_1", "archived")
+            assert False, "unknown events are rejected"
+        except ValueError:
+            pass
+
+        # Only tasks that have been waiting long enough are stuck
+        assert log.stuck("pending_approval", timedelta(days=2)) == []
+        later = datetime.now() + timedelta(days=3)
+        assert [t.task_id for t in log.stuck("pending_approval", timedelta(days=2), now=later)] == ["task_1"]
+
+        # Another process replays the log, then tails only what is appended after
+        log.sink.flush()
+        other = TaskEventLog(vault)
+        assert other.counts() == log.counts()
+        log.record("task_1", "approved")
+        log.record("task_1", "done")
+        log.sink.flush()
+        assert other.state("task_1").state == "done" and other.count("pending_approval") == 0
+
+        # Seeding records only the task files that have no events yet
+        assert seed_from_vault(vault, log) == 2
+        assert log.state("invoice").state == "created" and log.state("task_1").state == "done"
+        log.sink.flush()
+        print("  [PASS] task event log")
+
+def test_repeated_cycles():
+    """Re-planning and re-requesting approval every cycle keeps each task's state and entry time"""
+    from skills.inbox_processor import InboxProcessor
+    from skills.approval_manager import ApprovalManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        log = TaskEventLog(vault)
+        processor, manager = InboxProcessor(vault), ApprovalManager(vault)
+        processor.task_events = manager.task_events = log
+
+        history = []
+        for _ in range(3):
+            processor.run()
+            manager.check_pending_approvals()
+            log.sink.flush()
+            states = {task: log.state(task) for task in ("invoice", "reply")}
+            history.append((states, len(log.events_path.read_text().splitlines())))
+
+        first, events = history[0]
+        assert all(state is not None for state in first.values())
+        for states, count in history[1:]:
+            assert states == first, "a repeated state keeps its entry time"
+            assert count == events, "a repeated state appends nothing"
+        print("  [PASS] repeated cycles")
+
+def main():
+    print("Task Events - Tests")
+    print("="*50)
+
+    test_task_events()
+    test_repeated_cycles()
+
+    print("\nAll task events tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite vault index and its change detection, including retries of failed tasks
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from utils.vault_index import VaultIndex
+from utils.frontmatter import parse_frontmatter
+from utils.planning_layer import PlanningLayer
+from utils.log_sink import get_log_sink
+from vault_fixtures import make_vault
+
+def test_queries():
+    """Counts, glob patterns, keyword matches, frontmatter and classification come from the index"""
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        index = VaultIndex(vault)
+
+        assert index.count("Needs_Action", "*.md") == 2
+        assert index.count("Needs_Action", "*.json") == 1
+        assert index.count("Plans") == 0
+        assert [p.name for p in index.matching("Needs_Action", ["EMAIL"], "*.md")] == ["reply.md"]
+
+        invoice = index.get(vault / "Needs_Action" / "invoice.md")
+        assert invoice.header == {"title": "Invoice"}
+        assert invoice.classification == "FINANCE"
+        assert index.get(vault / "Needs_Action" / "task_1.json").header["status"] == "pending"
+        assert index.get(vault / "Needs_Action" / "missing.md") is None
+
+        assert parse_frontmatter("no frontmatter") == {}
+        index.close()
+        print("  [PASS] queries answered from the index")
+
+def test_lazy_entries():
+    """Entries carry metadata and header eagerly and load the body once, on first use"""
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        index = VaultIndex(vault)
+        reads = []
+        read_body = index.read_body
+        index.read_body = lambda path: reads.append(Path(path).name) or read_body(path)
+
+        entries = index.files("Needs_Action", "*.md")
+        assert [(e.name, e.state, e.header.get("title")) for e in entries] == [
+            ("invoice.md", "Needs_Action", "Invoice"), ("reply.md", "Needs_Action", None)]
+        assert entries[0].size == len("---\ntitle: Invoice\n---\nPay the bill") and not reads
+        assert not hasattr(entries[0], "__dict__")
+
+        matches = index.matching("Needs_Action", ["bill"], "*.md")
+        assert [m.stem for m in matches] == ["invoice"] and reads == ["invoice.md", "reply.md"]
+        assert matches[0].body.endswith("Pay the bill") and matches[0].read_text() == matches[0].body
+        assert reads == ["invoice.md", "reply.md"]
+        assert Path(matches[0]) == vault / "Needs_Action" / "invoice.md"
+
+        # Callers can pass either a path or an entry
+        assert index.entry(matches[0]) is matches[0]
+        assert index.entry(vault / "Needs_Action" / "reply.md").body == "Answer the email from Bob"
+        try:
+            index.entry(vault / "Needs_Action" / "missing.md")
+            assert False, "a file that is not in the vault has no entry"
+        except FileNotFoundError:
+            pass
+        index.close()
+        print("  [PASS] lazy vault entries")
+
+def test_external_changes():
+    """Files added, edited or deleted behind the index's back are picked up by the stat pass"""
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        index = VaultIndex(vault)
+        assert index.count("Needs_Action") == 3
+
+        reply = vault / "Needs_Action" / "reply.md"
+        reply.write_text("Schedule the project deadline review")
+        os.utime(reply, ns=(1, 1))
+        (vault / "Needs_Action" / "invoice.md").unlink()
+        (vault / "Needs_Action" / "new.md").write_text("Organize the document folder")
+
+        names = [entry.name for entry in index.files("Needs_Action")]
+        assert names == ["new.md", "reply.md", "task_1.json"]
+        assert index.get(reply).classification == "PROJECT_MANAGEMENT"
+
+        # A second index over the same database sees the same rows
+        index.close()
+        reopened = VaultIndex(vault)
+        assert reopened.count("Needs_Action", "*.md") == 2
+        reopened.close()
+        print("  [PASS] external changes detected by stat")
+
+def test_writes_and_moves():
+    """Writes, moves and removals through the index keep it current"""
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        index = VaultIndex(vault)
+
+        plan = vault / "Plans" / "plan_invoice.md"
+        index.write_text(plan, "---\nstatus: completed\n---\n# Plan")
+        assert plan.read_text().startswith("---")
+        assert index.get(plan).header["status"] == "completed"
+        assert [entry.path for entry in index.matching("Plans", ["status: completed"], "plan_*.md")] == [plan]
+
+        done = index.move(plan, vault / "Done" / "completed_plan_invoice.md")
+        assert not plan.exists() and done.exists()
+        assert index.count("Plans") == 0
+        assert index.get(done).header["status"] == "completed"
+
+        index.remove(done)
+        assert not done.exists()
+        assert index.count("Done") == 0
+        index.close()
+        print("  [PASS] writes, moves and removals update the index")
+
+def test_change_detection():
+    """Each consumer sees only what was added, modified or removed since its last completed pass"""
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        index = VaultIndex(vault)
+        task = vault / "Needs_Action" / "task_1.json"
+
+        # First pass: everything is new; the consumer's own rewrite is absorbed
+        with index.changes("Needs_Action", "planner", "*.json") as changes:
+            assert changes.added == [task] and not changes.modified and not changes.removed
+            index.write_text(task, '{"id": "task_1", "status": "processed"}')
+            (vault / "Needs_Action" / "task_2.json").write_text('{"id": "task_2"}')
+
+        # A file that appeared during the pass is still reported as added
+        with index.changes("Needs_Action", "planner", "*.json") as changes:
+            assert [p.name for p in changes.added] == ["task_2.json"] and not changes.modified
+
+        with index.changes("Needs_Action", "planner", "*.json") as changes:
+            assert changes == ([], [], [], [])
+
+        # Snapshots are per consumer and persisted in the database
+        index.close()
+        index = VaultIndex(vault)
+        os.utime(task, ns=(1, 1))
+        (vault / "Needs_Action" / "task_2.json").unlink()
+        with index.changes("Needs_Action", "planner", "*.json") as changes:
+            assert changes.modified == [task]
+            assert [p.name for p in changes.removed] == ["task_2.json"]
+        with index.changes("Needs_Action", "agent", "*.md") as changes:
+            assert len(changes.pending) == 2
+
+        # A failed pass does not move the snapshot forward
+        os.utime(task, ns=(2, 2))
+        try:
+            with index.changes("Needs_Action", "planner", "*.json"):
+                raise RuntimeError("pass failed")
+        except RuntimeError:
+            pass
+        with index.changes("Needs_Action", "planner", "*.json") as changes:
+            assert changes.modified == [task]
+
+        index.close()
+        print("  [PASS] per-consumer change detection")
+
+def test_retry_failed():
+    """A task whose processing fails stays out of the snapshot and is picked up on the next pass"""
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        (vault / "Needs_Action" / "task_1.json").write_text(
+            '{"id": "task_1", "title": "Review notes", "description": "", "status": "pending"}')
+        planner = PlanningLayer(vault)
+        planner.logs_path = Path(tmp) / "logs"
+        planner.logs_path.mkdir()
+
+        generate_plan = planner.generate_plan
+        calls = []
+        def fail_once(task_data):
+            calls.append(task_data["id"])
+            if len(calls) == 1:
+                raise RuntimeError("planner unavailable")
+            return generate_plan(task_data)
+        planner.generate_plan = fail_once
+
+        planner.process_needs_action_tasks()
+        assert calls == ["task_1"] and not (vault / "Plans" / "plan_task_1.md").exists()
+
+        planner.process_needs_action_tasks()
+        assert calls == ["task_1", "task_1"] and (vault / "Plans" / "plan_task_1.md").exists()
+
+        # Once processed, it is not picked up again
+        planner.process_needs_action_tasks()
+        assert len(calls) == 2
+        get_log_sink().flush()
+        planner.vault_index.close()
+        print("  [PASS] failed tasks are retried")
+
+def test_path_or_entry_callers():
+    """Plans, approval requests and drafts are created from a path as well as from an entry"""
+    from skills.inbox_processor import InboxProcessor
+    from skills.approval_manager import ApprovalManager
+    from utils.human_in_the_loop import HumanInTheLoop
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        processor = InboxProcessor(vault)
+        processor.create_plan(vault / "Needs_Action" / "invoice.md", "finance")
+        plan = vault / "Plans" / "plan_invoice.md"
+        assert "Pay the bill" in plan.read_text()
+
+        ApprovalManager(vault).create_approval_request(plan, "payments")
+        assert "approval_rule: payments" in (vault / "Pending_Approval" / "approval_plan_invoice.md").read_text()
+
+        # The approval check and the draft read the plan through the index, not from disk
+        hitl = HumanInTheLoop(vault)
+        index = hitl.vault_index
+        reads = []
+        read_body = index.read_body
+        index.read_body = lambda path: reads.append(Path(path).name) or read_body(path)
+        hitl.check_approval_requirement(plan)
+        draft = hitl.create_draft_action(index.get(plan))
+        assert "Pay the bill" in draft.read_text() and set(reads) == {"plan_invoice.md"}
+        del index.read_body
+        get_log_sink().flush()
+        print("  [PASS] path or entry callers")
+
+def main():
+    print("Vault Index - Tests")
+    print("="*50)
+
+    test_queries()
+    test_lazy_entries()
+    test_external_changes()
+    test_writes_and_moves()
+    test_change_detection()
+    test_retry_failed()
+    test_path_or_entry_callers()
+
+    print("\nAll vault index tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test script for vault pack/unpack
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from utils.vault_pack import latest_manifest, pack_vault, unpack_vault
+from vault_fixtures import make_vault
+
+def test_vault_pack():
+    """A full pack plus incremental packs restores the vault; incrementals hold only changes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        backups = Path(tmp) / "backups"
+        (vault / ".vault_index.sqlite3").write_text("rebuildable")
+
+        full = pack_vault(vault, backups)
+        assert (full.packed, full.total) == (3, 3)
+
+        reply = vault / "Needs_Action" / "reply.md"
+        os.utime(reply, ns=(5, 5))
+        (vault / "Needs_Action" / "invoice.md").unlink()
+        (vault / "Plans" / "plan_a.md").write_text("# Plan A")
+        incremental = pack_vault(vault, backups, latest_manifest(backups))
+        assert incremental.manifest == latest_manifest(backups)
+        # Touched but unchanged files are not packed again
+        assert (incremental.packed, incremental.deleted, incremental.total) == (1, 1, 3)
+        assert pack_vault(vault, backups, incremental.manifest).packed == 0
+
+        restored = Path(tmp) / "restored"
+        unpack_vault([full.archive, incremental.archive], restored)
+        assert sorted(p.relative_to(restored).as_posix() for p in restored.rglob("*") if p.is_file()) == [
+            "Needs_Action/reply.md", "Needs_Action/task_1.json", "Plans/plan_a.md"]
+        assert (restored / "Plans" / "plan_a.md").read_text() == "# Plan A"
+        task = vault / "Needs_Action" / "task_1.json"
+        assert (restored / "Needs_Action" / "task_1.json").stat().st_mtime_ns == task.stat().st_mtime_ns
+        print("  [PASS] full and incremental vault packs")
+
+def main():
+    print("Vault Pack - Tests")
+    print("="*50)
+
+    test_vault_pack()
+
+    print("\nAll vault pack tests passed")
+
+if __name__ == "__main__":
+    main()
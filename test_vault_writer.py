@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for atomic vault writes
+"""
+
+import os
+import tempfile
+
+from utils.vault_index import VaultIndex
+from utils.vault_writer import VaultWriter, get_vault_writer
+from vault_fixtures import make_vault
+
+def test_atomic_writes():
+    """Writes replace files by rename, skip identical content and defer folder fsyncs to sync()"""
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = make_vault(tmp)
+        writer = VaultWriter(fsync="batch")
+        plan = vault / "Plans" / "plan_a.md"
+
+        assert writer.write_text(plan, "# Plan A") is True
+        inode = plan.stat().st_ino
+        os.utime(plan, ns=(1, 1))
+        assert writer.write_text(plan, "# Plan A") is False
+        assert plan.stat().st_mtime_ns == 1 and plan.stat().st_ino == inode
+
+        assert writer.write_text(plan, "# Plan A, revised") is True
+        assert plan.read_text() == "# Plan A, revised" and plan.stat().st_ino != inode
+        assert (writer.written, writer.unchanged) == (2, 1)
+        assert writer._dirty_dirs == {str(vault / "Plans")}
+        writer.sync()
+        assert not writer._dirty_dirs
+
+        # Moves leave both folders to be fsynced
+        writer.rename(plan, vault / "Done" / "plan_a.md")
+        assert writer._dirty_dirs == {str(vault / "Plans"), str(vault / "Done")}
+        writer.rename(vault / "Done" / "plan_a.md", plan)
+        writer.sync()
+        assert not writer._dirty_dirs
+
+        # A failed write leaves no temp file behind
+        (vault / "Plans" / "folder.md").mkdir()
+        try:
+            writer.write_text(vault / "Plans" / "folder.md", "x")
+            assert False, "writing over a folder fails"
+        except OSError:
+            pass
+        assert sorted(p.name for p in (vault / "Plans").iterdir()) == ["folder.md", "plan_a.md"]
+
+        # The index reports skipped writes and keeps its row current
+        index = VaultIndex(vault)
+        assert index.write_text(plan, "# Plan A, revised") is False
+        assert index.get(plan).body == "# Plan A, revised"
+        shared = get_vault_writer()
+        shared.sync()
+        index.move(plan, vault / "Approved" / "plan_a.md")
+        if shared.fsync == "batch":
+            assert {str(vault / "Plans"), str(vault / "Approved")} <= shared._dirty_dirs
+        index.close()
+        print("  [PASS] atomic vault writes")
+
+def main():
+    print("Vault Writer - Tests")
+    print("="*50)
+
+    test_atomic_writes()
+
+    print("\nAll vault writer tests passed")
+
+if __name__ == "__main__":
+    main()
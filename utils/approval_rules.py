@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Approval Rules Module for AI Employee System
+Approval policy lives in approval_rules.json: for each decision point
+(task_planning, plan_review, plan_execution) an ordered list of rules and a
+default. Rules are compiled once into a decision table (one keyword matcher
+per policy, scanned once per field) and the first matching rule decides.
+Every decision carries the id of the rule that made it, so it can be logged
+and cached; the file is reloaded when it changes, without a restart.
+
+Each rule has an "id", "requires_approval" and one condition:
+- "keywords" (matched in "fields", default ["content"])
+- "field" + "equals" (case-insensitive)
+- "section" + "equals": the line after a "## <section>" heading of the content
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.document_cache import normalize
+
+DEFAULT_RULES_FILE = Path(__file__).resolve().parent.parent / "approval_rules.json"
+RULES_VERSION = 1
+
+# How often the rules file is checked for changes, and how many decisions are kept
+RELOAD_INTERVAL = 1.0
+DECISION_CACHE_SIZE = 1024
+
+
+class ApprovalDecision(NamedTuple):
+    """Outcome of an approval policy and the rule behind it"""
+    requires_approval: bool
+    rule_id: str
+
+
+class _Policy(NamedTuple):
+    """A policy compiled into its decision table"""
+    rules: Tuple[dict, ...]
+    default: ApprovalDecision
+    matcher: KeywordMatcher
+    keyword_fields: Tuple[str, ...]
+    read_fields: Tuple[str, ...]
+
+
+def compile_policies(config: dict) -> Dict[str, _Policy]:
+    """Validate a rules document and compile each policy"""
+    if config.get("version") != RULES_VERSION:
+        raise ValueError(f"Unsupported approval rules version: {config.get('version')!r}")
+
+    policies = {}
+    seen_ids = set()
+    for name, policy in config.get("policies", {}).items():
+        default = policy.get("default") or {}
+        if "id" not in default or not isinstance(default.get("requires_approval"), bool):
+            raise ValueError(f"Policy {name!r} needs a default with an id and requires_approval")
+
+        rules = []
+        keyword_groups = {}
+        keyword_fields = set()
+        read_fields = set()
+        for rule in policy.get("rules", []):
+            rule_id = rule.get("id")
+            if not rule_id or rule_id in seen_ids:
+                raise ValueError(f"Policy {name!r} has a rule with a missing or duplicate id: {rule_id!r}")
+            seen_ids.add(rule_id)
+            if not isinstance(rule.get("requires_approval"), bool):
+                raise ValueError(f"Rule {rule_id!r} needs requires_approval: true or false")
+
+            conditions = [key for key in ("keywords", "field", "section") if key in rule]
+            if len(conditions) != 1:
+                raise ValueError(f"Rule {rule_id!r} needs exactly one of keywords, field or section")
+            if conditions[0] in ("field", "section") and "equals" not in rule:
+                raise ValueError(f"Rule {rule_id!r} needs an equals value")
+
+            compiled = {
+                "id": rule_id,
+                "decision": ApprovalDecision(rule["requires_approval"], rule_id),
+                "kind": conditions[0],
+                "fields": tuple(rule.get("fields", ["content"])),
+                "target": rule.get(conditions[0]),
+                "equals": str(rule.get("equals", "")).lower(),
+            }
+            if compiled["kind"] == "keywords":
+                keyword_groups[rule_id] = rule["keywords"]
+                keyword_fields.update(compiled["fields"])
+                read_fields.update(compiled["fields"])
+            else:
+                read_fields.add(compiled["target"] if compiled["kind"] == "field" else "content")
+            rules.append(compiled)
+
+        policies[name] = _Policy(tuple(rules), ApprovalDecision(default["requires_approval"], default["id"]),
+                                 KeywordMatcher(keyword_groups), tuple(sorted(keyword_fields)),
+                                 tuple(sorted(read_fields)))
+    return policies
+
+
+def section_values(content: str) -> Dict[str, str]:
+    """First line after each "## " heading, by heading text, in one pass over the content"""
+    values = {}
+    heading = None
+    for line in content.splitlines():
+        stripped = line.strip()
+        if heading is not None:
+            values.setdefault(heading, stripped)
+            heading = None
+        if stripped.startswith("## "):
+            heading = stripped[3:].strip()
+    return values
+
+
+class ApprovalRules:
+    """Compiled approval policies, reloaded when the rules file changes"""
+
+    def __init__(self, path=None, reload_interval: float = RELOAD_INTERVAL):
+        self.path = Path(path or os.getenv("APPROVAL_RULES_FILE") or DEFAULT_RULES_FILE)
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._policies: Dict[str, _Policy] = {}
+        self._stamp = None
+        self._next_check = 0.0
+        self._decisions: "OrderedDict[tuple, ApprovalDecision]" = OrderedDict()
+        self.reload()
+
+    def reload(self) -> bool:
+        """Recompile the rules if the file changed; a broken file keeps the rules already loaded"""
+        stat = self.path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                policies = compile_policies(json.load(f))
+        except ValueError as e:
+            if not self._policies:
+                raise
+            print(f"Keeping previous approval rules; {self.path} is invalid: {e}", file=sys.stderr)
+            self._stamp = stamp
+            return False
+
+        with self._lock:
+            self._policies = policies
+            self._stamp = stamp
+            self._decisions.clear()
+        return True
+
+    def decide(self, policy: str, fields: Dict[str, object]) -> ApprovalDecision:
+        """Decision of a policy for a task or plan, given its fields (e.g. {"content": text})"""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.reload_interval
+            try:
+                self.reload()
+            except OSError as e:
+                print(f"Keeping previous approval rules; cannot read {self.path}: {e}", file=sys.stderr)
+
+        compiled = self._policies.get(policy)
+        if compiled is None:
+            raise KeyError(f"No approval policy named {policy!r} in {self.path}")
+
+        # Keyed by a digest of only the fields the policy reads
+        digest = hashlib.sha256()
+        for name in compiled.read_fields:
+            digest.update(str(fields.get(name) or "").encode("utf-8", errors="replace") + b"\0")
+        key = (policy, digest.digest())
+        with self._lock:
+            cached = self._decisions.get(key)
+            if cached is not None:
+                self._decisions.move_to_end(key)
+                return cached
+
+        decision = self._evaluate(compiled, fields)
+        with self._lock:
+            self._decisions[key] = decision
+            while len(self._decisions) > DECISION_CACHE_SIZE:
+                self._decisions.popitem(last=False)
+        return decision
+
+    def _evaluate(self, compiled: _Policy, fields: Dict[str, object]) -> ApprovalDecision:
+        """First matching rule of a compiled policy, else its default"""
+        hits = {name: normalize(str(fields.get(name) or "")).scan(compiled.matcher) for name in compiled.keyword_fields}
+        sections: Optional[Dict[str, str]] = None
+
+        for rule in compiled.rules:
+            if rule["kind"] == "keywords":
+                if any(rule["id"] in hits[name] for name in rule["fields"]):
+                    return rule["decision"]
+            elif rule["kind"] == "field":
+                if str(fields.get(rule["target"]) or "").lower() == rule["equals"]:
+                    return rule["decision"]
+            else:
+                if sections is None:
+                    sections = section_values(str(fields.get("content") or ""))
+                # Headings may carry extra words, e.g. "## Requires Approval (manager)"
+                for heading, value in sections.items():
+                    if heading.startswith(rule["target"]):
+                        if value.lower() == rule["equals"]:
+                            return rule["decision"]
+                        break
+        return compiled.default
+
+    def rule_ids(self, policy: str) -> List[str]:
+        """Ids of a policy's rules in evaluation order, then its default"""
+        compiled = self._policies[policy]
+        return [rule["id"] for rule in compiled.rules] + [compiled.default.rule_id]
+
+
+_rules: Optional[ApprovalRules] = None
+_rules_lock = threading.Lock()
+
+
+def get_approval_rules() -> ApprovalRules:
+    """Get the process-wide approval rules"""
+    global _rules
+    if _rules is None:
+        with _rules_lock:
+            if _rules is None:
+                _rules = ApprovalRules()
+    return _rules
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Audit Index Module for AI Employee System
+Sidecar byte-offset index for audit log segments. Every segment
+YYYY-MM-DD.NNN.jsonl has a YYYY-MM-DD.NNN.jsonl.idx file with one line per
+entry: [action_type, hour, status, offset, length]. Queries use it to read
+only the matching records instead of parsing whole days.
+"""
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# (action_type, hour, status, offset, length)
+IndexRecord = Tuple[str, int, str, int, int]
+
+
+def index_path(segment_path: Path) -> Path:
+    """Get the sidecar index path for a segment"""
+    return segment_path.with_name(segment_path.name + ".idx")
+
+
+def format_index_line(entry: dict, offset: int, length: int) -> str:
+    """Build the index line for an entry written at offset"""
+    return json.dumps([
+        entry.get("action_type", ""),
+        entry_hour(entry),
+        entry.get("status", ""),
+        offset,
+        length
+    ]) + "\n"
+
+
+def entry_hour(entry: dict) -> int:
+    """Hour of day an entry was logged at (-1 when the timestamp is unusable)"""
+    try:
+        return int(entry.get("timestamp", "")[11:13])
+    except ValueError:
+        return -1
+
+
+class SegmentIndex:
+    """In-memory view of one segment's index, extended incrementally as files grow"""
+
+    def __init__(self, segment_path: Path):
+        self.segment_path = segment_path
+        self.records: Dict[int, IndexRecord] = {}
+        self.by_action_hour: Dict[Tuple[str, int], List[int]] = {}
+        self.index_bytes_read = 0
+        self.covered_end = 0
+
+    def add(self, record: IndexRecord):
+        """Add one record unless its offset is already known"""
+        offset = record[3]
+        if offset in self.records:
+            return
+        self.records[offset] = record
+        self.by_action_hour.setdefault((record[0], record[1]), []).append(offset)
+        self.covered_end = max(self.covered_end, offset + record[4])
+
+    def refresh(self):
+        """Pick up index lines and segment bytes written since the last refresh"""
+        sidecar = index_path(self.segment_path)
+        if sidecar.exists():
+            with open(sidecar, 'rb') as f:
+                f.seek(self.index_bytes_read)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    self.index_bytes_read += len(line)
+                    try:
+                        action_type, hour, status, offset, length = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.add((action_type, hour, status, offset, length))
+
+        # Entries without index lines (older logs, interrupted writes) are indexed by scanning
+        if self.segment_path.stat().st_size > self.covered_end:
+            self.scan_from(self.covered_end)
+
+    def scan_from(self, offset: int):
+        """Index the segment by reading it from offset"""
+        with open(self.segment_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None
+                if isinstance(entry, dict):
+                    self.add((entry.get("action_type", ""), entry_hour(entry),
+                              entry.get("status", ""), offset, len(line)))
+                offset += len(line)
+
+    def rebuild(self):
+        """Discard the index and rebuild it from the segment contents"""
+        self.records.clear()
+        self.by_action_hour.clear()
+        self.covered_end = 0
+        self.scan_from(0)
+
+    def matching_offsets(self, action_types: Optional[Set[str]], statuses: Optional[Set[str]],
+                         hours: Optional[Set[int]]) -> List[int]:
+        """Offsets of the records matching the filters, in file order"""
+        if action_types is None and hours is None:
+            offsets = list(self.records)
+        else:
+            offsets = []
+            for (action_type, hour), group in self.by_action_hour.items():
+                if action_types is not None and action_type not in action_types:
+                    continue
+                if hours is not None and hour not in hours:
+                    continue
+                offsets.extend(group)
+
+        if statuses is not None:
+            offsets = [o for o in offsets if self.records[o][2] in statuses]
+        return sorted(offsets)
+
+
+class AuditIndex:
+    """Cache of segment indexes used to answer audit log queries"""
+
+    def __init__(self):
+        self._segments: Dict[Path, SegmentIndex] = {}
+
+    def get(self, segment_path: Path) -> SegmentIndex:
+        """Get the up-to-date index for a segment"""
+        segment_index = self._segments.get(segment_path)
+        if segment_index is None:
+            segment_index = self._segments[segment_path] = SegmentIndex(segment_path)
+        segment_index.refresh()
+        return segment_index
+
+    def read_matching(self, segment_path: Path, action_types: Optional[Set[str]] = None,
+                      statuses: Optional[Set[str]] = None,
+                      hours: Optional[Set[int]] = None) -> Iterable[dict]:
+        """Yield the entries of a segment that match the filters, reading only those records"""
+        segment_index = self.get(segment_path)
+        offsets = segment_index.matching_offsets(action_types, statuses, hours)
+        entries = self._read_records(segment_index, offsets)
+
+        if entries is None:
+            # Index disagrees with the segment (e.g. written by another process): rebuild it
+            segment_index.rebuild()
+            offsets = segment_index.matching_offsets(action_types, statuses, hours)
+            entries = self._read_records(segment_index, offsets) or []
+
+        return entries
+
+    def _read_records(self, segment_index: SegmentIndex, offsets: List[int]) -> Optional[List[dict]]:
+        """Read the records at offsets, or None if any of them does not match its index line"""
+        entries = []
+        with open(segment_index.segment_path, 'rb') as f:
+            for offset in offsets:
+                action_type, _, _, _, length = segment_index.records[offset]
+                f.seek(offset)
+                try:
+                    entry = json.loads(f.read(length))
+                except ValueError:
+                    return None
+                if not isinstance(entry, dict) or entry.get("action_type", "") != action_type:
+                    return None
+                entries.append(entry)
+        return entries
+
+    def forget(self, segment_path: Path):
+        """Drop the cached index for a segment that was removed"""
+        self._segments.pop(segment_path, None)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Audit Rollups Module for AI Employee System
+Keeps per-day counts of audit log entries by action type, agent and status in
+/Logs/rollups.json. Counts are updated as entries are logged and caught up
+from a per-source byte watermark, so they always equal a full rescan.
+"""
+import os
+import json
+import atexit
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+ROLLUP_FILE = "rollups.json"
+ROLLUP_VERSION = 1
+
+# Action type prefixes written by each agent
+AGENT_PREFIXES = {
+    "COMMUNICATION": "Communications",
+    "FINANCE": "Finance",
+    "PROJECT": "Operations",
+    "BOTTLENECK": "Operations",
+    "OPERATIONS": "Operations",
+    "STRATEGIC": "CEO",
+    "SYSTEM": "System",
+    "SECURITY": "System",
+}
+
+
+def entry_agent(entry: dict) -> str:
+    """Work out which agent produced an entry"""
+    if entry.get("agent"):
+        return entry["agent"]
+
+    action_type = entry.get("action_type", "")
+    if action_type == "ERROR":
+        # Errors carry the failing component in their error type
+        details = entry.get("details")
+        action_type = details.get("error_type", "") if isinstance(details, dict) else ""
+
+    return AGENT_PREFIXES.get(action_type.split("_", 1)[0], "Other")
+
+
+def empty_counts() -> dict:
+    """Counts for a day with no entries"""
+    return {"total": 0, "action_types": {}, "agents": {}, "statuses": {}}
+
+
+def add_entry(counts: dict, entry: dict):
+    """Count one entry"""
+    counts["total"] += 1
+    for key, value in (("action_types", entry.get("action_type", "")),
+                       ("agents", entry_agent(entry)),
+                       ("statuses", entry.get("status", ""))):
+        counts[key][value] = counts[key].get(value, 0) + 1
+
+
+def merge_counts(target: dict, counts: dict):
+    """Add counts into target"""
+    target["total"] += counts["total"]
+    for key in ("action_types", "agents", "statuses"):
+        for name, value in counts[key].items():
+            target[key][name] = target[key].get(name, 0) + value
+
+
+class AuditRollups:
+    """Incremental per-day aggregates over the audit log"""
+
+    def __init__(self, logs_dir: Path):
+        self.logs_dir = Path(logs_dir)
+        self.path = self.logs_dir / ROLLUP_FILE
+        self._lock = threading.RLock()
+        self._dirty = False
+        # source file name -> {"day", "consumed", "size", "counts"}
+        self.sources: Dict[str, dict] = {}
+        self.load()
+
+    def load(self):
+        """Load the saved rollups, starting empty if missing or from another version"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == ROLLUP_VERSION:
+            self.sources = data.get("sources", {})
+
+    def save(self):
+        """Write the rollups atomically if they changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({"version": ROLLUP_VERSION, "sources": self.sources})
+            self._dirty = False
+
+        if not self.logs_dir.exists():
+            return
+        tmp_path = self.path.with_name(f"{ROLLUP_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+    def _source(self, name: str, day: str) -> dict:
+        """Get or create the record for a source file"""
+        source = self.sources.get(name)
+        if source is None:
+            source = self.sources[name] = {"day": day, "consumed": 0, "size": 0, "counts": empty_counts()}
+        return source
+
+    def observe(self, entry: dict, segment_name: str, day: str, offset: Optional[int], length: int):
+        """Count an entry as it is logged.
+
+        Only applied when it directly follows what has been counted for the segment;
+        anything else is picked up by catch_up from the file.
+        """
+        with self._lock:
+            source = self._source(segment_name, day)
+            if offset is None or source["consumed"] != offset:
+                return
+            add_entry(source["counts"], entry)
+            source["consumed"] = offset + length
+            self._dirty = True
+
+    def catch_up(self, segments: Iterable[Tuple[str, str, Path]], legacy: Iterable[Tuple[str, str, Path]],
+                 archives: Iterable[Tuple[str, str, Path, dict]] = ()):
+        """Count whatever the saved watermarks have not seen yet.
+
+        segments and legacy are (name, day, path) for every log file currently present,
+        archives are (name, day, path, counts) with the counts from the archive index;
+        sources that disappeared are dropped so the totals always match a rescan.
+        """
+        with self._lock:
+            present = set()
+
+            for name, day, path in segments:
+                present.add(name)
+                source = self._source(name, day)
+                size = path.stat().st_size
+                if size < source["consumed"]:
+                    # Segment was replaced; count it again from the start
+                    source.update(consumed=0, counts=empty_counts())
+                if size > source["consumed"]:
+                    self._count_segment(source, path)
+
+            for name, day, path in legacy:
+                present.add(name)
+                source = self._source(name, day)
+                size = path.stat().st_size
+                if size != source["size"]:
+                    counts = empty_counts()
+                    with open(path, 'r', encoding='utf-8') as f:
+                        for entry in json.load(f):
+                            add_entry(counts, entry)
+                    source.update(size=size, consumed=size, counts=counts)
+                    self._dirty = True
+
+            for name, day, path, counts in archives:
+                present.add(name)
+                source = self._source(name, day)
+                size = path.stat().st_size
+                if size != source["size"]:
+                    source.update(size=size, consumed=size, counts=counts)
+                    self._dirty = True
+
+            for name in list(self.sources):
+                if name not in present:
+                    del self.sources[name]
+                    self._dirty = True
+
+    def _count_segment(self, source: dict, path: Path):
+        """Count complete lines of a segment past its watermark"""
+        with open(path, 'rb') as f:
+            f.seek(source["consumed"])
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                source["consumed"] += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict):
+                    add_entry(source["counts"], entry)
+        self._dirty = True
+
+    def daily(self, start_day: Optional[str] = None, end_day: Optional[str] = None) -> Dict[str, dict]:
+        """Counts per day (YYYY-MM-DD) within [start_day, end_day]"""
+        days: Dict[str, dict] = {}
+        with self._lock:
+            for source in self.sources.values():
+                day = source["day"]
+                if (start_day and day < start_day) or (end_day and day > end_day):
+                    continue
+                merge_counts(days.setdefault(day, empty_counts()), source["counts"])
+        return {day: counts for day, counts in sorted(days.items()) if counts["total"]}
+
+    def summary(self, start_day: Optional[str] = None, end_day: Optional[str] = None) -> dict:
+        """Combined counts over [start_day, end_day]"""
+        total = empty_counts()
+        for counts in self.daily(start_day, end_day).values():
+            merge_counts(total, counts)
+        return total
+
+    def weekly(self, start_day: Optional[str] = None, end_day: Optional[str] = None) -> Dict[str, dict]:
+        """Counts per ISO week (YYYY-Www), built from the daily rollups"""
+        weeks: Dict[str, dict] = {}
+        for day, counts in self.daily(start_day, end_day).items():
+            year, week, _ = date.fromisoformat(day).isocalendar()
+            merge_counts(weeks.setdefault(f"{year}-W{week:02d}", empty_counts()), counts)
+        return weeks
+
+    def last_days(self, days: int) -> dict:
+        """Combined counts for the last N days including today"""
+        start = (date.today() - timedelta(days=days - 1)).isoformat()
+        return self.summary(start_day=start)
+
+
+_rollups: Dict[Path, AuditRollups] = {}
+_rollups_lock = threading.Lock()
+
+
+def get_audit_rollups(logs_dir: Path) -> AuditRollups:
+    """Get the process-wide rollups for a logs directory, saved automatically at exit"""
+    key = Path(logs_dir).resolve()
+    with _rollups_lock:
+        rollups = _rollups.get(key)
+        if rollups is None:
+            rollups = _rollups[key] = AuditRollups(logs_dir)
+            atexit.register(rollups.save)
+        return rollups
+
+
+def rescan(entries_by_day: Iterable[Tuple[str, Iterable[dict]]]) -> Dict[str, dict]:
+    """Compute daily counts from scratch, for checking the incremental rollups"""
+    days: Dict[str, dict] = {}
+    for day, entries in entries_by_day:
+        counts = empty_counts()
+        for entry in entries:
+            add_entry(counts, entry)
+        if counts["total"]:
+            days[day] = counts
+    return dict(sorted(days.items()))
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Cycle Metrics Module for AI Employee System
+Lightweight spans that time each stage of a processing cycle. A span records its
+wall time plus the files it scanned, the files it wrote and the bytes it read,
+observed through a Python audit hook while the span is open. Every finished
+cycle is appended as one JSON line to logs/cycle_metrics.jsonl.
+"""
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.log_sink import get_log_sink
+from utils.metrics_server import get_metrics_registry
+
+DEFAULT_METRICS_FILE = "logs/cycle_metrics.jsonl"
+WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_APPEND | os.O_CREAT
+
+# Spans open on the current thread, innermost last
+_local = threading.local()
+_hook_lock = threading.Lock()
+_hook_installed = False
+
+
+class Span:
+    """Timing and file I/O counters for one stage"""
+
+    __slots__ = ("name", "status", "wall_ms", "files_scanned", "files_written", "bytes_read", "dir_scans")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = "completed"
+        self.wall_ms = 0.0
+        self.files_scanned = 0
+        self.files_written = 0
+        self.bytes_read = 0
+        self.dir_scans = 0
+
+    def to_dict(self) -> dict:
+        """Serializable form of the span"""
+        return {
+            "name": self.name,
+            "status": self.status,
+            "wall_ms": round(self.wall_ms, 3),
+            "files_scanned": self.files_scanned,
+            "files_written": self.files_written,
+            "bytes_read": self.bytes_read,
+            "dir_scans": self.dir_scans,
+        }
+
+
+def _audit_hook(event: str, args: tuple):
+    """Attribute file opens and directory scans to the spans open on this thread"""
+    if event not in ("open", "os.scandir", "os.listdir"):
+        return
+    spans = getattr(_local, "spans", None)
+    if not spans:
+        return
+
+    try:
+        if event != "open":
+            for span in spans:
+                span.dir_scans += 1
+            return
+
+        path, mode, flags = args
+        if not isinstance(path, (str, bytes, os.PathLike)):
+            # Re-opening an existing descriptor is not new file I/O
+            return
+
+        writing = any(c in mode for c in "wax+") if mode else bool(flags & WRITE_FLAGS)
+        size = 0
+        if not writing:
+            try:
+                size = os.stat(path).st_size
+            except OSError:
+                pass
+
+        for span in spans:
+            if writing:
+                span.files_written += 1
+            else:
+                span.files_scanned += 1
+                span.bytes_read += size
+    except Exception:
+        # Never let instrumentation break the operation being observed
+        pass
+
+
+def _install_hook():
+    """Install the audit hook once per process (audit hooks cannot be removed)"""
+    global _hook_installed
+    if _hook_installed:
+        return
+    with _hook_lock:
+        if not _hook_installed:
+            sys.addaudithook(_audit_hook)
+            _hook_installed = True
+
+
+class CycleMetrics:
+    """Collects the stage spans of each cycle and writes one record per cycle"""
+
+    def __init__(self, metrics_path=None, sink=None):
+        self.metrics_path = Path(metrics_path or os.getenv("CYCLE_METRICS_FILE", DEFAULT_METRICS_FILE))
+        self.sink = sink or get_log_sink()
+        self.stages: List[Span] = []
+        self.last_record: Optional[dict] = None
+        self._in_cycle = False
+
+    @contextmanager
+    def span(self, name: str):
+        """Time a stage; nested spans also count towards the spans around them"""
+        _install_hook()
+        span = Span(name)
+        spans = _local.__dict__.setdefault("spans", [])
+        spans.append(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException:
+            span.status = "error"
+            raise
+        finally:
+            span.wall_ms = (time.perf_counter() - started) * 1000
+            spans.remove(span)
+            if self._in_cycle:
+                self.stages.append(span)
+
+    @contextmanager
+    def cycle(self, name: str = "cycle"):
+        """Wrap one processing cycle and emit its metrics record when it ends"""
+        self.stages = []
+        self._in_cycle = True
+        started_at = datetime.now().isoformat()
+        status = "completed"
+        try:
+            with self.span(name):
+                yield self
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            self._in_cycle = False
+            self.last_record = self._emit(name, started_at, status)
+
+    def _emit(self, name: str, started_at: str, status: str) -> dict:
+        """Append the finished cycle's record to the metrics file"""
+        total = self.stages[-1]
+        record = {
+            "cycle": name,
+            "started_at": started_at,
+            "pid": os.getpid(),
+            "status": status,
+            "wall_ms": round(total.wall_ms, 3),
+            "stages": [span.to_dict() for span in self.stages[:-1]],
+        }
+        self.metrics_path.parent.mkdir(parents=True, exist_ok=True)
+        self.sink.write(self.metrics_path, json.dumps(record) + "\n")
+
+        # Same timings as histograms for the metrics endpoint
+        registry = get_metrics_registry()
+        registry.observe("ai_employee_cycle_duration_seconds", total.wall_ms / 1000, {"cycle": name})
+        for span in self.stages[:-1]:
+            registry.observe("ai_employee_stage_duration_seconds", span.wall_ms / 1000, {"stage": span.name})
+        return record
+
+
+def read_cycle_metrics(metrics_path=None) -> List[dict]:
+    """Load every cycle record written so far, oldest first"""
+    path = Path(metrics_path or os.getenv("CYCLE_METRICS_FILE", DEFAULT_METRICS_FILE))
+    records = []
+    if not path.exists():
+        return records
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # Partially written last line
+                continue
+    return records
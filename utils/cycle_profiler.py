@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Cycle Profiler Module for AI Employee System
+Runs processing cycles under cProfile or a lightweight sampling profiler and
+writes one profile per cycle to logs/profiles/: a .pstats file (cProfile mode)
+and a .collapsed stack file that flame graph tools (flamegraph.pl, speedscope)
+read directly. Only the newest PROFILE_KEEP cycles are kept.
+"""
+import os
+import sys
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+PROFILE_MODES = ("cprofile", "sample")
+DEFAULT_PROFILE_DIR = "logs/profiles"
+DEFAULT_KEEP = 20
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# Limits when turning cProfile call graphs into stacks: deepest chain followed,
+# and smallest share of the total time worth following a call path for
+MAX_STACK_DEPTH = 200
+MIN_PATH_FRACTION = 1e-4
+
+
+def frame_label(filename: str, lineno: int, funcname: str) -> str:
+    """Name of a function in a collapsed stack"""
+    return f"{funcname} ({Path(filename).name}:{lineno})".replace(";", ",")
+
+
+def collapse_pstats(stats: pstats.Stats) -> Dict[str, int]:
+    """Approximate collapsed stacks (microseconds of own time) from a cProfile call graph.
+
+    cProfile only records caller/callee pairs, so time is split between call
+    paths in proportion to each caller's share of the callee's cumulative time.
+    """
+    callees: Dict[tuple, list] = {}
+    roots = []
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    stacks: Counter = Counter()
+    min_time = stats.total_tt * MIN_PATH_FRACTION
+
+    def walk(func, share, path, on_path):
+        tt = stats.stats[func][2]
+        path = path + [frame_label(*func)]
+        own = int(tt * share * 1_000_000)
+        if own:
+            stacks[";".join(path)] += own
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_ct in callees.get(func, ()):
+            callee_ct = stats.stats[callee][3]
+            if callee in on_path or not callee_ct or share * edge_ct < min_time:
+                continue
+            walk(callee, share * min(1.0, edge_ct / callee_ct), path, on_path | {callee})
+
+    for root in roots:
+        walk(root, 1.0, [], {root})
+    return dict(stacks)
+
+
+class _Sampler:
+    """Samples one thread's Python stack at a fixed interval"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="CycleSampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+
+class CycleProfiler:
+    """Profiles cycles when a mode is set; a no-op otherwise"""
+
+    def __init__(self, mode: Optional[str] = None, output_dir=None, keep: Optional[int] = None,
+                 sample_interval: Optional[float] = None):
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Profile mode must be one of {PROFILE_MODES}, got {mode!r}")
+        self.mode = mode
+        self.output_dir = Path(output_dir or os.getenv("PROFILE_DIR", DEFAULT_PROFILE_DIR))
+        self.keep = keep if keep is not None else int(os.getenv("PROFILE_KEEP", DEFAULT_KEEP))
+        self.sample_interval = sample_interval or float(
+            os.getenv("PROFILE_SAMPLE_INTERVAL", DEFAULT_SAMPLE_INTERVAL))
+        self.last_profile: Optional[Path] = None
+
+    @contextmanager
+    def profile(self, name: str = "cycle"):
+        """Profile the block and write its profile files when it ends"""
+        if self.mode is None:
+            yield
+            return
+
+        stem = f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-p{os.getpid()}"
+        if self.mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                self._write_cprofile(stem, profiler)
+        else:
+            sampler = _Sampler(threading.get_ident(), self.sample_interval)
+            sampler.start()
+            try:
+                yield
+            finally:
+                sampler.stop()
+                self._write_collapsed(stem, sampler.stacks)
+
+    def _write_cprofile(self, stem: str, profiler: cProfile.Profile):
+        """Write the pstats dump and collapsed stacks of a cProfile run"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(self.output_dir / f"{stem}.pstats")
+        stats = pstats.Stats(profiler)
+        self._write_collapsed(stem, collapse_pstats(stats))
+
+    def _write_collapsed(self, stem: str, stacks: Dict[str, int]):
+        """Write collapsed stacks ("frame;frame;frame count" per line) and prune old profiles"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"{stem}.collapsed"
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(stacks.items()):
+                f.write(f"{stack} {count}\n")
+        self.last_profile = path
+        print(f"Profile written: {path}")
+        self.prune()
+
+    def prune(self):
+        """Delete all but the newest `keep` profiled cycles"""
+        cycles: Dict[str, float] = {}
+        for path in self.output_dir.glob("*.collapsed"):
+            cycles[path.stem] = path.stat().st_mtime
+
+        for stem in sorted(cycles, key=lambda s: (cycles[s], s))[:-self.keep or None]:
+            for suffix in (".pstats", ".collapsed"):
+                (self.output_dir / f"{stem}{suffix}").unlink(missing_ok=True)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Document Cache Module for AI Employee System
+The same task text is read by the planning layer, the inbox processor, the
+approval rules, the dispatcher and the agents, and each used to lower-case
+it, split it into lines, cut previews from it and scan it for keywords on
+its own. normalize() returns one NormalizedDocument per distinct content,
+keyed by its SHA-256 (the vault index's content_hash, so entries are not
+hashed again), holding the lower-cased text, previews, line offsets, a
+token set and the keyword matches found so far. Documents nobody used
+during a cycle are dropped when the next one starts.
+"""
+import os
+import re
+import sys
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, Optional, Set, Tuple
+
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.metrics_server import get_metrics_registry
+
+DEFAULT_CACHE_SIZE = 1024
+
+# Preview lengths used in plans, drafts, approvals and briefings
+PREVIEW_LENGTHS = (200, 300, 500, 1000)
+TOKEN = re.compile(r"\w+")
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of a text, as stored by the vault index"""
+    return hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()
+
+
+class NormalizedDocument:
+    """A text with its lower-cased form, previews and derived views, each computed once"""
+
+    __slots__ = ("text", "content_hash", "lower", "previews", "_tokens", "_line_offsets", "_scans")
+
+    def __init__(self, text: str, digest: Optional[str] = None):
+        self.text = text
+        self.content_hash = digest or content_hash(text)
+        self.lower = text.lower()
+        self.previews: Dict[int, str] = {length: text[:length] for length in PREVIEW_LENGTHS}
+        self._tokens: Optional[FrozenSet[str]] = None
+        self._line_offsets: Optional[Tuple[int, ...]] = None
+        self._scans: Dict[KeywordMatcher, FrozenSet[str]] = {}
+
+    def preview(self, length: int) -> str:
+        """First `length` characters of the text"""
+        cached = self.previews.get(length)
+        return cached if cached is not None else self.text[:length]
+
+    @property
+    def tokens(self) -> FrozenSet[str]:
+        """Distinct lower-cased words"""
+        if self._tokens is None:
+            self._tokens = frozenset(TOKEN.findall(self.lower))
+        return self._tokens
+
+    @property
+    def line_offsets(self) -> Tuple[int, ...]:
+        """Start offset of every line, plus the end of the text"""
+        if self._line_offsets is None:
+            offsets = [0]
+            find = self.text.find
+            position = find("\n")
+            while position != -1:
+                offsets.append(position + 1)
+                position = find("\n", position + 1)
+            offsets.append(len(self.text) + 1)
+            self._line_offsets = tuple(offsets)
+        return self._line_offsets
+
+    def lines(self) -> Iterator[Tuple[str, str]]:
+        """(line, lower-cased line) pairs, as content.split('\\n') would give them"""
+        offsets = self.line_offsets
+        # Lower-casing can change the length of a few characters; only slice lower when it did not
+        lower = self.lower if len(self.lower) == len(self.text) else None
+        for start, end in zip(offsets, offsets[1:]):
+            line = self.text[start:end - 1]
+            yield line, (lower[start:end - 1] if lower is not None else line.lower())
+
+    def scan(self, matcher: KeywordMatcher) -> FrozenSet[str]:
+        """Groups of a keyword matcher found in the text, scanned once per matcher"""
+        hits = self._scans.get(matcher)
+        if hits is None:
+            hits = self._scans[matcher] = matcher.scan_lowered(self.lower)
+        return hits
+
+
+class DocumentCache:
+    """Normalized documents by content hash, kept while some stage keeps using them"""
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize or int(os.getenv("DOCUMENT_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+        self.hits = 0
+        self.misses = 0
+        self._reported = (0, 0)
+        self._entries: "OrderedDict[str, NormalizedDocument]" = OrderedDict()
+        self._used: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def get(self, text: str, digest: Optional[str] = None) -> NormalizedDocument:
+        """The normalized document for a text (pass its content hash if already known)"""
+        text = text or ""
+        digest = digest or content_hash(text)
+        with self._lock:
+            document = self._entries.get(digest)
+            if document is not None:
+                self._entries.move_to_end(digest)
+                self._used.add(digest)
+                self.hits += 1
+                return document
+            self.misses += 1
+
+        document = NormalizedDocument(text, digest)
+        with self._lock:
+            self._entries[digest] = document
+            self._used.add(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return document
+
+    def new_cycle(self) -> int:
+        """Drop the documents not used since the last call; returns how many were dropped"""
+        with self._lock:
+            stale = [digest for digest in self._entries if digest not in self._used]
+            for digest in stale:
+                del self._entries[digest]
+            self._used = set()
+            hits, misses = self.hits - self._reported[0], self.misses - self._reported[1]
+            self._reported = (self.hits, self.misses)
+
+        registry = get_metrics_registry()
+        registry.inc("ai_employee_document_cache_lookups_total", {"result": "hit"}, hits)
+        registry.inc("ai_employee_document_cache_lookups_total", {"result": "miss"}, misses)
+        return len(stale)
+
+    def clear(self):
+        """Drop every cached document"""
+        with self._lock:
+            self._entries.clear()
+            self._used = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache: Optional[DocumentCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_document_cache() -> DocumentCache:
+    """Get the process-wide document cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DocumentCache()
+    return _cache
+
+
+def normalize(text: str, digest: Optional[str] = None) -> NormalizedDocument:
+    """Shared normalized form of a text, computed once per distinct content"""
+    return get_document_cache().get(text, digest)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Done Archive Module for AI Employee System
+Completed work is filed under date shards, vault/Done/YYYY/MM/DD/, so readers
+that only care about today or the last week list a handful of small folders
+instead of one ever-growing directory. Run this module with --migrate to move
+an existing flat Done folder into shards.
+"""
+import re
+import sys
+import filecmp
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.vault_index import get_vault_index
+
+DONE_FOLDER = "Done"
+
+# completed_YYYYMMDD_HHMMSS_... and processed[_kind]_YYYYMMDD_HHMMSS_... names carry their completion time
+NAME_TIMESTAMP = re.compile(r"^(?:completed|processed)(?:_[a-z]+)?_(\d{8})_\d{6}_")
+
+
+def shard_folder(day: date) -> str:
+    """Vault-relative folder holding the work completed on a day"""
+    return f"{DONE_FOLDER}/{day:%Y/%m/%d}"
+
+
+def shard_folders(start: date, end: date) -> List[str]:
+    """Shard folders for every day from start to end, inclusive"""
+    return [shard_folder(start + timedelta(days=offset)) for offset in range((end - start).days + 1)]
+
+
+def recent_shard_folders(days: int, today: Optional[date] = None) -> List[str]:
+    """Shard folders for today and the previous `days` days"""
+    today = today or date.today()
+    return shard_folders(today - timedelta(days=days), today)
+
+
+def done_destination(vault_path, name: str, when: Optional[datetime] = None) -> Path:
+    """Destination for a file completed at `when` (default now), creating its shard"""
+    when = when or datetime.now()
+    folder = Path(vault_path) / shard_folder(when.date())
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder / name
+
+
+def completion_date(path: Path) -> date:
+    """Day a file in the flat Done folder was completed: from its name, else its mtime"""
+    match = NAME_TIMESTAMP.match(path.name)
+    if match:
+        try:
+            return datetime.strptime(match.group(1), "%Y%m%d").date()
+        except ValueError:
+            pass
+    return date.fromtimestamp(path.stat().st_mtime)
+
+
+def unused_name(folder: Path, name: str) -> Path:
+    """Path in folder for name, with _1, _2, ... added to the stem if it is taken"""
+    path = folder / name
+    counter = 1
+    while path.exists():
+        path = folder / f"{Path(name).stem}_{counter}{Path(name).suffix}"
+        counter += 1
+    return path
+
+
+def migrate_flat_done(vault_path="./vault", dry_run: bool = False) -> int:
+    """Move files sitting directly in Done/ into their date shards; returns the number filed.
+
+    A file whose shard already holds the same name is dropped if the contents
+    match and moved in under a numbered name otherwise, so nothing is left
+    behind to be reported again on the next run.
+    """
+    vault_path = Path(vault_path)
+    done_dir = vault_path / DONE_FOLDER
+    if not done_dir.is_dir():
+        return 0
+
+    index = get_vault_index(vault_path)
+    moved = 0
+    for path in sorted(done_dir.iterdir()):
+        if not path.is_file() or path.name.startswith("."):
+            continue
+        day = completion_date(path)
+        destination = vault_path / shard_folder(day) / path.name
+        if destination.is_file() and filecmp.cmp(path, destination, shallow=False):
+            print(f"Removing {path.name}: same file already in {shard_folder(day)}")
+            if not dry_run:
+                index.remove(path)
+            moved += 1
+            continue
+        if destination.exists():
+            destination = unused_name(destination.parent, path.name)
+            print(f"Filing {path.name} as {destination.name}: name already taken in {shard_folder(day)}")
+        if not dry_run:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            index.move(path, destination)
+        moved += 1
+    return moved
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Done Archive")
+    parser.add_argument("--vault", default="./vault",
+                       help="Path to vault directory")
+    parser.add_argument("--migrate", action="store_true",
+                       help="Move files from the flat Done folder into Done/YYYY/MM/DD shards")
+    parser.add_argument("--dry-run", action="store_true",
+                       help="Only report how many files would be moved")
+
+    args = parser.parse_args()
+
+    if args.migrate:
+        moved = migrate_flat_done(args.vault, args.dry_run)
+        print(f"{'Would move' if args.dry_run else 'Moved'} {moved} files into date shards")
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
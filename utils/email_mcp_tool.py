@@ -4,6 +4,7 @@ Email MCP Tool Module for AI Employee System
 Controlled email sending capability respecting DRY_RUN environment variable.
 """
 import os
+import sys
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -12,6 +13,11 @@ from pathlib import Path
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.metrics_server import get_metrics_registry
+
 # Load environment variables
 load_dotenv()
 
@@ -129,11 +135,6 @@ class EmailMCPTool:
             # Add body to email
             msg.attach(MIMEText(body, 'plain'))
 
-            # Establish connection and send email
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()  # Enable encryption
-            server.login(self.email_username, self.email_password)
-
             # Prepare recipient list (to, cc, bcc)
             all_recipients = to_emails[:]
             if cc_emails:
@@ -141,10 +142,16 @@ class EmailMCPTool:
             if bcc_emails:
                 all_recipients.extend(bcc_emails)
 
-            # Send the email
-            text = msg.as_string()
-            server.sendmail(self.email_username, all_recipients, text)
-            server.quit()
+            with get_metrics_registry().timed("ai_employee_smtp_send_duration_seconds", error_component="smtp"):
+                # Establish connection and send email
+                server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+                server.starttls()  # Enable encryption
+                server.login(self.email_username, self.email_password)
+
+                # Send the email
+                text = msg.as_string()
+                server.sendmail(self.email_username, all_recipients, text)
+                server.quit()
 
             self.log_event(f"Email sent successfully (ID: {message_id})")
 
@@ -4,6 +4,7 @@ File Watcher Module for AI Employee System
 Monitors the incoming folder and creates structured task files when new files are added.
 """
 import os
+import sys
 import time
 import json
 from datetime import datetime
@@ -12,14 +13,26 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import logging
 
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.log_sink import get_log_sink
+from utils.vault_index import get_vault_index
+from utils.task_dedupe import get_task_dedupe_store, dedupe_keys
+from utils.task_events import get_task_events
+from utils.metrics_server import get_metrics_registry
+
 class FileWatcherHandler(FileSystemEventHandler):
     """Custom event handler for file system events"""
 
-    def __init__(self, incoming_path, vault_path):
+    def __init__(self, incoming_path, vault_path, logs_path="logs"):
         self.incoming_path = Path(incoming_path)
         self.vault_path = Path(vault_path)
         self.needs_action_path = self.vault_path / "Needs_Action"
-        self.logs_path = Path("logs")
+        self.logs_path = Path(logs_path)
+        self.vault_index = get_vault_index(vault_path)
+        self.dedupe_store = get_task_dedupe_store(vault_path)
+        self.task_events = get_task_events(vault_path)
 
         # Create logs directory if it doesn't exist
         self.logs_path.mkdir(exist_ok=True)
@@ -64,7 +77,8 @@ class FileWatcherHandler(FileSystemEventHandler):
         self.log_to_system(f"File moved: {event.src_path} -> {event.dest_path}")
 
     def create_structured_task(self, file_path):
-        """Create a structured task file in Needs_Action directory"""
+        """Create a structured task file in Needs_Action directory, unless the same content
+        (or the same email) has already become a task; returns the task file or None"""
         try:
             file_path = Path(file_path)
 
@@ -76,6 +90,13 @@ class FileWatcherHandler(FileSystemEventHandler):
             task_id = f"task_{int(time.time())}_{file_path.stem}"
             task_file_path = self.needs_action_path / f"{task_id}.json"
 
+            # Reject duplicates at the front door instead of planning them again downstream
+            existing_task = self.dedupe_store.claim(dedupe_keys(content), task_id, str(file_path))
+            if existing_task:
+                get_metrics_registry().inc("ai_employee_duplicate_tasks_total")
+                self.logger.info(f"Skipped duplicate of {existing_task}: {file_path.name}")
+                return None
+
             # Create structured task data
             task_data = {
                 "id": task_id,
@@ -90,11 +111,16 @@ class FileWatcherHandler(FileSystemEventHandler):
             }
 
             # Write the structured task to the Needs_Action directory
-            with open(task_file_path, 'w', encoding='utf-8') as f:
-                json.dump(task_data, f, indent=2)
+            try:
+                self.vault_index.write_text(task_file_path, json.dumps(task_data, indent=2))
+            except Exception:
+                self.dedupe_store.release(task_id)
+                raise
+            self.task_events.record(task_id, "created", task_file_path, source=str(file_path))
 
             self.logger.info(f"Created structured task: {task_file_path}")
             self.log_to_system(f"Created structured task from file: {file_path.name}")
+            return task_file_path
 
         except Exception as e:
             self.logger.error(f"Error creating structured task from {file_path}: {e}")
@@ -105,18 +131,17 @@ class FileWatcherHandler(FileSystemEventHandler):
         log_file = self.logs_path / "system.log"
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        with open(log_file, 'a', encoding='utf-8') as f:
-            f.write(f"[{timestamp}] {message}\n")
+        get_log_sink().write(log_file, f"[{timestamp}] {message}\n")
 
 
 class FileWatcher:
     """File Watcher class to monitor incoming directory"""
 
-    def __init__(self, incoming_path="./incoming", vault_path="./vault"):
+    def __init__(self, incoming_path="./incoming", vault_path="./vault", logs_path="logs"):
         self.incoming_path = Path(incoming_path)
         self.vault_path = Path(vault_path)
         self.needs_action_path = self.vault_path / "Needs_Action"
-        self.logs_path = Path("logs")
+        self.logs_path = Path(logs_path)
 
         # Ensure directories exist
         self.incoming_path.mkdir(exist_ok=True)
@@ -124,7 +149,7 @@ class FileWatcher:
         self.logs_path.mkdir(exist_ok=True)
 
         # Initialize the event handler
-        self.event_handler = FileWatcherHandler(self.incoming_path, self.vault_path)
+        self.event_handler = FileWatcherHandler(self.incoming_path, self.vault_path, self.logs_path)
 
         # Initialize the observer
         self.observer = Observer()
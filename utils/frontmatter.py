@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Frontmatter Module for AI Employee System
+Plans, approvals, accounting records and projects start with a "---" block of
+key: value fields. read_frontmatter() reads only that header block, never the
+body, and caches the parsed fields in an LRU keyed by (path, mtime_ns, size),
+so a file is parsed again only after it changes.
+"""
+import io
+import os
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+DEFAULT_CACHE_SIZE = 4096
+
+# A header longer than this is treated as not having frontmatter
+MAX_HEADER_LINES = 200
+
+
+def parse_frontmatter(content: str, suffix: str = ".md") -> dict:
+    """Top-level key: value fields of a Markdown frontmatter block (or a JSON task's scalar fields)"""
+    if suffix == ".json":
+        try:
+            data = json.loads(content)
+        except ValueError:
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {key: value for key, value in data.items() if isinstance(value, (str, int, float, bool))}
+
+    if not content.startswith("---"):
+        return {}
+    return _header_fields(io.StringIO(content))
+
+
+def _header_fields(lines: Iterable[str]) -> dict:
+    """Fields of the header at the start of lines: an exact "---" line, the fields, an exact "---" line"""
+    lines = iter(lines)
+    if next(lines, "").rstrip("\r\n") != "---":
+        return {}
+    header = []
+    for line in lines:
+        if line.rstrip("\r\n") == "---":
+            return _parse_fields(header)
+        header.append(line)
+        if len(header) > MAX_HEADER_LINES:
+            break
+    return {}
+
+
+def _parse_fields(lines) -> dict:
+    """key: value pairs of header lines; nested, list and comment lines are skipped"""
+    fields = {}
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line or line[0] in " \t-#":
+            continue
+        key, sep, value = line.partition(":")
+        if sep and key.strip():
+            fields[key.strip()] = value.strip().strip('"').strip("'")
+    return fields
+
+
+def read_header(path: Union[str, Path]) -> dict:
+    """Parse the frontmatter of a Markdown file, reading no further than its closing ---"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return _header_fields(f)
+
+
+class FrontmatterCache:
+    """LRU of parsed headers keyed by (path, mtime_ns, size)"""
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize or int(os.getenv("FRONTMATTER_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[int, int, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Union[str, Path]) -> dict:
+        """Frontmatter fields of a file ({} if it has none or is missing)"""
+        key = os.fspath(path)
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return {}
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(cached[2])
+            self.misses += 1
+
+        try:
+            if key.endswith(".json"):
+                with open(key, 'r', encoding='utf-8', errors='replace') as f:
+                    fields = parse_frontmatter(f.read(), ".json")
+            else:
+                fields = read_header(key)
+        except OSError:
+            # Moved or deleted since the stat above
+            return {}
+
+        with self._lock:
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, fields)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return dict(fields)
+
+    def clear(self):
+        """Drop every cached header"""
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: Optional[FrontmatterCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_frontmatter_cache() -> FrontmatterCache:
+    """Get the process-wide frontmatter cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = FrontmatterCache()
+    return _cache
+
+
+def read_frontmatter(path: Union[str, Path]) -> Dict[str, str]:
+    """Frontmatter fields of a vault file, parsed from its header only and cached until it changes"""
+    return get_frontmatter_cache().get(path)
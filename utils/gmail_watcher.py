@@ -9,12 +9,18 @@ import email
 from email.header import decode_header
 import time
 import os
+import sys
 from pathlib import Path
 from datetime import datetime
 import logging
 from dotenv import load_dotenv
 import json
 
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.metrics_server import get_metrics_registry
+
 load_dotenv()
 
 class GmailWatcher:
@@ -99,6 +105,7 @@ class GmailWatcher:
             subject = self.decode_mime_words(email_data.get("Subject", "No Subject"))
             sender = email_data.get("From", "Unknown Sender")
             date = email_data.get("Date", datetime.now().strftime("%a, %d %b %Y %H:%M:%S %z"))
+            message_id = email_data.get("Message-ID", "")
             body = self.get_email_body(email_data)
 
             # Create a unique filename based on timestamp and subject
@@ -114,6 +121,7 @@ class GmailWatcher:
 - **From**: {sender}
 - **Subject**: {subject}
 - **Date**: {date}
+- **Message-ID**: {message_id}
 
 ## Email Content
 {body}
@@ -135,6 +143,8 @@ Process this email content as a new task in the AI Employee system.
 
     def check_new_emails(self):
         """Check for new emails and convert to task files"""
+        metrics = get_metrics_registry()
+        started = time.perf_counter()
         try:
             mail = self.connect_to_gmail()
 
@@ -188,10 +198,13 @@ Process this email content as a new task in the AI Employee system.
             if processed_emails > 0:
                 self.logger.info(f"Processed {processed_emails} new emails")
 
+            metrics.observe("ai_employee_imap_check_duration_seconds", time.perf_counter() - started)
             return processed_emails
 
         except Exception as e:
             self.logger.error(f"Error checking emails: {str(e)}")
+            metrics.observe("ai_employee_imap_check_duration_seconds", time.perf_counter() - started)
+            metrics.inc("ai_employee_errors_total", {"component": "imap"})
             return 0
 
     def run_watcher(self):
@@ -4,12 +4,21 @@ Human-in-the-Loop Module for AI Employee System
 Handles approval workflow for tasks requiring human review.
 """
 import os
+import sys
 import json
-import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
 
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.log_sink import get_log_sink
+from utils.vault_index import get_vault_index
+from utils.done_archive import done_destination
+from utils.task_events import get_task_events
+from utils.approval_rules import get_approval_rules
+
 class HumanInTheLoop:
     """Handles the approval workflow for tasks requiring human review"""
 
@@ -20,6 +29,9 @@ class HumanInTheLoop:
         self.pending_approval_path = self.vault_path / "Pending_Approval"
         self.approved_path = self.vault_path / "Approved"
         self.logs_path = Path("logs")
+        self.vault_index = get_vault_index(vault_path)
+        self.task_events = get_task_events(vault_path)
+        self.approval_rules = get_approval_rules()
 
         # Ensure directories exist
         self.pending_approval_path.mkdir(exist_ok=True)
@@ -27,58 +39,56 @@ class HumanInTheLoop:
         self.logs_path.mkdir(exist_ok=True)
 
     def process_plans_for_approval(self):
-        """Process all plans in Plans directory and check if they require approval"""
-        plan_files = list(self.plans_path.glob("*.md"))
-
-        for plan_file in plan_files:
-            self.process_single_plan(plan_file)
-
-    def process_single_plan(self, plan_file: Path):
-        """Process a single plan file and move to appropriate directory if approval is required"""
+        """Check plans added or changed since the last pass for approval requirements"""
+        # Unchanged plans already have their draft; recreating it would discard the approver's edits
+        with self.vault_index.changes("Plans", "human_in_the_loop", "*.md") as changes:
+            for plan_file in changes.pending:
+                if not self.process_single_plan(plan_file):
+                    # Seen again on the next pass
+                    changes.retry(plan_file)
+
+    def process_single_plan(self, plan_file: Path) -> bool:
+        """Process a single plan file and move to appropriate directory if approval is required;
+        returns False if it failed"""
         try:
-            # Read the plan file to check if it requires approval
-            requires_approval = self.check_approval_requirement(plan_file)
+            # Check the plan's indexed text for approval requirements
+            plan_file = self.vault_index.entry(plan_file)
+            decision = self.approval_decision(plan_file)
 
-            if requires_approval:
+            if decision.requires_approval:
                 # Create a draft action file in Pending_Approval
                 draft_file_path = self.create_draft_action(plan_file)
+                self.task_events.record(plan_file, "pending_approval", draft_file_path, rule=decision.rule_id)
                 self.log_event(f"Created draft action for approval: {draft_file_path.name}")
 
                 # Log the event
-                self.log_event(f"Plan {plan_file.name} requires approval, draft created in Pending_Approval")
+                self.log_event(f"Plan {plan_file.name} requires approval ({decision.rule_id}), "
+                               f"draft created in Pending_Approval")
             else:
                 # Log that plan doesn't require approval
-                self.log_event(f"Plan {plan_file.name} does not require approval")
+                self.log_event(f"Plan {plan_file.name} does not require approval ({decision.rule_id})")
+            return True
 
         except Exception as e:
             error_msg = f"Error processing plan file {plan_file}: {str(e)}"
             print(error_msg)
             self.log_event(error_msg)
+            return False
+
+    def approval_decision(self, plan_file: Path):
+        """Decision of the plan_execution approval rules (by default, the plan's 'Requires Approval' section)"""
+        content = self.vault_index.entry(plan_file).body
+        return self.approval_rules.decide("plan_execution", {"content": content})
 
     def check_approval_requirement(self, plan_file: Path) -> bool:
         """Check if the plan requires approval by looking for 'Requires Approval' in the plan"""
-        with open(plan_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Look for the "Requires Approval" section in the plan
-        lines = content.split('\n')
-        for line in lines:
-            if line.strip().startswith('## Requires Approval'):
-                # Get the next line which should contain the boolean value
-                try:
-                    next_line_idx = lines.index(line) + 1
-                    if next_line_idx < len(lines):
-                        approval_line = lines[next_line_idx].strip()
-                        return approval_line.lower() == 'true'
-                except:
-                    pass
-        return False
+        return self.approval_decision(plan_file).requires_approval
 
     def create_draft_action(self, plan_file: Path) -> Path:
         """Create a draft action file in Pending_Approval directory based on the plan"""
-        # Read the plan file
-        with open(plan_file, 'r', encoding='utf-8') as f:
-            plan_content = f.read()
+        # The plan's text, from its indexed entry
+        plan_file = self.vault_index.entry(plan_file)
+        plan_content = plan_file.body
 
         # Create a draft action file name
         draft_file_name = f"draft_{plan_file.stem}.md"
@@ -117,14 +127,13 @@ class HumanInTheLoop:
 """
 
         # Write the draft action to file
-        with open(draft_file_path, 'w', encoding='utf-8') as f:
-            f.write(draft_content)
+        self.vault_index.write_text(draft_file_path, draft_content)
 
         return draft_file_path
 
     def monitor_approved_actions(self):
         """Monitor the Approved directory for actions to execute"""
-        approved_files = list(self.approved_path.glob("*"))
+        approved_files = self.vault_index.paths("Approved")
 
         for approved_file in approved_files:
             self.execute_approved_action(approved_file)
@@ -135,15 +144,14 @@ class HumanInTheLoop:
             # For now, just log that the action is approved for execution
             # In a real implementation, this would execute the actual action
             self.log_event(f"Executing approved action: {approved_file.name}")
+            self.task_events.record(approved_file, "executed", approved_file)
 
             # After execution, we might move the file to a Done folder
             # For now, we'll just log the execution
-            done_path = self.vault_path / "Done"
-            done_path.mkdir(exist_ok=True)
-
-            # Move the approved file to Done after execution
-            final_path = done_path / approved_file.name
-            shutil.move(str(approved_file), str(final_path))
+            # Move the approved file to today's Done shard after execution
+            final_path = done_destination(self.vault_path, approved_file.name)
+            self.vault_index.move(approved_file, final_path)
+            self.task_events.record(approved_file, "done", final_path)
 
             self.log_event(f"Completed execution of: {final_path.name}")
 
@@ -165,8 +173,7 @@ class HumanInTheLoop:
         log_file = self.logs_path / "system.log"
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        with open(log_file, 'a', encoding='utf-8') as f:
-            f.write(f"[{timestamp}] Human-in-the-Loop: {message}\n")
+        get_log_sink().write(log_file, f"[{timestamp}] Human-in-the-Loop: {message}\n")
 
 
 if __name__ == "__main__":
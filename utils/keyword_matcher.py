@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher Module for AI Employee System
+Classification, approval checks, risk assessment and the agents' task
+monitors all ask "does this text contain any of these keywords?" for several
+keyword groups. A KeywordMatcher is built once per keyword table and answers
+for every group in one call: the text is lower-cased once and each distinct
+keyword is searched for once, skipping keywords whose groups are already hit.
+Callers keep the returned hits and read them instead of re-scanning the text.
+
+A single combined regular expression (or a pure-Python Aho-Corasick
+automaton) measured several times slower than this on task-sized texts, since
+CPython's substring search runs in C while the regex engine tries the
+alternation at every position.
+"""
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Mapping, Set, Tuple
+
+
+class KeywordMatcher:
+    """Named keyword groups matched against a text in one call"""
+
+    def __init__(self, groups: Mapping[str, Iterable[str]]):
+        self.groups: Dict[str, Tuple[str, ...]] = {
+            name: tuple(keyword.lower() for keyword in keywords) for name, keywords in groups.items()
+        }
+        groups_of: Dict[str, Set[str]] = {}
+        for name, keywords in self.groups.items():
+            for keyword in keywords:
+                groups_of.setdefault(keyword, set()).add(name)
+        # Each distinct keyword once, with every group it counts for
+        self._keywords: Tuple[Tuple[str, FrozenSet[str]], ...] = tuple(
+            (keyword, frozenset(names)) for keyword, names in groups_of.items()
+        )
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        """Names of the groups with at least one keyword in text (case-insensitive)"""
+        return self.scan_lowered(text.lower()) if text else frozenset()
+
+    def scan_lowered(self, lowered: str) -> FrozenSet[str]:
+        """scan() for a text that is already lower-cased (e.g. a NormalizedDocument's lower)"""
+        hits: Set[str] = set()
+        for keyword, names in self._keywords:
+            if not names <= hits and keyword in lowered:
+                hits |= names
+                if len(hits) == len(self.groups):
+                    break
+        return frozenset(hits)
+
+    def matches(self, text: str) -> bool:
+        """True if text contains any keyword of any group"""
+        return self.matches_lowered(text.lower()) if text else False
+
+    def matches_lowered(self, lowered: str) -> bool:
+        """matches() for a text that is already lower-cased"""
+        return any(keyword in lowered for keyword, _ in self._keywords)
+
+
+@lru_cache(maxsize=64)
+def compile_keywords(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """Shared matcher for a single keyword list (for callers passing ad hoc lists)"""
+    return KeywordMatcher({"keywords": keywords})
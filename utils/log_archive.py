@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Log Archive Module for AI Employee System
+Compressed cold storage for old audit log days. Each archived day is one
+/Logs/archive/YYYY-MM-DD.jsonl.gz (or .xz) stream of JSON lines with a small
+YYYY-MM-DD.jsonl.gz.idx sidecar describing what it holds, so readers can skip
+archives that cannot match a query and stream the rest without unpacking to disk.
+"""
+import os
+import re
+import gzip
+import json
+import lzma
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from utils.audit_index import entry_hour
+from utils.audit_rollups import empty_counts, add_entry
+
+ARCHIVE_DIR = "archive"
+ARCHIVE_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})\.jsonl\.(gz|xz)$")
+COMPRESSIONS = {
+    "gzip": ("gz", gzip.open),
+    "xz": ("xz", lzma.open),
+}
+OPENERS = {extension: opener for extension, opener in COMPRESSIONS.values()}
+
+
+def archive_name(day: str, compression: str = "gzip") -> str:
+    """File name of a day's archive"""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Compression must be one of {sorted(COMPRESSIONS)}, got {compression!r}")
+    return f"{day}.jsonl.{COMPRESSIONS[compression][0]}"
+
+
+def archive_index_path(archive_path: Path) -> Path:
+    """Sidecar index path for an archive"""
+    return archive_path.with_name(archive_path.name + ".idx")
+
+
+def write_archive(archive_path: Path, entries: Iterable[dict], sources: Iterable[str]) -> dict:
+    """Compress entries into archive_path and write its index; returns the index.
+
+    sources are the log files folded into the archive, recorded so a reader
+    can ignore any of them still present after an interrupted archive run.
+    """
+    extension = ARCHIVE_PATTERN.match(archive_path.name).group(2)
+    opener = OPENERS[extension]
+
+    counts = empty_counts()
+    hours = set()
+    first_timestamp = last_timestamp = None
+
+    tmp_path = archive_path.with_name(archive_path.name + ".tmp")
+    with opener(tmp_path, 'wt', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            add_entry(counts, entry)
+            hours.add(entry_hour(entry))
+            timestamp = entry.get("timestamp", "")
+            if first_timestamp is None:
+                first_timestamp = timestamp
+            last_timestamp = timestamp
+
+    # The index names the exact archive file it describes (replacing a file keeps its mtime)
+    stat = tmp_path.stat()
+    index = {
+        "archive_size": stat.st_size,
+        "archive_mtime_ns": stat.st_mtime_ns,
+        "entries": counts["total"],
+        "first_timestamp": first_timestamp,
+        "last_timestamp": last_timestamp,
+        "hours": sorted(hours),
+        "counts": counts,
+        "sources": sorted(set(sources)),
+    }
+
+    # The index goes first: an archive is only trusted once its index describes it. If a re-archive
+    # stops between the two replaces, the new index does not match the old archive still in place,
+    # so readers ignore it instead of skipping sources that archive does not hold
+    index_path = archive_index_path(archive_path)
+    tmp_index = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp_index, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(tmp_index, index_path)
+    os.replace(tmp_path, archive_path)
+
+    return index
+
+
+def read_archive_index(archive_path: Path) -> Optional[dict]:
+    """Load an archive's index, or None if it is missing, unreadable or describes another archive"""
+    try:
+        with open(archive_index_path(archive_path), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        stat = archive_path.stat()
+    except (OSError, ValueError):
+        return None
+    if "archive_size" in index and (index["archive_size"], index["archive_mtime_ns"]) != (stat.st_size,
+                                                                                         stat.st_mtime_ns):
+        return None
+    return index
+
+
+def read_archive(archive_path: Path) -> Iterator[dict]:
+    """Stream the entries of an archive, decompressing on the fly"""
+    opener = OPENERS[ARCHIVE_PATTERN.match(archive_path.name).group(2)]
+    with opener(archive_path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def archive_may_match(index: Optional[dict], action_types=None, statuses=None, hours=None,
+                      start: Optional[str] = None, end: Optional[str] = None) -> bool:
+    """Use an archive's index to rule it out of a query without opening it"""
+    if index is None:
+        return True
+    if not index["entries"]:
+        return False
+    counts = index["counts"]
+    if action_types is not None and not action_types & counts["action_types"].keys():
+        return False
+    if statuses is not None and not statuses & counts["statuses"].keys():
+        return False
+    if hours is not None and not hours & set(index["hours"]):
+        return False
+    if start and index["last_timestamp"] < start:
+        return False
+    if end and index["first_timestamp"] > end:
+        return False
+    return True
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Log Sink Module for AI Employee System
+Shared background writer that batches log lines and appends them to their files
+in group commits, so logging calls never open, write or close files themselves.
+"""
+import os
+import sys
+import time
+import queue
+import atexit
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# Group commit thresholds (overridable through the environment)
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_FLUSH_BYTES = 64 * 1024
+FSYNC_POLICIES = ("none", "batch")
+
+# Open append handles kept around between commits
+MAX_OPEN_FILES = 32
+OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+_FLUSH = object()
+_STOP = object()
+
+
+class LogSink:
+    """Background thread that batches log records per file and flushes them together"""
+
+    def __init__(self, flush_interval: Optional[float] = None, flush_bytes: Optional[int] = None,
+                 fsync: Optional[str] = None):
+        self.flush_interval = flush_interval if flush_interval is not None else float(
+            os.getenv("LOG_SINK_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL))
+        self.flush_bytes = flush_bytes if flush_bytes is not None else int(
+            os.getenv("LOG_SINK_FLUSH_BYTES", DEFAULT_FLUSH_BYTES))
+        self.fsync = (fsync or os.getenv("LOG_SINK_FSYNC", "none")).lower()
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"LOG_SINK_FSYNC must be one of {FSYNC_POLICIES}, got {self.fsync!r}")
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._pid = os.getpid()
+
+        # Expected file sizes (on disk + queued) for paths that writers rotate by size
+        self._sizes: Dict[str, int] = {}
+        self._size_lock = threading.Lock()
+
+        # Only touched by the writer thread
+        self._pending: Dict[str, List[bytes]] = {}
+        self._pending_bytes = 0
+        self._handles: Dict[str, int] = {}
+
+    def write(self, path: Union[str, Path], data: Union[str, bytes]) -> Optional[int]:
+        """Queue data to be appended to path.
+
+        Returns the byte offset the data will be written at if path is tracked
+        (see tracked_size), otherwise None.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        path = str(path)
+
+        if self._pid != os.getpid():
+            self._reset_after_fork()
+        if not self._closed:
+            self._ensure_started()
+
+        # Queue under the size lock so queue order matches the offsets handed out
+        with self._size_lock:
+            offset = self._sizes.get(path)
+            if offset is not None:
+                self._sizes[path] = offset + len(data)
+
+            if self._closed:
+                # Late writes during interpreter shutdown go straight to disk
+                self._append(path, [data])
+            else:
+                self._queue.put((path, data))
+
+        return offset
+
+    def tracked_size(self, path: Union[str, Path]) -> int:
+        """Size path will have once everything queued for it is written.
+
+        Call before the first write to a path; later writes through this sink are counted.
+        """
+        path = str(path)
+        with self._size_lock:
+            if path not in self._sizes:
+                try:
+                    self._sizes[path] = os.path.getsize(path)
+                except OSError:
+                    self._sizes[path] = 0
+            return self._sizes[path]
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until everything queued so far has been written"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait(timeout)
+
+    def close(self):
+        """Flush everything and stop the writer thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+
+        if thread is not None and thread.is_alive():
+            self._queue.put((_STOP, None))
+            thread.join()
+
+        # Records queued while the writer was stopping
+        while True:
+            try:
+                path, data = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(path, str):
+                self._append(path, [data])
+            elif path is _FLUSH:
+                data.set()
+
+    def _ensure_started(self):
+        """Start the writer thread on first use"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="LogSink", daemon=True)
+                self._thread.start()
+
+    def _reset_after_fork(self):
+        """Start over in a forked child: the parent's writer thread and queue are not ours"""
+        self._pid = os.getpid()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._sizes = {}
+        self._size_lock = threading.Lock()
+        self._pending = {}
+        self._pending_bytes = 0
+        self._close_handles()
+
+    def _run(self):
+        """Writer loop: collect records until a size or time threshold, then commit"""
+        first_pending = None
+
+        while True:
+            timeout = None
+            if first_pending is not None:
+                timeout = max(0.0, first_pending + self.flush_interval - time.monotonic())
+
+            try:
+                path, data = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._commit()
+                first_pending = None
+                continue
+
+            if path is _FLUSH:
+                self._commit()
+                first_pending = None
+                data.set()
+                continue
+
+            if path is _STOP:
+                self._commit()
+                self._close_handles()
+                return
+
+            self._pending.setdefault(path, []).append(data)
+            self._pending_bytes += len(data)
+            if first_pending is None:
+                first_pending = time.monotonic()
+
+            if self._pending_bytes >= self.flush_bytes:
+                self._commit()
+                first_pending = None
+
+    def _commit(self):
+        """Append every pending batch with one write per file"""
+        pending, self._pending = self._pending, {}
+        self._pending_bytes = 0
+
+        for path, chunks in pending.items():
+            try:
+                self._append(path, chunks, use_cache=True)
+            except OSError as e:
+                print(f"Log sink failed to write {path}: {e}", file=sys.stderr)
+
+    def _append(self, path: str, chunks: List[bytes], use_cache: bool = False):
+        """Write chunks to the end of path"""
+        fd = self._open(path) if use_cache else os.open(path, OPEN_FLAGS, 0o644)
+        try:
+            data = b"".join(chunks)
+            while data:
+                written = os.write(fd, data)
+                data = data[written:]
+            if self.fsync == "batch":
+                os.fsync(fd)
+        except OSError:
+            # The file may have been moved or deleted; reopen on the next commit
+            if use_cache:
+                self._handles.pop(path, None)
+                os.close(fd)
+            raise
+        finally:
+            if not use_cache:
+                os.close(fd)
+
+    def _open(self, path: str) -> int:
+        """Get a cached append handle for path"""
+        fd = self._handles.pop(path, None)
+        if fd is None:
+            if len(self._handles) >= MAX_OPEN_FILES:
+                # Close the least recently used handle
+                oldest = next(iter(self._handles))
+                os.close(self._handles.pop(oldest))
+            fd = os.open(path, OPEN_FLAGS, 0o644)
+        # Re-insert to keep the dict in least-recently-used order
+        self._handles[path] = fd
+        return fd
+
+    def _close_handles(self):
+        """Close all cached handles"""
+        for fd in self._handles.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._handles.clear()
+
+
+_shared_sink = None
+_shared_lock = threading.Lock()
+
+
+def get_log_sink() -> LogSink:
+    """Get the process-wide log sink, flushed automatically at exit"""
+    global _shared_sink
+    if _shared_sink is None:
+        with _shared_lock:
+            if _shared_sink is None:
+                _shared_sink = LogSink()
+                atexit.register(_shared_sink.close)
+    return _shared_sink
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Memory Tracker Module for AI Employee System
+Opt-in tracemalloc instrumentation for processing cycles. After each cycle a
+snapshot is diffed against the previous cycle's, and the current and peak
+traced memory plus the top growing allocation sites are appended as one JSON
+line to logs/memory_growth.jsonl.
+"""
+import os
+import sys
+import json
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.log_sink import get_log_sink
+from utils.metrics_server import get_metrics_registry
+
+DEFAULT_MEMORY_FILE = "logs/memory_growth.jsonl"
+DEFAULT_TOP = 10
+DEFAULT_TRACE_FRAMES = 1
+
+# Allocations made by the instrumentation itself are not interesting
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryTracker:
+    """Diffs tracemalloc snapshots between cycles when enabled; a no-op otherwise"""
+
+    def __init__(self, enabled: bool = False, memory_path=None, top: Optional[int] = None,
+                 frames: Optional[int] = None, sink=None):
+        self.enabled = enabled
+        self.memory_path = Path(memory_path or os.getenv("MEMORY_GROWTH_FILE", DEFAULT_MEMORY_FILE))
+        self.top = top or int(os.getenv("MEMORY_TOP", DEFAULT_TOP))
+        self.frames = frames or int(os.getenv("MEMORY_TRACE_FRAMES", DEFAULT_TRACE_FRAMES))
+        self.sink = sink or get_log_sink()
+        self.last_record: Optional[dict] = None
+        self._previous = None
+        self._previous_current = 0
+
+    def start(self):
+        """Start tracing allocations (once per process)"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._register_gauge()
+
+    @contextmanager
+    def track(self, name: str = "cycle"):
+        """Measure the block and record its memory growth against the previous cycle"""
+        if not self.enabled:
+            yield
+            return
+
+        self.start()
+        started_at = datetime.now().isoformat()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            self.last_record = self._record(name, started_at)
+
+    def _record(self, name: str, started_at: str) -> dict:
+        """Snapshot, diff against the previous cycle and write the growth record"""
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        key_type = "traceback" if self.frames > 1 else "lineno"
+
+        if self._previous is not None:
+            stats = snapshot.compare_to(self._previous, key_type)
+            top = [
+                {
+                    "location": self._location(stat.traceback),
+                    "size_diff": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                    "size": stat.size,
+                }
+                for stat in stats[:self.top] if stat.size_diff
+            ]
+        else:
+            # First cycle: report the largest holders instead of growth
+            top = [
+                {"location": self._location(stat.traceback), "size_diff": stat.size,
+                 "count_diff": stat.count, "size": stat.size}
+                for stat in snapshot.statistics(key_type)[:self.top]
+            ]
+
+        record = {
+            "cycle": name,
+            "started_at": started_at,
+            "pid": os.getpid(),
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "growth_bytes": current - self._previous_current if self._previous is not None else None,
+            "top": top,
+        }
+        self._previous = snapshot
+        self._previous_current = current
+
+        self.memory_path.parent.mkdir(parents=True, exist_ok=True)
+        self.sink.write(self.memory_path, json.dumps(record) + "\n")
+        self._print_summary(record)
+        return record
+
+    def _location(self, traceback: tracemalloc.Traceback) -> str:
+        """file:line of an allocation site, innermost frame first"""
+        return " <- ".join(f"{Path(frame.filename).name}:{frame.lineno}" for frame in reversed(traceback))
+
+    def _print_summary(self, record: dict):
+        """Print the headline numbers and the biggest growers"""
+        growth = record["growth_bytes"]
+        growth_text = f", growth {growth / 1024:+.1f} KiB" if growth is not None else ""
+        print(f"Memory: current {record['current_bytes'] / 1024:.1f} KiB, "
+              f"peak {record['peak_bytes'] / 1024:.1f} KiB{growth_text}")
+        for stat in record["top"][:3]:
+            print(f"  {stat['size_diff'] / 1024:+.1f} KiB ({stat['count_diff']:+d} blocks) {stat['location']}")
+
+    def _register_gauge(self):
+        """Expose traced memory on the metrics endpoint"""
+        def traced_memory():
+            if not tracemalloc.is_tracing():
+                return {}
+            current, peak = tracemalloc.get_traced_memory()
+            return {(("kind", "current"),): current, (("kind", "peak"),): peak}
+
+        get_metrics_registry().gauge("ai_employee_traced_memory_bytes", traced_memory)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Metrics Server Module for AI Employee System
+Process-wide counters, gauges and histograms served in the Prometheus text
+format from an opt-in local HTTP endpoint (stdlib only). Enabled by setting
+METRICS_PORT or passing --metrics-port in continuous mode.
+"""
+import os
+import sys
+import math
+import time
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Every metric the system exports: name -> (type, help)
+METRICS = {
+    "ai_employee_queue_depth": ("gauge", "Files waiting in each vault queue directory"),
+    "ai_employee_cycle_duration_seconds": ("histogram", "Wall time of a full processing cycle"),
+    "ai_employee_stage_duration_seconds": ("histogram", "Wall time of each cycle stage"),
+    "ai_employee_llm_request_duration_seconds": ("histogram", "Latency of LLM chat completion requests"),
+    "ai_employee_smtp_send_duration_seconds": ("histogram", "Latency of sending an email over SMTP"),
+    "ai_employee_imap_check_duration_seconds": ("histogram", "Latency of checking the mailbox over IMAP"),
+    "ai_employee_errors_total": ("counter", "Failed calls by component"),
+    "ai_employee_logged_errors_total": ("counter", "Errors written to the audit log by error type"),
+    "ai_employee_traced_memory_bytes": ("gauge", "Memory traced by tracemalloc (with --memory)"),
+    "ai_employee_duplicate_tasks_total": ("counter", "Incoming items rejected as duplicates of an existing task"),
+    "ai_employee_vault_writes_total": ("counter", "Vault file writes by result (written, or unchanged and skipped)"),
+}
+
+# Vault directories reported as queue depths
+QUEUE_DIRS = {
+    "needs_action": "Needs_Action",
+    "plans": "Plans",
+    "pending_approval": "Pending_Approval",
+    "approved": "Approved",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Optional[Dict[str, str]]) -> Labels:
+    """Canonical, hashable form of a label set"""
+    return tuple(sorted((labels or {}).items()))
+
+
+def _escape(value) -> str:
+    """Escape a label value for the text format"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render labels as {name="value",...}"""
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value"""
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Thread-safe store of the metric series exported by this process"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        # (name, labels) -> [bucket counts..., sum, count]
+        self._histograms: Dict[Tuple[str, Labels], list] = {}
+        # name -> callback returning {labels dict as tuple: value}, evaluated at scrape time
+        self._gauges: Dict[str, Callable[[], Dict[Labels, float]]] = {}
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, amount: float = 1):
+        """Increase a counter"""
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """Record one histogram observation"""
+        key = (name, _labels(labels))
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def gauge(self, name: str, callback: Callable[[], Dict[Labels, float]]):
+        """Register a gauge computed on every scrape"""
+        with self._lock:
+            self._gauges[name] = callback
+
+    @contextmanager
+    def timed(self, name: str, labels: Optional[Dict[str, str]] = None, error_component: Optional[str] = None):
+        """Observe how long the block takes; count an error for error_component if it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            if error_component:
+                self.inc("ai_employee_errors_total", {"component": error_component})
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - started, labels)
+
+    def render(self) -> str:
+        """All series in the Prometheus text exposition format"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(series) for key, series in self._histograms.items()}
+            gauges = dict(self._gauges)
+
+        samples: Dict[str, list] = {}
+        for name, callback in gauges.items():
+            try:
+                values = callback()
+            except Exception:
+                # A broken gauge must not take the whole endpoint down
+                continue
+            for labels, value in sorted(values.items()):
+                samples.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for (name, labels), value in sorted(counters.items()):
+            samples.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for (name, labels), series in sorted(histograms.items()):
+            lines = samples.setdefault(name, [])
+            for bound, count in zip(self.buckets + (math.inf,), series[:-2] + [series[-1]]):
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(series[-2])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {series[-1]}")
+
+        output = []
+        for name in sorted(samples):
+            kind, help_text = METRICS.get(name, ("untyped", name))
+            output.append(f"# HELP {name} {help_text}")
+            output.append(f"# TYPE {name} {kind}")
+            output.extend(samples[name])
+        return "\n".join(output) + "\n"
+
+
+def register_queue_depths(vault_path, registry: Optional["MetricsRegistry"] = None):
+    """Report how many files wait in each vault queue directory"""
+    registry = registry or get_metrics_registry()
+    vault_path = Path(vault_path)
+
+    def queue_depths() -> Dict[Labels, float]:
+        depths = {}
+        for queue_name, directory in QUEUE_DIRS.items():
+            count = 0
+            try:
+                with os.scandir(vault_path / directory) as entries:
+                    for entry in entries:
+                        if not entry.name.startswith(".") and entry.is_file():
+                            count += 1
+            except OSError:
+                pass
+            depths[(("queue", queue_name),)] = count
+        return depths
+
+    registry.gauge("ai_employee_queue_depth", queue_depths)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics"""
+
+    registry: "MetricsRegistry" = None
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood stdout
+        pass
+
+
+class MetricsServer:
+    """Local HTTP endpoint for a metrics registry, served from a daemon thread"""
+
+    def __init__(self, registry: "MetricsRegistry", port: int, host: str = DEFAULT_HOST):
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.host, self.port = self.httpd.server_address[:2]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="MetricsServer", daemon=True)
+
+    def start(self):
+        """Start serving"""
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
+
+
+def start_metrics_server(port: Optional[int] = None, host: Optional[str] = None) -> Optional[MetricsServer]:
+    """Serve the process-wide registry if a port is configured; returns None when disabled"""
+    if port is None:
+        port = int(os.getenv("METRICS_PORT", "0") or 0)
+    if not port:
+        return None
+    host = host or os.getenv("METRICS_HOST", DEFAULT_HOST)
+
+    try:
+        server = MetricsServer(get_metrics_registry(), port, host).start()
+    except OSError as e:
+        print(f"Metrics endpoint disabled, could not listen on {host}:{port}: {e}", file=sys.stderr)
+        return None
+
+    print(f"Serving metrics on http://{server.host}:{server.port}/metrics")
+    return server
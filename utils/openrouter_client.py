@@ -1,8 +1,15 @@
 import os
+import sys
 import openai
 from dotenv import load_dotenv
+from pathlib import Path
 from typing import Optional, Dict, Any
 
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.metrics_server import get_metrics_registry
+
 load_dotenv()
 
 class OpenRouterClient:
@@ -51,7 +58,9 @@ class OpenRouterClient:
                 **kwargs
             }
 
-            response = openai.chat.completions.create(**params)
+            with get_metrics_registry().timed("ai_employee_llm_request_duration_seconds",
+                                              {"model": self.model}, error_component="llm"):
+                response = openai.chat.completions.create(**params)
             return response.choices[0].message.content
         except Exception as e:
             print(f"Error making OpenRouter request: {e}")
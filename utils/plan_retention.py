@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Plan Retention Module for AI Employee System
+Generated reports (strategic plans, subscription monitors, bottleneck reports)
+get a new timestamped file in vault/Plans every cycle. Retention rules keep
+the latest few of each kind plus the latest one per day for a window of days,
+and move the rest to vault/Archive/Plans/YYYY/MM (or delete them), so every
+scan of Plans only pays for the copies still worth reading.
+"""
+import os
+import re
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.vault_index import get_vault_index
+
+PLANS_FOLDER = "Plans"
+ARCHIVE_FOLDER = "Archive/Plans"
+RETENTION_ACTIONS = ("archive", "delete")
+
+# Generated report names end in _YYYYMMDD_HHMMSS
+NAME_TIMESTAMP = re.compile(r"_(\d{8}_\d{6})\.[^.]+$")
+
+
+class RetentionRule(NamedTuple):
+    """Which generated plans to keep, and what to do with the rest"""
+    pattern: str
+    keep_latest: int
+    keep_days: int
+    action: str = "archive"
+
+
+class RetentionReport(NamedTuple):
+    """Files and bytes a retention pass took out of Plans"""
+    archived: int
+    deleted: int
+    bytes_reclaimed: int
+
+    @property
+    def files_reclaimed(self) -> int:
+        return self.archived + self.deleted
+
+
+def default_rules() -> List[RetentionRule]:
+    """Rules for the reports the agents regenerate every cycle"""
+    keep_latest = int(os.getenv("PLAN_RETENTION_KEEP_LATEST", 3))
+    keep_days = int(os.getenv("PLAN_RETENTION_KEEP_DAYS", 14))
+    return [
+        RetentionRule("strategic_plan_*.md", keep_latest, keep_days),
+        RetentionRule("subscription_monitor_*.md", keep_latest, keep_days),
+        RetentionRule("bottleneck_report_*.md", keep_latest, keep_days),
+    ]
+
+
+def generated_at(name: str, mtime: float) -> datetime:
+    """When a generated plan was written: from its name, else its mtime"""
+    match = NAME_TIMESTAMP.search(name)
+    if match:
+        try:
+            return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(mtime)
+
+
+def expired(entries, rule: RetentionRule, today: Optional[date] = None):
+    """Entries a rule does not keep: all but the latest keep_latest and the latest of each recent day"""
+    today = today or date.today()
+    first_kept_day = today - timedelta(days=rule.keep_days - 1)
+    newest_first = sorted(entries, key=lambda entry: generated_at(entry.name, entry.mtime), reverse=True)
+
+    kept_days = set()
+    expired_entries = []
+    for position, entry in enumerate(newest_first):
+        day = generated_at(entry.name, entry.mtime).date()
+        if position < rule.keep_latest:
+            kept_days.add(day)
+        elif day >= first_kept_day and day not in kept_days:
+            kept_days.add(day)
+        else:
+            expired_entries.append(entry)
+    return expired_entries
+
+
+def apply_retention(vault_path="./vault", rules: Optional[List[RetentionRule]] = None,
+                    dry_run: bool = False, today: Optional[date] = None) -> RetentionReport:
+    """Archive or delete the generated plans no rule keeps"""
+    vault_path = Path(vault_path)
+    index = get_vault_index(vault_path)
+    archived = deleted = reclaimed = 0
+
+    for rule in rules if rules is not None else default_rules():
+        if rule.action not in RETENTION_ACTIONS:
+            raise ValueError(f"Retention action must be one of {RETENTION_ACTIONS}, got {rule.action!r}")
+
+        for entry in expired(index.files(PLANS_FOLDER, rule.pattern), rule, today):
+            if not dry_run:
+                if rule.action == "delete":
+                    index.remove(entry.path)
+                else:
+                    when = generated_at(entry.name, entry.mtime)
+                    destination = vault_path / ARCHIVE_FOLDER / f"{when:%Y/%m}" / entry.name
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    index.move(entry.path, destination)
+            if rule.action == "delete":
+                deleted += 1
+            else:
+                archived += 1
+            reclaimed += entry.size
+
+    return RetentionReport(archived, deleted, reclaimed)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Plan Retention")
+    parser.add_argument("--vault", default="./vault",
+                       help="Path to vault directory")
+    parser.add_argument("--dry-run", action="store_true",
+                       help="Only report what would be archived or deleted")
+
+    args = parser.parse_args()
+
+    report = apply_retention(args.vault, dry_run=args.dry_run)
+    print(f"{'Would reclaim' if args.dry_run else 'Reclaimed'} {report.files_reclaimed} plans "
+          f"({report.archived} archived, {report.deleted} deleted, {report.bytes_reclaimed} bytes) from Plans")
+
+if __name__ == "__main__":
+    main()
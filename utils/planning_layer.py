@@ -4,11 +4,39 @@ Planning Layer Module for AI Employee System
 Generates structured plan files for tasks in Needs_Action directory.
 """
 import os
+import sys
 import json
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, FrozenSet, Optional
+
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.log_sink import get_log_sink
+from utils.vault_index import get_vault_index
+from utils.task_events import get_task_events
+from utils.keyword_matcher import KeywordMatcher
+from utils.document_cache import normalize
+from utils.approval_rules import ApprovalDecision, get_approval_rules
+
+# Keyword groups behind tool selection and risk assessment, matched in one pass per field
+# (the approval check itself is the task_planning policy in approval_rules.json)
+TASK_KEYWORDS = KeywordMatcher({
+    "email_tools": ['email', 'communication'],
+    "analysis_tools": ['data', 'analysis'],
+    "reporting_tools": ['report'],
+    "sensitive_data": ['password', 'secret', 'confidential', 'private', 'sensitive'],
+    "financial_data": ['financial', 'payment', 'salary', 'bank'],
+    "deletion": ['delete', 'remove', 'terminate', 'destroy'],
+    "access_control": ['access', 'permission', 'authorization'],
+    "customer_impact": ['customer', 'client', 'revenue', 'contract'],
+    "urgency": ['urgent', 'immediate', 'critical', 'priority'],
+})
+
+# Task fields the keyword groups are matched against
+KEYWORD_FIELDS = ('title', 'description', 'content_preview')
 
 class PlanningLayer:
     """Planning layer that generates structured plan files for tasks"""
@@ -18,28 +46,35 @@ class PlanningLayer:
         self.needs_action_path = self.vault_path / "Needs_Action"
         self.plans_path = self.vault_path / "Plans"
         self.logs_path = Path("logs")
+        self.vault_index = get_vault_index(vault_path)
+        self.task_events = get_task_events(vault_path)
+        self.approval_rules = get_approval_rules()
 
         # Ensure directories exist
         self.plans_path.mkdir(exist_ok=True)
         self.logs_path.mkdir(exist_ok=True)
 
     def process_needs_action_tasks(self):
-        """Process all tasks in Needs_Action directory and generate plans"""
-        task_files = list(self.needs_action_path.glob("*.json"))
-
-        if not task_files:
-            print(f"No tasks found in {self.needs_action_path}")
-            return
-
-        for task_file in task_files:
-            self.process_single_task(task_file)
-
-    def process_single_task(self, task_file: Path):
-        """Process a single task file and generate a plan"""
+        """Process tasks added or changed in Needs_Action since the last pass and generate plans"""
+        # Marking a task as processed rewrites it; that write is part of this pass, not a new change
+        with self.vault_index.changes("Needs_Action", "planning_layer", "*.json") as changes:
+            if not changes.pending:
+                print(f"No new tasks found in {self.needs_action_path}")
+                return
+
+            for task_file in changes.pending:
+                entry = self.vault_index.get(task_file)
+                if entry is not None and not self.process_single_task(entry.path, entry.body):
+                    # Seen again on the next pass
+                    changes.retry(entry.path)
+
+    def process_single_task(self, task_file: Path, content: Optional[str] = None) -> bool:
+        """Process a single task file and generate a plan; returns False if it failed"""
         try:
-            # Read the task file
-            with open(task_file, 'r', encoding='utf-8') as f:
-                task_data = json.load(f)
+            # Read the task file, unless the index already has its text
+            if content is None:
+                content = task_file.read_text(encoding='utf-8')
+            task_data = json.loads(content)
 
             # Generate plan based on task data
             plan_data = self.generate_plan(task_data)
@@ -49,31 +84,36 @@ class PlanningLayer:
             plan_file_path = self.plans_path / f"{plan_id}.md"
 
             # Write the plan to file
-            with open(plan_file_path, 'w', encoding='utf-8') as f:
-                f.write(plan_data)
+            self.vault_index.write_text(plan_file_path, plan_data)
+            self.task_events.record(task_data['id'], "planned", plan_file_path)
 
             # Log the event
             self.log_event(f"Generated plan for task: {task_file.name} -> {plan_file_path.name}")
 
             # Mark task as processed by moving it to a temporary processed directory
             # or update its status in the JSON file
-            self.mark_task_as_processed(task_file, plan_id)
+            self.mark_task_as_processed(task_file, plan_id, task_data)
+            return True
 
         except Exception as e:
             error_msg = f"Error processing task file {task_file}: {str(e)}"
             print(error_msg)
             self.log_event(error_msg)
+            return False
 
     def generate_plan(self, task_data: Dict[str, Any]) -> str:
         """Generate a structured plan based on the task data"""
+        # Scan each field once; every check below reads these hits
+        hits = self.keyword_hits(task_data)
+
         # Analyze the task to determine if it requires approval
         requires_approval = self.determine_approval_requirement(task_data)
 
         # Determine tools required based on task type
-        tools_required = self.determine_tools_required(task_data)
+        tools_required = self.determine_tools_required(task_data, hits)
 
         # Perform risk assessment
-        risk_assessment = self.perform_risk_assessment(task_data)
+        risk_assessment = self.perform_risk_assessment(task_data, hits)
 
         # Create the plan markdown content
         plan_content = f"""# Task Plan: {task_data['title']}
@@ -114,39 +154,27 @@ class PlanningLayer:
 
 ## Notes
 - Generated from file: {task_data.get('source_file', 'N/A')}
-- Content preview: {task_data.get('content_preview', 'N/A')[:200]}...
+- Content preview: {normalize(task_data.get('content_preview', 'N/A')).preview(200)}...
 """
 
         return plan_content
 
-    def determine_approval_requirement(self, task_data: Dict[str, Any]) -> bool:
-        """Determine if the task requires approval based on content and type"""
-        # Default to requiring approval for safety
-        requires_approval = True
-
-        # Analyze title and content to determine approval requirement
-        title = task_data.get('title', '').lower()
-        description = task_data.get('description', '').lower()
-        content = task_data.get('content_preview', '').lower()
-
-        # If it's a simple informational task, it might not require approval
-        if any(keyword in title or keyword in description or keyword in content
-               for keyword in ['read', 'view', 'review', 'information', 'note']):
-            requires_approval = False
-
-        # If it involves financial or sensitive data, require approval
-        if any(keyword in title or keyword in description or keyword in content
-               for keyword in ['finance', 'financial', 'money', 'payment', 'salary', 'bank', 'sensitive']):
-            requires_approval = True
+    def keyword_hits(self, task_data: Dict[str, Any]) -> Dict[str, FrozenSet[str]]:
+        """Keyword groups found in each text field of the task, one scan per field"""
+        return {field: normalize(task_data.get(field, '')).scan(TASK_KEYWORDS) for field in KEYWORD_FIELDS}
 
-        # If the task has high priority, require approval
-        if task_data.get('priority', 'medium').lower() == 'high':
-            requires_approval = True
+    def approval_decision(self, task_data: Dict[str, Any]) -> ApprovalDecision:
+        """Decision of the task_planning approval rules, with the id of the rule that made it"""
+        return self.approval_rules.decide("task_planning", task_data)
 
-        return requires_approval
+    def determine_approval_requirement(self, task_data: Dict[str, Any]) -> bool:
+        """Determine if the task requires approval based on content and type"""
+        return self.approval_decision(task_data).requires_approval
 
-    def determine_tools_required(self, task_data: Dict[str, Any]) -> str:
+    def determine_tools_required(self, task_data: Dict[str, Any],
+                                 hits: Optional[Dict[str, FrozenSet[str]]] = None) -> str:
         """Determine which tools are required for the task"""
+        hits = hits or self.keyword_hits(task_data)
         tools = []
 
         # Determine tools based on file type
@@ -159,12 +187,12 @@ class PlanningLayer:
             tools.append("- Document/image processing tools")
 
         # Determine tools based on content
-        content = task_data.get('content_preview', '').lower()
-        if 'email' in content or 'communication' in content:
+        content = hits['content_preview']
+        if "email_tools" in content:
             tools.append("- Email communication tools")
-        if 'data' in content or 'analysis' in content:
+        if "analysis_tools" in content:
             tools.append("- Data analysis tools")
-        if 'report' in content:
+        if "reporting_tools" in content:
             tools.append("- Reporting tools")
 
         # Add default tools
@@ -175,57 +203,63 @@ class PlanningLayer:
 
         return "\n".join(tools)
 
-    def perform_risk_assessment(self, task_data: Dict[str, Any]) -> str:
+    def perform_risk_assessment(self, task_data: Dict[str, Any],
+                                hits: Optional[Dict[str, FrozenSet[str]]] = None) -> str:
         """Perform risk assessment for the task"""
-        risk_assessment = f"""- **Data Sensitivity:** {self.assess_data_sensitivity(task_data)}
-- **Security Impact:** {self.assess_security_impact(task_data)}
-- **Business Impact:** {self.assess_business_impact(task_data)}
-- **Approval Level Required:** {self.assess_approval_level(task_data)}
+        hits = hits or self.keyword_hits(task_data)
+        risk_assessment = f"""- **Data Sensitivity:** {self.assess_data_sensitivity(task_data, hits)}
+- **Security Impact:** {self.assess_security_impact(task_data, hits)}
+- **Business Impact:** {self.assess_business_impact(task_data, hits)}
+- **Approval Level Required:** {self.assess_approval_level(task_data, hits)}
 """
         return risk_assessment
 
-    def assess_data_sensitivity(self, task_data: Dict[str, Any]) -> str:
+    def assess_data_sensitivity(self, task_data: Dict[str, Any],
+                                hits: Optional[Dict[str, FrozenSet[str]]] = None) -> str:
         """Assess data sensitivity level"""
-        content = task_data.get('content_preview', '').lower()
-        if any(keyword in content for keyword in ['password', 'secret', 'confidential', 'private', 'sensitive']):
+        content = (hits or self.keyword_hits(task_data))['content_preview']
+        if "sensitive_data" in content:
             return "High - Contains sensitive data"
-        elif any(keyword in content for keyword in ['financial', 'payment', 'salary', 'bank']):
+        elif "financial_data" in content:
             return "Medium-High - Contains financial data"
         else:
             return "Low - Standard business information"
 
-    def assess_security_impact(self, task_data: Dict[str, Any]) -> str:
+    def assess_security_impact(self, task_data: Dict[str, Any],
+                               hits: Optional[Dict[str, FrozenSet[str]]] = None) -> str:
         """Assess security impact level"""
-        content = task_data.get('content_preview', '').lower()
-        title = task_data.get('title', '').lower()
+        hits = hits or self.keyword_hits(task_data)
+        content_or_title = hits['content_preview'] | hits['title']
 
-        if any(keyword in content or keyword in title for keyword in ['delete', 'remove', 'terminate', 'destroy']):
+        if "deletion" in content_or_title:
             return "High - Involves deletion of data/processes"
-        elif any(keyword in content or keyword in title for keyword in ['access', 'permission', 'authorization']):
+        elif "access_control" in content_or_title:
             return "Medium - Involves access controls"
         else:
             return "Low - Standard operations"
 
-    def assess_business_impact(self, task_data: Dict[str, Any]) -> str:
+    def assess_business_impact(self, task_data: Dict[str, Any],
+                               hits: Optional[Dict[str, FrozenSet[str]]] = None) -> str:
         """Assess business impact level"""
-        content = task_data.get('content_preview', '').lower()
+        content = (hits or self.keyword_hits(task_data))['content_preview']
 
-        if any(keyword in content for keyword in ['customer', 'client', 'revenue', 'contract']):
+        if "customer_impact" in content:
             return "Medium-High - Affects customer/business relationships"
-        elif any(keyword in content for keyword in ['urgent', 'immediate', 'critical', 'priority']):
+        elif "urgency" in content:
             return "High - Critical business operation"
         else:
             return "Low-Medium - Standard business operation"
 
-    def assess_approval_level(self, task_data: Dict[str, Any]) -> str:
+    def assess_approval_level(self, task_data: Dict[str, Any],
+                              hits: Optional[Dict[str, FrozenSet[str]]] = None) -> str:
         """Assess approval level required"""
         # Based on risk level, determine approval level
-        requires_approval = self.determine_approval_requirement(task_data)
+        decision = self.approval_decision(task_data)
 
-        if requires_approval:
-            return "Manager or higher approval required"
+        if decision.requires_approval:
+            return f"Manager or higher approval required (rule: {decision.rule_id})"
         else:
-            return "Direct execution allowed after review"
+            return f"Direct execution allowed after review (rule: {decision.rule_id})"
 
     def generate_objective(self, task_data: Dict[str, Any]) -> str:
         """Generate objective based on task data"""
@@ -236,14 +270,15 @@ Ensure all specified requirements are met and results are documented appropriate
         """Generate context based on task data"""
         return f"""This task originated from an incoming file: {task_data.get('source_file', 'N/A')}.
 The file was detected by the file watcher and processed into a structured task.
-The original content contains: {task_data.get('content_preview', 'N/A')[:200]}..."""
+The original content contains: {normalize(task_data.get('content_preview', 'N/A')).preview(200)}..."""
 
-    def mark_task_as_processed(self, task_file: Path, plan_id: str):
+    def mark_task_as_processed(self, task_file: Path, plan_id: str, task_data: Optional[Dict[str, Any]] = None):
         """Mark the task as processed by updating its status"""
         try:
             # Read the existing task data
-            with open(task_file, 'r', encoding='utf-8') as f:
-                task_data = json.load(f)
+            if task_data is None:
+                with open(task_file, 'r', encoding='utf-8') as f:
+                    task_data = json.load(f)
 
             # Update the status and add plan reference
             task_data['status'] = 'processed'
@@ -251,8 +286,7 @@ The original content contains: {task_data.get('content_preview', 'N/A')[:200]}..
             task_data['processed_at'] = datetime.now().isoformat()
 
             # Write back the updated data
-            with open(task_file, 'w', encoding='utf-8') as f:
-                json.dump(task_data, f, indent=2)
+            self.vault_index.write_text(task_file, json.dumps(task_data, indent=2))
 
         except Exception as e:
             print(f"Error marking task as processed: {e}")
@@ -263,8 +297,7 @@ The original content contains: {task_data.get('content_preview', 'N/A')[:200]}..
         log_file = self.logs_path / "system.log"
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        with open(log_file, 'a', encoding='utf-8') as f:
-            f.write(f"[{timestamp}] Planning Layer: {message}\n")
+        get_log_sink().write(log_file, f"[{timestamp}] Planning Layer: {message}\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Task Classifier Module for AI Employee System
+A multinomial naive Bayes model over hashed bag-of-words features, trained
+offline on the labelled history in vault/Done and vault/Plans (the
+"classification:" or "type:" frontmatter field). A cycle's whole batch of
+tasks is classified in one vectorized NumPy call; tasks the model is not
+confident about fall back to the keyword rules of classify_text().
+
+Train with "python utils/task_classifier.py train" (writes
+vault/.task_classifier.npz) and compare against the keyword rules with
+"python utils/task_classifier.py benchmark". NumPy is optional: without it,
+or without a trained model, classification uses the keyword rules only.
+"""
+import io
+import os
+import re
+import sys
+import time
+import zlib
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # keyword rules only
+    np = None
+
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.vault_index import CLASSIFICATION_RULES, classify_text, get_vault_index
+from utils.vault_writer import get_vault_writer
+
+MODEL_FILE = ".task_classifier.npz"
+MODEL_VERSION = 1
+TRAINING_FOLDERS = ("Done", "Plans")
+
+CLASSES = tuple(classification for classification, _ in CLASSIFICATION_RULES) + ("GENERAL",)
+
+# "type:" values of hand-written and agent-written tasks, by classification
+TYPE_LABELS = {
+    "communication": "COMMUNICATION",
+    "email": "COMMUNICATION",
+    "finance": "FINANCE",
+    "financial": "FINANCE",
+    "file": "FILE_MANAGEMENT",
+    "document": "FILE_MANAGEMENT",
+    "project": "PROJECT_MANAGEMENT",
+    "operations": "PROJECT_MANAGEMENT",
+}
+
+# Hash buckets for unigram and bigram features (a power of two)
+DEFAULT_DIM = 1 << 15
+TOKEN = re.compile(r"[a-z0-9]+")
+
+
+class Example(NamedTuple):
+    """A labelled task text from the vault history"""
+    path: Path
+    text: str
+    label: str
+
+
+class BenchmarkReport(NamedTuple):
+    """Held-out accuracy and throughput of the model and of the keyword rules"""
+    examples: int
+    model_accuracy: float
+    keyword_accuracy: float
+    model_per_second: float
+    keyword_per_second: float
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("The task classifier needs NumPy (pip install numpy)")
+
+
+def strip_frontmatter(text: str) -> str:
+    """Body of a Markdown file without its "---" header block"""
+    if text.startswith("---"):
+        end = text.find("\n---", 3)
+        if end != -1:
+            return text[end + 4:]
+    return text
+
+
+def label_for(header: Dict[str, str]) -> Optional[str]:
+    """Classification recorded in a file's frontmatter, if any"""
+    classification = str(header.get("classification", "")).upper()
+    if classification in CLASSES:
+        return classification
+    label = TYPE_LABELS.get(str(header.get("type", "")).lower())
+    if label:
+        return label
+    if header.get("communication_type"):
+        return "COMMUNICATION"
+    return None
+
+
+def training_examples(vault_path="./vault") -> List[Example]:
+    """Labelled texts in Done and Plans, one per distinct content"""
+    index = get_vault_index(vault_path)
+    examples = []
+    seen = set()
+    for folder in TRAINING_FOLDERS:
+        for entry in index.files(folder, "*.md"):
+            label = label_for(entry.header)
+            if label is None or entry.content_hash in seen:
+                continue
+            seen.add(entry.content_hash)
+            # Plans echo their classification in the body; drop it so the model learns from the task text
+            text = strip_frontmatter(entry.body).replace(label, " ")
+            examples.append(Example(entry.path, text, label))
+    return examples
+
+
+class _Buckets(dict):
+    """Feature -> hash cache; crc32 rather than hash(), which is salted per process"""
+
+    def __missing__(self, feature: str) -> int:
+        bucket = self[feature] = zlib.crc32(feature.encode("utf-8"))
+        return bucket
+
+
+_buckets = _Buckets()
+
+
+def hashed_features(texts: Sequence[str], dim: int = DEFAULT_DIM) -> Tuple["np.ndarray", "np.ndarray"]:
+    """(document, bucket) pairs of every unigram and bigram of a batch, as two index arrays"""
+    _require_numpy()
+    lookup = _buckets.__getitem__
+    buckets: List[int] = []
+    lengths: List[int] = []
+    for text in texts:
+        tokens = TOKEN.findall(text.lower())
+        buckets.extend(map(lookup, tokens))
+        buckets.extend(map(lookup, map(" ".join, zip(tokens, tokens[1:]))))
+        lengths.append(max(2 * len(tokens) - 1, 0))
+    doc_ids = np.repeat(np.arange(len(texts), dtype=np.intp), lengths)
+    return doc_ids, np.asarray(buckets, dtype=np.intp) & (dim - 1)
+
+
+class TaskClassifier:
+    """Multinomial naive Bayes over hashed bag-of-words features"""
+
+    def __init__(self, classes: Sequence[str], class_log_prior, feature_log_prob):
+        _require_numpy()
+        self.classes = tuple(classes)
+        self.class_log_prior = np.asarray(class_log_prior, dtype=np.float64)
+        self.feature_log_prob = np.asarray(feature_log_prob, dtype=np.float64)
+        self.dim = self.feature_log_prob.shape[1]
+
+    @classmethod
+    def fit(cls, texts: Sequence[str], labels: Sequence[str], dim: int = DEFAULT_DIM,
+            alpha: float = 1.0) -> "TaskClassifier":
+        """Train on labelled texts (Laplace smoothing alpha)"""
+        _require_numpy()
+        if dim & (dim - 1):
+            raise ValueError(f"Feature dimension must be a power of two, got {dim}")
+        classes = sorted(set(labels))
+        if len(classes) < 2:
+            raise ValueError(f"Need labelled examples of two or more classes to train, found {classes}")
+
+        label_ids = np.asarray([classes.index(label) for label in labels], dtype=np.intp)
+        doc_ids, buckets = hashed_features(texts, dim)
+        # Feature counts per class in one pass: bin each (class, bucket) pair
+        counts = np.bincount(label_ids[doc_ids] * dim + buckets, minlength=len(classes) * dim)
+        counts = counts.reshape(len(classes), dim).astype(np.float64) + alpha
+
+        class_counts = np.bincount(label_ids, minlength=len(classes)).astype(np.float64)
+        return cls(classes, np.log(class_counts / class_counts.sum()),
+                   np.log(counts / counts.sum(axis=1, keepdims=True)))
+
+    def predict_proba(self, texts: Sequence[str]) -> "np.ndarray":
+        """Class probabilities of a batch, one row per text"""
+        doc_ids, buckets = hashed_features(texts, self.dim)
+        # Sum the log-likelihoods of each document's features: one weighted bincount per class
+        scores = np.stack([
+            np.bincount(doc_ids, weights=log_prob[buckets], minlength=len(texts)) for log_prob in self.feature_log_prob
+        ], axis=1) + self.class_log_prior
+        scores -= scores.max(axis=1, keepdims=True)
+        proba = np.exp(scores)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def predict(self, texts: Sequence[str]) -> List[str]:
+        """Most likely class of each text in a batch"""
+        if not texts:
+            return []
+        return [self.classes[i] for i in self.predict_proba(texts).argmax(axis=1)]
+
+    def save(self, path) -> bool:
+        """Write the model artifact atomically"""
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, version=MODEL_VERSION, classes=np.asarray(self.classes),
+                            class_log_prior=self.class_log_prior, feature_log_prob=self.feature_log_prob)
+        return get_vault_writer().write_bytes(path, buffer.getvalue())
+
+    @classmethod
+    def load(cls, path) -> "TaskClassifier":
+        """Read a model artifact written by save()"""
+        _require_numpy()
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != MODEL_VERSION:
+                raise ValueError(f"Unsupported task classifier version in {path}: {int(data['version'])}")
+            return cls([str(name) for name in data["classes"]], data["class_log_prior"], data["feature_log_prob"])
+
+
+def min_confidence() -> float:
+    """Probability below which a prediction is replaced by the keyword rules"""
+    return float(os.getenv("TASK_CLASSIFIER_MIN_CONFIDENCE", 0.6))
+
+
+def classify_texts(texts: Sequence[str], model: Optional[TaskClassifier] = None) -> List[str]:
+    """Classify a batch: the model where it is confident, the keyword rules otherwise"""
+    if model is None or not texts:
+        return [classify_text(text) for text in texts]
+    proba = model.predict_proba([strip_frontmatter(text) for text in texts])
+    best = proba.argmax(axis=1)
+    threshold = min_confidence()
+    return [
+        model.classes[i] if proba[row, i] >= threshold else classify_text(text)
+        for row, (i, text) in enumerate(zip(best, texts))
+    ]
+
+
+def train_from_vault(vault_path="./vault", dim: int = DEFAULT_DIM) -> Tuple[TaskClassifier, int]:
+    """Train on the vault history and save the model into the vault; returns it and the example count"""
+    examples = training_examples(vault_path)
+    model = TaskClassifier.fit([e.text for e in examples], [e.label for e in examples], dim)
+    model.save(Path(vault_path) / MODEL_FILE)
+    return model, len(examples)
+
+
+def benchmark(vault_path="./vault", folds: int = 5, dim: int = DEFAULT_DIM) -> BenchmarkReport:
+    """Cross-validated accuracy of the model against the keyword rules, and batch throughput of both"""
+    examples = training_examples(vault_path)
+    if len(examples) < folds or len({e.label for e in examples}) < 2:
+        raise ValueError(f"Need at least {folds} labelled examples of two or more classes, "
+                         f"found {len(examples)}")
+
+    model_correct = keyword_correct = 0
+    for fold in range(folds):
+        train = [e for i, e in enumerate(examples) if i % folds != fold]
+        held_out = [e for i, e in enumerate(examples) if i % folds == fold]
+        model = TaskClassifier.fit([e.text for e in train], [e.label for e in train], dim)
+        predicted = model.predict([e.text for e in held_out])
+        model_correct += sum(p == e.label for p, e in zip(predicted, held_out))
+        keyword_correct += sum(classify_text(e.text) == e.label for e in held_out)
+
+    texts = [e.text for e in examples]
+    model = TaskClassifier.fit(texts, [e.label for e in examples], dim)
+    start = time.perf_counter()
+    model.predict(texts)
+    model_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for text in texts:
+        classify_text(text)
+    keyword_seconds = time.perf_counter() - start
+
+    return BenchmarkReport(len(examples), model_correct / len(examples), keyword_correct / len(examples),
+                           len(texts) / max(model_seconds, 1e-9), len(texts) / max(keyword_seconds, 1e-9))
+
+
+_models: Dict[Path, Tuple[Optional[tuple], Optional[TaskClassifier]]] = {}
+_models_lock = threading.Lock()
+
+
+def get_task_classifier(vault_path="./vault") -> Optional[TaskClassifier]:
+    """The vault's trained model, reloaded when the artifact changes; None without NumPy or a model"""
+    if np is None:
+        return None
+    path = (Path(vault_path) / MODEL_FILE).resolve()
+    try:
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+    with _models_lock:
+        cached_stamp, model = _models.get(path, (None, None))
+        if cached_stamp != stamp:
+            try:
+                model = TaskClassifier.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Ignoring task classifier {path}: {e}", file=sys.stderr)
+                model = None
+            _models[path] = (stamp, model)
+        return model
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Task Classifier")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train = subparsers.add_parser("train", help="Train on vault/Done and vault/Plans and save the model")
+    train.add_argument("--vault", default="./vault",
+                       help="Path to vault directory")
+    train.add_argument("--dim", type=int, default=DEFAULT_DIM,
+                       help="Hashed feature buckets, a power of two")
+
+    bench = subparsers.add_parser("benchmark", help="Compare the model with the keyword rules")
+    bench.add_argument("--vault", default="./vault",
+                       help="Path to vault directory")
+    bench.add_argument("--folds", type=int, default=5,
+                       help="Cross-validation folds")
+
+    classify = subparsers.add_parser("classify", help="Classify files with the saved model")
+    classify.add_argument("files", nargs="+",
+                          help="Task files to classify")
+    classify.add_argument("--vault", default="./vault",
+                          help="Vault holding the trained model")
+
+    args = parser.parse_args()
+
+    if args.command == "train":
+        try:
+            model, count = train_from_vault(args.vault, args.dim)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"Trained on {count} labelled tasks ({', '.join(model.classes)}); "
+              f"saved {Path(args.vault) / MODEL_FILE}")
+    elif args.command == "benchmark":
+        try:
+            report = benchmark(args.vault, args.folds)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"{report.examples} labelled tasks, {args.folds}-fold cross-validation")
+        print(f"  naive Bayes:   {report.model_accuracy:.1%} accurate, {report.model_per_second:,.0f} tasks/s")
+        print(f"  keyword rules: {report.keyword_accuracy:.1%} accurate, {report.keyword_per_second:,.0f} tasks/s")
+    else:
+        texts = [Path(name).read_text(encoding="utf-8", errors="replace") for name in args.files]
+        for name, classification in zip(args.files, classify_texts(texts, get_task_classifier(args.vault))):
+            print(f"{classification}\t{name}")
+
+if __name__ == "__main__":
+    main()
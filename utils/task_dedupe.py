@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Task Dedupe Module for AI Employee System
+Content-addressed record of every incoming item turned into a task, keyed by
+the hash of its normalized content and, for emails, by Message-ID. The file
+watcher claims an item's keys before writing its task, so an email fetched
+twice or a file re-ingested on every cycle only becomes one task.
+"""
+import re
+import atexit
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEDUPE_FILE = ".task_dedupe.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested (
+    key TEXT PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+# "Message-ID: <...>" header of a raw email, or the line the Gmail watcher writes
+MESSAGE_ID_PATTERN = re.compile(r"^(?:- \*\*)?Message-ID(?:\*\*)?:\s*(<[^>\s]+>)", re.IGNORECASE | re.MULTILINE)
+
+
+def normalize_content(content: str) -> str:
+    """Case- and whitespace-insensitive form of an item's text"""
+    return " ".join(content.lower().split())
+
+
+def dedupe_keys(content: str) -> List[str]:
+    """Keys identifying an incoming item: its content hash, plus its Message-ID if it is an email"""
+    keys = ["sha256:" + hashlib.sha256(normalize_content(content).encode("utf-8")).hexdigest()]
+    match = MESSAGE_ID_PATTERN.search(content)
+    if match:
+        keys.append("message-id:" + match.group(1).lower())
+    return keys
+
+
+class TaskDedupeStore:
+    """SQLite store of the keys of items already turned into tasks"""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the database on first use"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=10, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def claim(self, keys: List[str], task_id: str, source: str) -> Optional[str]:
+        """Record the keys for a new task; if any key is already known, record nothing and
+        return the task it belongs to"""
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key in keys:
+                    row = conn.execute("SELECT task_id FROM ingested WHERE key = ?", (key,)).fetchone()
+                    if row:
+                        conn.execute("ROLLBACK")
+                        return row[0]
+                created_at = datetime.now().isoformat()
+                conn.executemany(
+                    "INSERT INTO ingested (key, task_id, source, created_at) VALUES (?, ?, ?, ?)",
+                    [(key, task_id, source, created_at) for key in keys]
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return None
+
+    def release(self, task_id: str):
+        """Forget a task's keys (its task file could not be written)"""
+        with self._lock:
+            self.conn.execute("DELETE FROM ingested WHERE task_id = ?", (task_id,))
+
+
+_stores: Dict[Path, TaskDedupeStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_task_dedupe_store(vault_path="./vault") -> TaskDedupeStore:
+    """Get the process-wide dedupe store for a vault"""
+    key = Path(vault_path).resolve()
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = TaskDedupeStore(key / DEDUPE_FILE)
+            atexit.register(store.close)
+        return store
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Task Dispatcher Module for AI Employee System
+Scans Needs_Action once per cycle, reads and classifies each new task once,
+and queues it for exactly one agent: the first route, in priority order,
+whose keywords the task contains. The Communications, Finance and
+Operations agents then work through their own queues instead of each
+re-reading the folder and racing to move the same files. Queued tasks are
+kept out of the dispatcher's snapshot: an agent moves a task out of
+Needs_Action once it is done, so one still there on the next dispatch failed
+and is queued again.
+"""
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.vault_index import VaultEntry, get_vault_index
+from utils.keyword_matcher import KeywordMatcher
+from utils.document_cache import normalize
+
+# Agents in routing priority order, with the keywords that route a task to them
+ROUTE_KEYWORDS = {
+    "communications": ['email', 'gmail', 'whatsapp', 'message', 'communication', 'reply', 'response'],
+    "finance": ['finance', 'payment', 'expense', 'bill', 'transaction', 'bank', 'subscription', 'money', 'cost',
+                'budget'],
+    "operations": ['project', 'task', 'deadline', 'schedule', 'bottleneck', 'workflow', 'process', 'operation',
+                   'timeline', 'milestone', 'deliverable'],
+}
+
+
+class TaskDispatcher:
+    """Routes new Needs_Action tasks to per-agent work queues"""
+
+    def __init__(self, vault_path="./vault", routes: Optional[Dict[str, List[str]]] = None):
+        self.vault_path = Path(vault_path)
+        self.routes = routes or ROUTE_KEYWORDS
+        self.matcher = KeywordMatcher(self.routes)
+        self.vault_index = get_vault_index(vault_path)
+        self.queues: Dict[str, List[VaultEntry]] = {agent: [] for agent in self.routes}
+
+    def route(self, text: str, content_hash: Optional[str] = None) -> Optional[str]:
+        """Agent a task's text is routed to, or None if no route matches"""
+        hits = normalize(text, content_hash).scan(self.matcher)
+        for agent in self.routes:
+            if agent in hits:
+                return agent
+        return None
+
+    def dispatch(self) -> Dict[str, int]:
+        """Queue the tasks added or changed in Needs_Action since the last dispatch, and the queued
+        tasks still there (their agent failed on them); returns queue sizes"""
+        queued = {entry.path for queue in self.queues.values() for entry in queue}
+        with self.vault_index.changes("Needs_Action", "task_dispatcher", "*.md") as changes:
+            for path in changes.pending:
+                entry = self.vault_index.get(path)
+                if entry is None:
+                    continue
+                agent = self.route(entry.body, entry.content_hash)
+                if agent is not None:
+                    # Seen again next time unless its agent has moved it out of Needs_Action
+                    changes.retry(entry.path)
+                    if entry.path not in queued:
+                        self.queues[agent].append(entry)
+        return {agent: len(queue) for agent, queue in self.queues.items()}
+
+    def take(self, agent: str) -> List[VaultEntry]:
+        """Empty an agent's queue, dropping tasks whose files have gone since they were queued"""
+        queue, self.queues[agent] = self.queues[agent], []
+        return [entry for entry in queue if entry.path.exists()]
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Task Events Module for AI Employee System
+Append-only log of task lifecycle events (created, planned, pending_approval,
+approved, executed, done) in vault/Logs/task_events.jsonl, replayed into an
+in-memory table of each task's current state. The Markdown files in the vault
+folders stay as the human-facing view; counting tasks by state or finding the
+ones stuck in approval is answered from the table instead of scanning folders.
+Events appended by other processes are picked up by reading only the bytes
+added to the log since the last query.
+"""
+import os
+import re
+import sys
+import json
+import uuid
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Union
+
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.log_sink import get_log_sink
+
+EVENTS = ("created", "planned", "pending_approval", "approved", "executed", "done")
+EVENTS_FILE = "Logs/task_events.jsonl"
+
+# Prefixes the workflow adds to a task's file names as it moves through the vault
+TASK_PREFIX = re.compile(
+    r"^(?:completed_\d{8}_\d{6}_|processed(?:_[a-z]+)?_\d{8}_\d{6}_|approval_|draft_reply_|draft_"
+    r"|finance_plan_|project_plan_|plan_)"
+)
+
+
+def task_id_for(task: Union[str, os.PathLike]) -> str:
+    """Task id shared by every file derived from a task (plan_X.md, draft_plan_X.md, completed_..._X.md -> X)"""
+    if isinstance(task, os.PathLike) or "/" in str(task) or "." in str(task):
+        name = Path(task).stem
+    else:
+        name = str(task)
+    while True:
+        stripped = TASK_PREFIX.sub("", name, count=1)
+        if stripped == name:
+            return name
+        name = stripped
+
+
+class TaskState(NamedTuple):
+    """Current state of one task"""
+    task_id: str
+    state: str
+    path: Optional[str]
+    since: datetime
+
+
+class TaskEventLog:
+    """Event-sourced task lifecycle: appends events and keeps the materialized state table"""
+
+    def __init__(self, vault_path="./vault", events_path=None, sink=None):
+        self.vault_path = Path(vault_path)
+        self.events_path = Path(events_path) if events_path else self.vault_path / EVENTS_FILE
+        self.sink = sink or get_log_sink()
+        self._lock = threading.RLock()
+        self._states: Dict[str, TaskState] = {}
+        # Tasks per state in the order they entered it, oldest first
+        self._by_state: Dict[str, Dict[str, TaskState]] = {event: {} for event in EVENTS}
+        self._offset = 0
+        self._writer = None
+        self._writer_pid = None
+
+    @property
+    def writer(self) -> str:
+        """Id of this log instance in this process; its own events are applied when recorded"""
+        if self._writer_pid != os.getpid():
+            self._writer = f"p{os.getpid()}-{uuid.uuid4().hex[:8]}"
+            self._writer_pid = os.getpid()
+        return self._writer
+
+    def record(self, task: Union[str, os.PathLike], event: str, path: Union[str, os.PathLike, None] = None,
+               **details) -> TaskState:
+        """Append a lifecycle event for a task (an id or any file derived from it)
+
+        A task already in the event's state keeps its entry time and nothing is appended.
+        """
+        if event not in EVENTS:
+            raise ValueError(f"Task event must be one of {EVENTS}, got {event!r}")
+
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "task_id": task_id_for(task),
+            "event": event,
+            "path": self._relative(path) if path is not None else None,
+            "writer": self.writer,
+        }
+        if details:
+            entry["details"] = details
+
+        with self._lock:
+            # Catch up first so our event lands after everything already in the log
+            self.refresh()
+            current = self._states.get(entry["task_id"])
+            if current is not None and current.state == event:
+                return current
+            self.events_path.parent.mkdir(parents=True, exist_ok=True)
+            self.sink.write(self.events_path, json.dumps(entry) + "\n")
+            return self._apply(entry)
+
+    def refresh(self):
+        """Apply events other writers appended since the last call"""
+        with self._lock:
+            try:
+                size = self.events_path.stat().st_size
+            except OSError:
+                return
+            if size <= self._offset:
+                return
+
+            with open(self.events_path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read(size - self._offset)
+            # A partially written last line is read again next time
+            end = data.rfind(b"\n") + 1
+            self._offset += end
+
+            writer = self.writer
+            for line in data[:end].splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("writer") != writer and entry.get("event") in EVENTS:
+                    self._apply(entry)
+
+    # Queries
+
+    def state(self, task: Union[str, os.PathLike]) -> Optional[TaskState]:
+        """Current state of a task, or None if it has no events"""
+        self.refresh()
+        return self._states.get(task_id_for(task))
+
+    def count(self, state: str) -> int:
+        """Number of tasks currently in a state"""
+        self.refresh()
+        return len(self._by_state[state])
+
+    def counts(self) -> Dict[str, int]:
+        """Number of tasks in every state"""
+        self.refresh()
+        with self._lock:
+            return {state: len(tasks) for state, tasks in self._by_state.items()}
+
+    def in_state(self, state: str) -> List[TaskState]:
+        """Tasks currently in a state, longest waiting first"""
+        self.refresh()
+        with self._lock:
+            return list(self._by_state[state].values())
+
+    def stuck(self, state: str, older_than: timedelta, now: Optional[datetime] = None) -> List[TaskState]:
+        """Tasks that entered a state more than `older_than` ago and are still in it"""
+        cutoff = (now or datetime.now()) - older_than
+        stuck = []
+        # Tasks are kept in the order they entered the state, so stop at the first recent one
+        for task in self.in_state(state):
+            if task.since > cutoff:
+                break
+            stuck.append(task)
+        return stuck
+
+    def _apply(self, entry: dict) -> TaskState:
+        """Move a task to the state named by an event"""
+        task_id, event = entry["task_id"], entry["event"]
+        since = datetime.fromisoformat(entry["timestamp"])
+        with self._lock:
+            previous = self._states.get(task_id)
+            if previous is not None and previous.state == event:
+                # Repeating the current state does not reset how long the task has been in it
+                return previous
+            if previous is not None:
+                self._by_state[previous.state].pop(task_id, None)
+            state = TaskState(task_id, event, entry.get("path"), since)
+            self._states[task_id] = state
+
+            # Keep each state ordered by entry time even when events arrive slightly out of order
+            tasks = self._by_state[event]
+            tasks[task_id] = state
+            if len(tasks) > 1 and since < next(reversed(tasks.values()), state).since:
+                ordered = sorted(tasks.values(), key=lambda task: task.since)
+                tasks.clear()
+                tasks.update((task.task_id, task) for task in ordered)
+            return state
+
+    def _relative(self, path: Union[str, os.PathLike]) -> str:
+        """Vault-relative path if the file is in the vault"""
+        path = Path(path)
+        try:
+            return path.resolve().relative_to(self.vault_path.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+
+# Vault folders and the lifecycle state their files represent, used to seed the log
+FOLDER_STATES = (
+    ("Needs_Action", "created"),
+    ("Plans", "planned"),
+    ("Pending_Approval", "pending_approval"),
+    ("Approved", "approved"),
+    ("Done", "done"),
+)
+
+
+def seed_from_vault(vault_path="./vault", log: Optional[TaskEventLog] = None) -> int:
+    """Record an event for every task file that has none yet, from the folder it is in"""
+    from utils.vault_index import get_vault_index
+
+    log = log or get_task_events(vault_path)
+    index = get_vault_index(vault_path)
+    seeded = 0
+    for folder, state in FOLDER_STATES:
+        for entry in sorted(index.files(folder), key=lambda entry: entry.mtime):
+            if log.state(entry.path) is None:
+                log.record(entry.path, state, entry.path, seeded=True)
+                seeded += 1
+    return seeded
+
+
+_logs: Dict[Path, TaskEventLog] = {}
+_logs_lock = threading.Lock()
+
+
+def get_task_events(vault_path="./vault") -> TaskEventLog:
+    """Get the process-wide task event log for a vault"""
+    key = Path(vault_path).resolve()
+    with _logs_lock:
+        log = _logs.get(key)
+        if log is None:
+            log = _logs[key] = TaskEventLog(key)
+        return log
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Task Events")
+    parser.add_argument("--vault", default="./vault",
+                       help="Path to vault directory")
+    parser.add_argument("--seed", action="store_true",
+                       help="Record the current folder of every task that has no events yet")
+    parser.add_argument("--stuck", choices=EVENTS, default=None,
+                       help="List tasks stuck in a state")
+    parser.add_argument("--days", type=float, default=2,
+                       help="How long a task must have been in --stuck state (default 2 days)")
+
+    args = parser.parse_args()
+
+    log = get_task_events(args.vault)
+    if args.seed:
+        print(f"Seeded {seed_from_vault(args.vault, log)} tasks")
+        log.sink.flush()
+    elif args.stuck:
+        for task in log.stuck(args.stuck, timedelta(days=args.days)):
+            print(f"{task.since:%Y-%m-%d %H:%M}  {task.task_id}  {task.path or ''}")
+    else:
+        for state, count in log.counts().items():
+            print(f"{state}: {count}")
+
+if __name__ == "__main__":
+    main()
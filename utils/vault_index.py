@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Vault Index Module for AI Employee System
+SQLite index of the vault with one row per file: path, folder, mtime, size,
+content hash, parsed frontmatter, classification and text. Components query
+it instead of globbing folders and reading every file. Writes (atomic, via
+the vault writer) and moves made through the index update it directly;
+anything changed behind its back is found by a stat-only pass over the
+queried folder, and only files whose mtime or size changed are read again.
+
+Consumers that only care about what changed since their last pass keep a
+persisted (inode, size, mtime_ns) snapshot per folder in the same database
+and ask for the files added, modified or removed since then.
+"""
+import os
+import sys
+import json
+import atexit
+import sqlite3
+import fnmatch
+import hashlib
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.frontmatter import parse_frontmatter
+from utils.vault_writer import get_vault_writer
+from utils.keyword_matcher import KeywordMatcher, compile_keywords
+from utils.document_cache import NormalizedDocument, normalize
+
+INDEX_FILE = ".vault_index.sqlite3"
+SCHEMA_VERSION = 2
+
+# Files larger than this are indexed without their text
+MAX_INDEXED_BYTES = 1024 * 1024
+
+# Keyword rules used to classify vault items, checked in order
+CLASSIFICATION_RULES = (
+    ("COMMUNICATION", ("email", "gmail", "communication")),
+    ("FINANCE", ("finance", "payment", "expense", "bill")),
+    ("FILE_MANAGEMENT", ("file", "document", "organize")),
+    ("PROJECT_MANAGEMENT", ("project", "task", "deadline")),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    inode INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    content_hash TEXT,
+    frontmatter TEXT NOT NULL,
+    classification TEXT NOT NULL,
+    content TEXT
+);
+CREATE INDEX IF NOT EXISTS files_by_folder ON files (folder, name);
+CREATE TABLE IF NOT EXISTS snapshots (
+    consumer TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    path TEXT NOT NULL,
+    inode INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (consumer, folder, path)
+);
+"""
+
+COLUMNS = "path, folder, name, inode, mtime_ns, size, content_hash, frontmatter, classification, content"
+
+
+# Everything but the text, which VaultEntry loads on demand
+META_COLUMNS = "path, folder, name, inode, mtime_ns, size, content_hash, frontmatter, classification"
+
+
+class VaultEntry:
+    """Metadata of one vault file (name, state, stat info, parsed header) with its body loaded lazily.
+
+    The body is fetched from the index the first time it is needed and kept on
+    the entry, so code that checks an entry and then processes it reads the
+    file at most once per pass. Entries can be used wherever a path is expected.
+    """
+
+    __slots__ = ("path", "state", "name", "inode", "mtime", "size", "content_hash", "header",
+                 "classification", "_body", "_index")
+
+    def __init__(self, index: "VaultIndex", path: Path, state: str, name: str, inode: int, mtime: float,
+                 size: int, content_hash: Optional[str], header: dict, classification: str):
+        self._index = index
+        self._body = None
+        self.path = path
+        self.state = state  # vault folder, i.e. where the item is in the workflow
+        self.name = name
+        self.inode = inode
+        self.mtime = mtime
+        self.size = size
+        self.content_hash = content_hash
+        self.header = header
+        self.classification = classification
+
+    @property
+    def stem(self) -> str:
+        """File name without its suffix"""
+        return self.path.stem
+
+    @property
+    def body(self) -> str:
+        """The file's text, loaded on first access"""
+        if self._body is None:
+            self._body = self._index.read_body(self.path)
+        return self._body
+
+    @property
+    def document(self) -> NormalizedDocument:
+        """Shared normalized form of the body (lower-cased text, previews, lines), keyed by its hash"""
+        return normalize(self.body, self.content_hash)
+
+    def read_text(self) -> str:
+        """Same as body, for code written against Path"""
+        return self.body
+
+    def __fspath__(self) -> str:
+        return str(self.path)
+
+    def __repr__(self) -> str:
+        return f"VaultEntry({self.path!s})"
+
+
+class VaultChanges(NamedTuple):
+    """Files in a folder that changed since a consumer's last pass"""
+    added: List[Path]
+    modified: List[Path]
+    removed: List[Path]
+    retrying: List[Path]
+
+    @property
+    def pending(self) -> List[Path]:
+        """Added and modified files, i.e. the ones still on disk to process"""
+        return self.added + self.modified
+
+    def retry(self, path: Union[str, Path]):
+        """Leave a file the consumer failed to process out of the new snapshot, so the next pass sees it again"""
+        self.retrying.append(Path(path))
+
+
+def scan_folder(root: Path, vault_path: Path) -> Dict[str, tuple]:
+    """Stat every file under a folder with os.scandir: {key: (path, inode, mtime_ns, size)}"""
+    found = {}
+    if not root.is_dir():
+        return found
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    key = Path(entry.path).relative_to(vault_path).as_posix()
+                    found[key] = (entry.path, entry.inode(), stat.st_mtime_ns, stat.st_size)
+    return found
+
+
+CLASSIFIER = KeywordMatcher(dict(CLASSIFICATION_RULES))
+
+
+def classify_text(content: str, content_hash: Optional[str] = None) -> str:
+    """Classify a vault item by keyword, scanning its text once"""
+    hits = normalize(content, content_hash).scan(CLASSIFIER)
+    for classification, _ in CLASSIFICATION_RULES:
+        if classification in hits:
+            return classification
+    return "GENERAL"
+
+
+class VaultIndex:
+    """SQLite-backed index of the files in a vault"""
+
+    def __init__(self, vault_path="./vault", db_path=None):
+        self.vault_path = Path(vault_path).resolve()
+        self.db_path = Path(db_path) if db_path else self.vault_path / INDEX_FILE
+        self._lock = threading.RLock()
+        self._conn = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the database on first use"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=10, check_same_thread=False,
+                                   isolation_level=None)
+            # Several processes share the index: readers must not block the writer
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.executescript(f"DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS snapshots; {SCHEMA} PRAGMA user_version={SCHEMA_VERSION};")
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def relative(self, path: Union[str, Path]) -> str:
+        """Vault-relative POSIX path used as the row key"""
+        return Path(path).resolve().relative_to(self.vault_path).as_posix()
+
+    # Queries
+
+    def files(self, folder: str, pattern: str = "*") -> List[VaultEntry]:
+        """Entries for the files in a vault folder (or sub-folder) whose name matches a glob pattern,
+        sorted by path; bodies are not loaded until used"""
+        self.sync(folder)
+        where, params = self._where(folder)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {META_COLUMNS} FROM files WHERE {where} ORDER BY path", params
+            ).fetchall()
+        return [self._to_entry(row) for row in rows if fnmatch.fnmatchcase(row[2], pattern)]
+
+    def count(self, folder: str, pattern: str = "*") -> int:
+        """Number of files in a folder matching a glob pattern"""
+        return len(self.paths(folder, pattern))
+
+    def paths(self, folder: str, pattern: str = "*") -> List[Path]:
+        """Paths of the files in a folder matching a glob pattern, without loading their text"""
+        self.sync(folder)
+        where, params = self._where(folder)
+        with self._lock:
+            names = self.conn.execute(
+                f"SELECT path, name FROM files WHERE {where} ORDER BY path", params
+            ).fetchall()
+        return [self.vault_path / path for path, name in names if fnmatch.fnmatchcase(name, pattern)]
+
+    def matching(self, folder: str, keywords: Iterable[str], pattern: str = "*",
+                 among: Optional[Iterable[Path]] = None) -> List[VaultEntry]:
+        """Entries in a folder whose text contains any of the keywords (case-insensitive),
+        optionally only considering the given paths (e.g. the pending files of a VaultChanges).
+        Only candidates have their body loaded, and the returned entries keep it."""
+        matcher = compile_keywords(tuple(keywords))
+        among = None if among is None else {Path(path) for path in among}
+        return [
+            entry for entry in self.files(folder, pattern)
+            if (among is None or entry.path in among) and matcher.matches_lowered(entry.document.lower)
+        ]
+
+    def get(self, path: Union[str, Path]) -> Optional[VaultEntry]:
+        """Indexed record of one file, re-read only if it changed on disk"""
+        path = Path(path)
+        key = self.relative(path)
+        with self._lock:
+            row = self.conn.execute(f"SELECT {META_COLUMNS} FROM files WHERE path = ?", (key,)).fetchone()
+            try:
+                stat = path.stat()
+            except OSError:
+                stat = None
+            if stat is None or row is None or (row[4], row[5]) != (stat.st_mtime_ns, stat.st_size):
+                self.refresh(path)
+                row = self.conn.execute(f"SELECT {META_COLUMNS} FROM files WHERE path = ?", (key,)).fetchone()
+        return self._to_entry(row) if row else None
+
+    def entry(self, item: Union[str, Path, VaultEntry]) -> VaultEntry:
+        """Entry for a path (an entry is returned as is); raises FileNotFoundError if the file is gone"""
+        if isinstance(item, VaultEntry):
+            return item
+        entry = self.get(item)
+        if entry is None:
+            raise FileNotFoundError(f"Not in the vault: {item}")
+        return entry
+
+    def read_body(self, path: Union[str, Path]) -> str:
+        """Text of a file from the index, or from disk if it was too large to store"""
+        path = Path(path)
+        with self._lock:
+            row = self.conn.execute("SELECT content FROM files WHERE path = ?", (self.relative(path),)).fetchone()
+        if row and row[0] is not None:
+            return row[0]
+        return path.read_text(encoding="utf-8", errors="replace")
+
+    # Change detection
+
+    @contextmanager
+    def changes(self, folder: str, consumer: str, pattern: str = "*"):
+        """Files added, modified or removed in a folder since the consumer's last completed pass.
+
+        The consumer's snapshot only moves forward when the block exits without
+        an error, and never past the files passed to changes.retry(). Files the
+        consumer rewrites during its pass are absorbed into the new snapshot;
+        files that first appear during the pass are left out so the next pass
+        still sees them as added.
+        """
+        before = self._state(folder, pattern)
+        with self._lock:
+            previous = {
+                path: (inode, mtime_ns, size) for path, inode, mtime_ns, size in self.conn.execute(
+                    "SELECT path, inode, mtime_ns, size FROM snapshots WHERE consumer = ? AND folder = ?",
+                    (consumer, folder))
+            }
+
+        changes = VaultChanges(
+            added=[self.vault_path / path for path in before if path not in previous],
+            modified=[self.vault_path / path for path, state in before.items()
+                      if path in previous and previous[path] != state],
+            removed=[self.vault_path / path for path in previous if path not in before],
+            retrying=[],
+        )
+        yield changes
+
+        retrying = {self.relative(path) for path in changes.retrying}
+        after = self._state(folder, pattern)
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM snapshots WHERE consumer = ? AND folder = ?", (consumer, folder))
+                conn.executemany(
+                    "INSERT INTO snapshots (consumer, folder, path, inode, mtime_ns, size) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(consumer, folder, path) + state for path, state in after.items()
+                     if path in before and path not in retrying]
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _state(self, folder: str, pattern: str) -> Dict[str, tuple]:
+        """(inode, mtime_ns, size) of the files in a folder matching a pattern"""
+        self.sync(folder)
+        where, params = self._where(folder)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT path, name, inode, mtime_ns, size FROM files WHERE {where}", params
+            ).fetchall()
+        return {path: (inode, mtime_ns, size) for path, name, inode, mtime_ns, size in rows
+                if fnmatch.fnmatchcase(name, pattern)}
+
+    # Keeping the index current
+
+    def sync(self, folder: str):
+        """Reconcile a folder with the disk using stat only; changed files are read again"""
+        on_disk = scan_folder(self.vault_path / folder, self.vault_path)
+        where, params = self._where(folder)
+
+        with self._lock:
+            conn = self.conn
+            known = {
+                path: (inode, mtime_ns, size) for path, inode, mtime_ns, size in
+                conn.execute(f"SELECT path, inode, mtime_ns, size FROM files WHERE {where}", params)
+            }
+            stale = [info for path, info in on_disk.items() if known.get(path) != info[1:]]
+            removed = [path for path in known if path not in on_disk]
+            if not stale and not removed:
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for path in removed:
+                    conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                for full_path, _, _, _ in stale:
+                    self._upsert(Path(full_path))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def refresh(self, path: Union[str, Path], content: Optional[str] = None):
+        """Record the current state of one file (or its removal)"""
+        path = Path(path)
+        with self._lock:
+            if path.exists():
+                self._upsert(path, content)
+            else:
+                self.conn.execute("DELETE FROM files WHERE path = ?", (self.relative(path),))
+
+    def write_text(self, path: Union[str, Path], content: str) -> bool:
+        """Atomically write a vault file and index it without reading it back;
+        returns False if the file already had this content and was left untouched"""
+        path = Path(path)
+        written = get_vault_writer().write_text(path, content)
+        self.refresh(path, content)
+        return written
+
+    def move(self, source: Union[str, Path], destination: Union[str, Path]) -> Path:
+        """Move a vault file and update its row instead of re-reading it"""
+        source, destination = Path(source), Path(destination)
+        get_vault_writer().rename(source, destination)
+
+        with self._lock:
+            conn = self.conn
+            stat = destination.stat()
+            old_key, new_key = self.relative(source), self.relative(destination)
+            updated = conn.execute(
+                "UPDATE OR REPLACE files SET path = ?, folder = ?, name = ?, inode = ?, mtime_ns = ?, size = ? "
+                "WHERE path = ?",
+                (new_key, self._folder(new_key), destination.name, stat.st_ino, stat.st_mtime_ns, stat.st_size,
+                 old_key)
+            ).rowcount
+            if not updated:
+                self._upsert(destination)
+        return destination
+
+    def remove(self, path: Union[str, Path]):
+        """Delete a vault file and its row"""
+        path = Path(path)
+        path.unlink(missing_ok=True)
+        with self._lock:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (self.relative(path),))
+
+    def _upsert(self, path: Path, content: Optional[str] = None):
+        """Read (unless content is given) and store one file's row"""
+        stat = path.stat()
+        content_hash = None
+        if content is None and stat.st_size <= MAX_INDEXED_BYTES:
+            data = path.read_bytes()
+            content_hash = hashlib.sha256(data).hexdigest()
+            content = data.decode("utf-8", errors="replace")
+        elif content is not None:
+            content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+        key = self.relative(path)
+        frontmatter = parse_frontmatter(content, path.suffix.lower()) if content else {}
+        classification = str(frontmatter.get("classification")
+                             or (classify_text(content, content_hash) if content else "GENERAL"))
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO files ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, self._folder(key), path.name, stat.st_ino, stat.st_mtime_ns, stat.st_size, content_hash,
+             json.dumps(frontmatter), classification, content)
+        )
+
+    @staticmethod
+    def _where(folder: str):
+        """SQL condition selecting the rows of a top-level folder or of a sub-folder such as Done/2026/03/05"""
+        folder = folder.strip("/")
+        if "/" not in folder:
+            return "folder = ?", (folder,)
+        # Every key under a sub-folder sorts between "<folder>/" and "<folder>0"
+        return "path > ? AND path < ?", (folder + "/", folder + "0")
+
+    @staticmethod
+    def _folder(key: str) -> str:
+        """Top-level vault folder of a row key ("" for files in the vault root)"""
+        return key.split("/", 1)[0] if "/" in key else ""
+
+    def _to_entry(self, row) -> VaultEntry:
+        """Build a VaultEntry from a metadata row"""
+        path, folder, name, inode, mtime_ns, size, content_hash, frontmatter, classification = row
+        return VaultEntry(self, self.vault_path / path, folder, name, inode, mtime_ns / 1e9, size, content_hash,
+                          json.loads(frontmatter), classification)
+
+
+_indexes: Dict[Path, VaultIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_vault_index(vault_path="./vault") -> VaultIndex:
+    """Get the process-wide index for a vault"""
+    key = Path(vault_path).resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = VaultIndex(key)
+            atexit.register(index.close)
+        return index
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Vault Pack Module for AI Employee System
+Backs the vault up into a single compressed tar archive instead of copying
+thousands of small Markdown files. Every pack ends with a manifest of each
+file's content hash, size and mtime, also saved next to the archive. An
+incremental pack compares the vault with the previous manifest and only
+reads and stores files whose size or mtime changed and whose hash differs,
+plus the list of files deleted since. Unpacking a full pack followed by its
+incremental packs, in order, restores the vault.
+
+    python utils/vault_pack.py pack [--incremental]
+    python utils/vault_pack.py unpack backups/vault_full_....tar.gz [backups/vault_incr_....tar.gz ...] --vault ./restored
+"""
+import io
+import os
+import sys
+import json
+import tarfile
+import hashlib
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, NamedTuple, Optional
+
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.vault_index import scan_folder
+from utils.vault_writer import get_vault_writer
+
+MANIFEST_NAME = "MANIFEST.json"
+MANIFEST_VERSION = 1
+DEFAULT_BACKUP_DIR = "./backups"
+
+
+class PackResult(NamedTuple):
+    """Outcome of a pack"""
+    archive: Path
+    manifest: Path
+    packed: int
+    deleted: int
+    total: int
+
+
+def manifest_path(archive: Path) -> Path:
+    """Sidecar manifest saved next to an archive"""
+    return archive.with_name(archive.name[:-len(".tar.gz")] + ".manifest.json")
+
+
+def latest_manifest(backup_dir) -> Optional[Path]:
+    """Most recent manifest in a backup folder, or None"""
+    manifests = sorted(Path(backup_dir).glob("vault_*.manifest.json"), key=lambda path: path.name.split("_", 2)[2])
+    return manifests[-1] if manifests else None
+
+
+def load_manifest(path) -> dict:
+    """Read a sidecar manifest"""
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version in {path}: {manifest.get('version')!r}")
+    return manifest
+
+
+def pack_vault(vault_path="./vault", backup_dir=DEFAULT_BACKUP_DIR, base_manifest=None) -> PackResult:
+    """Pack the vault into backup_dir; with base_manifest, only what changed since that pack"""
+    vault_path = Path(vault_path)
+    backup_dir = Path(backup_dir)
+    backup_dir.mkdir(parents=True, exist_ok=True)
+
+    base = load_manifest(base_manifest) if base_manifest else None
+    previous: Dict[str, dict] = base["files"] if base else {}
+    kind = "incr" if base else "full"
+    archive = backup_dir / f"vault_{kind}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.tar.gz"
+
+    # Dot files (the rebuildable index, in-flight temp files, SQLite stores) are not backed up
+    current = scan_folder(vault_path, vault_path)
+    files: Dict[str, dict] = {}
+    packed: List[str] = []
+
+    with tarfile.open(archive, "w:gz") as tar:
+        for key in sorted(current):
+            full_path, _, mtime_ns, size = current[key]
+            old = previous.get(key)
+            if old is not None and (old["size"], old["mtime_ns"]) == (size, mtime_ns):
+                # Unchanged since the base pack: not even read
+                files[key] = old
+                continue
+
+            try:
+                with open(full_path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                # Deleted since the scan
+                continue
+            digest = hashlib.sha256(data).hexdigest()
+            files[key] = {"sha256": digest, "size": len(data), "mtime_ns": mtime_ns}
+            if old is not None and old["sha256"] == digest:
+                # Touched but not changed
+                continue
+
+            info = tarfile.TarInfo(key)
+            info.size = len(data)
+            info.mtime = mtime_ns / 1e9
+            info.mode = 0o644
+            tar.addfile(info, io.BytesIO(data))
+            packed.append(key)
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "created": datetime.now().isoformat(),
+            "kind": kind,
+            "base": base["archive"] if base else None,
+            "archive": archive.name,
+            "files": files,
+            "packed": packed,
+            "deleted": sorted(key for key in previous if key not in files),
+        }
+        data = json.dumps(manifest, indent=1).encode("utf-8")
+        info = tarfile.TarInfo(MANIFEST_NAME)
+        info.size = len(data)
+        info.mtime = datetime.now().timestamp()
+        info.mode = 0o644
+        tar.addfile(info, io.BytesIO(data))
+
+    sidecar = manifest_path(archive)
+    get_vault_writer().write_bytes(sidecar, data)
+    return PackResult(archive, sidecar, len(packed), len(manifest["deleted"]), len(files))
+
+
+def _safe_member(name: str) -> bool:
+    """Archive member names must stay inside the destination"""
+    path = PurePosixPath(name)
+    return not path.is_absolute() and ".." not in path.parts and not name.startswith(".")
+
+
+def unpack_vault(archives: List, vault_path="./vault") -> int:
+    """Restore a full pack, then any incremental packs on top of it in order; returns files written"""
+    vault_path = Path(vault_path)
+    vault_path.mkdir(parents=True, exist_ok=True)
+    writer = get_vault_writer()
+    written = 0
+
+    for archive in archives:
+        manifest = None
+        restored = []
+        # Streamed: members are written as they are read and the manifest comes last
+        with tarfile.open(archive, "r|gz") as tar:
+            for member in tar:
+                if member.name == MANIFEST_NAME:
+                    manifest = json.load(tar.extractfile(member))
+                    continue
+                if not member.isfile() or not _safe_member(member.name):
+                    raise ValueError(f"Refusing to unpack {member.name!r} from {archive}")
+                destination = vault_path / member.name
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                writer.write_bytes(destination, tar.extractfile(member).read())
+                restored.append(member.name)
+
+        if manifest is None:
+            raise ValueError(f"{archive} has no {MANIFEST_NAME}; it is not a vault pack")
+        for key in restored:
+            # Keep the packed mtime so the next incremental pack sees these files as unchanged
+            os.utime(vault_path / key, ns=(manifest["files"][key]["mtime_ns"],) * 2)
+            written += 1
+        for key in manifest["deleted"]:
+            if _safe_member(key):
+                (vault_path / key).unlink(missing_ok=True)
+
+    writer.sync()
+    return written
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vault Pack")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pack = subparsers.add_parser("pack", help="Pack the vault into one compressed archive")
+    pack.add_argument("--vault", default="./vault",
+                      help="Path to vault directory")
+    pack.add_argument("--output-dir", default=DEFAULT_BACKUP_DIR,
+                      help="Folder for archives and their manifests (default ./backups)")
+    pack.add_argument("--incremental", action="store_true",
+                      help="Only pack what changed since the latest manifest in --output-dir")
+    pack.add_argument("--since", default=None,
+                      help="Manifest to pack changes against (implies --incremental)")
+
+    unpack = subparsers.add_parser("unpack", help="Restore a full pack and its incremental packs, in order")
+    unpack.add_argument("archives", nargs="+",
+                        help="Full pack first, then incremental packs oldest first")
+    unpack.add_argument("--vault", default="./vault",
+                        help="Path to restore the vault into")
+
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        base = args.since
+        if args.incremental and not base:
+            base = latest_manifest(args.output_dir)
+            if base is None:
+                print("No previous manifest found; making a full pack")
+        result = pack_vault(args.vault, args.output_dir, base)
+        print(f"Packed {result.packed} of {result.total} files ({result.deleted} deleted) into {result.archive}")
+    else:
+        written = unpack_vault(args.archives, args.vault)
+        print(f"Restored {written} files into {args.vault}")
+
+if __name__ == "__main__":
+    main()
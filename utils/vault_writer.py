@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Vault Writer Module for AI Employee System
+Atomic writes for vault files: content goes to a hidden temp file in the same
+folder and is renamed over the target, so a crash mid-cycle never leaves a
+truncated plan and Obsidian sync never sees a half-written file. A write whose
+bytes match what is already on disk is skipped, leaving the file's mtime alone.
+The folders touched by renames are fsynced together once per cycle by sync().
+"""
+import os
+import sys
+import atexit
+import threading
+from pathlib import Path
+from typing import Optional, Set, Union
+
+# Allow running as a script from the utils directory
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.metrics_server import get_metrics_registry
+
+FSYNC_POLICIES = ("none", "batch")
+
+
+def same_content(path: Path, data: bytes) -> bool:
+    """True if the file at path already holds exactly these bytes"""
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+class VaultWriter:
+    """Writes vault files by temp file and rename, batching folder fsyncs until sync()"""
+
+    def __init__(self, fsync: Optional[str] = None):
+        # "batch": fsync each file before its rename and its folder at the next sync(); "none": leave it to the OS
+        self.fsync = (fsync or os.getenv("VAULT_FSYNC", "batch")).lower()
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"VAULT_FSYNC must be one of {FSYNC_POLICIES}, got {self.fsync!r}")
+        self.written = 0
+        self.unchanged = 0
+        self._dirty_dirs: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def write_text(self, path: Union[str, Path], content: str) -> bool:
+        """Atomically write a text file; returns False if it already had this content"""
+        return self.write_bytes(path, content.encode("utf-8"))
+
+    def write_bytes(self, path: Union[str, Path], data: bytes) -> bool:
+        """Atomically write a file; returns False if it already had these bytes"""
+        path = Path(path)
+        if same_content(path, data):
+            self.unchanged += 1
+            get_metrics_registry().inc("ai_employee_vault_writes_total", {"result": "unchanged"})
+            return False
+
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                if self.fsync == "batch":
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            self.written += 1
+            if self.fsync == "batch":
+                self._dirty_dirs.add(str(path.parent))
+        get_metrics_registry().inc("ai_employee_vault_writes_total", {"result": "written"})
+        return True
+
+    def rename(self, source: Union[str, Path], destination: Union[str, Path]):
+        """Move a file, leaving both folders for the next sync() to fsync"""
+        source, destination = Path(source), Path(destination)
+        os.rename(source, destination)
+        if self.fsync == "batch":
+            with self._lock:
+                self._dirty_dirs.update((str(source.parent), str(destination.parent)))
+
+    def sync(self):
+        """Fsync every folder a file was renamed into or out of since the last sync"""
+        with self._lock:
+            dirty, self._dirty_dirs = self._dirty_dirs, set()
+
+        for directory in sorted(dirty):
+            try:
+                fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+            except OSError:
+                # Folders cannot be opened on every platform (e.g. Windows); the rename is still atomic
+                continue
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+
+
+_writer: Optional[VaultWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_vault_writer() -> VaultWriter:
+    """Get the process-wide vault writer"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = VaultWriter()
+                atexit.register(_writer.sync)
+    return _writer
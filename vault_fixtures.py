@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures for the test scripts
+"""
+
+from pathlib import Path
+
+def make_vault(tmp):
+    """Create a vault with a few items to index"""
+    vault = Path(tmp) / "vault"
+    for folder in ("Needs_Action", "Plans", "Pending_Approval", "Approved", "Done"):
+        (vault / folder).mkdir(parents=True)
+    (vault / "Needs_Action" / "invoice.md").write_text("---\ntitle: Invoice\n---\nPay the bill")
+    (vault / "Needs_Action" / "reply.md").write_text("Answer the email from Bob")
+    (vault / "Needs_Action" / "task_1.json").write_text('{"id": "task_1", "status": "pending"}')
+    return vault